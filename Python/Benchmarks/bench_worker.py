@@ -0,0 +1,183 @@
+# License for this script is GNU GPL Version 3
+# The text for this license can be found here:
+# https://www.gnu.org/licenses/gpl-3.0.en.html
+
+#Runs inside Blender, started by run_benchmarks.py as:
+#blender -b --factory-startup --python bench_worker.py -- case.json result.json
+#It registers one addon, runs its operator a few times
+#and writes the measurements for that one case to JSON.
+#Every case gets its own Blender, so peak RSS is only
+#that case and nothing left over from the one before.
+
+import os
+import sys
+import gc
+import json
+import time
+import traceback
+import tracemalloc
+import importlib.util
+
+import bpy
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+#Loads an addon file by its path and registers it.
+#generator_utils lives in Python/Modules, so that
+#goes on the path first like it would in Blender:
+def load_addon(rel_path):
+    modules_dir = os.path.join(PYTHON_DIR, "Modules")
+    if modules_dir not in sys.path:
+        sys.path.insert(0, modules_dir)
+
+    path = os.path.join(PYTHON_DIR, rel_path)
+    addon_dir = os.path.dirname(path)
+    if addon_dir not in sys.path:
+        sys.path.insert(0, addon_dir)
+
+    name = os.path.splitext(os.path.basename(path))[0]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.register()
+    return module
+
+
+def get_operator(idname):
+    category, name = idname.split(".")
+    return getattr(getattr(bpy.ops, category), name)
+
+
+#Peak resident memory of this process in bytes. Linux
+#gives ru_maxrss in KiB, macOS already gives bytes:
+def peak_rss():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return rss
+    return rss * 1024
+
+
+#Deletes everything in the scene, plus the meshes,
+#images and curves left behind, so repeats don't pile
+#up data that would slow the next run down:
+def clear_scene():
+    scene = bpy.context.scene
+    for obj in list(scene.objects):
+        scene.objects.unlink(obj)
+        bpy.data.objects.remove(obj)
+    for collection in (bpy.data.meshes, bpy.data.curves, bpy.data.images, bpy.data.materials, bpy.data.textures):
+        for block in list(collection):
+            if block.users == 0:
+                collection.remove(block)
+
+
+#Counts the verts and faces the operator made, with
+#any modifiers left on the objects applied:
+def count_geometry():
+    scene = bpy.context.scene
+    verts = 0
+    faces = 0
+    tris = 0
+    for obj in scene.objects:
+        if obj.type not in {'MESH', 'CURVE'}:
+            continue
+        mesh = obj.to_mesh(scene, True, 'PREVIEW')
+        verts += len(mesh.vertices)
+        faces += len(mesh.polygons)
+        tris += sum(len(p.vertices) - 2 for p in mesh.polygons)
+        bpy.data.meshes.remove(mesh)
+    return verts, faces, tris
+
+
+#The generators keep what they built in the shared
+#geometry cache, so a repeat with the same values would
+#only restore it. Unless the case is about timing cache
+#hits, it gets emptied so every run builds again:
+def reset_cache(case):
+    from generator_utils import geometry_cache
+
+    if not case.get("cache", False):
+        geometry_cache.clear()
+    geometry_cache.reset_stats()
+    return geometry_cache
+
+
+def run_case(case, repeat):
+    load_addon(case["addon"])
+    op = get_operator(case["operator"])
+    params = case["params"]
+
+    #Timed runs don't have tracemalloc on, since
+    #tracing every allocation slows python down:
+    times = []
+    hits = 0
+    for i in range(repeat):
+        clear_scene()
+        cache = reset_cache(case)
+        gc.collect()
+        start = time.perf_counter()
+        ret = op(**params)
+        times.append(time.perf_counter() - start)
+        if 'FINISHED' not in ret:
+            raise RuntimeError(case["operator"] + " returned " + str(ret))
+        hits += cache.hits
+
+    verts, faces, tris = count_geometry()
+
+    #One more run just to count python allocations:
+    clear_scene()
+    reset_cache(case)
+    gc.collect()
+    tracemalloc.start()
+    blocks = sys.getallocatedblocks()
+    op(**params)
+    blocks = sys.getallocatedblocks() - blocks
+    current, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    alloc_count = sum(stat.count for stat in snapshot.statistics("filename"))
+
+    return {"wall_time": min(times),
+            "wall_times": times,
+            "peak_rss": peak_rss(),
+            "cache_hits": hits,
+            "py_alloc_count": alloc_count,
+            "py_alloc_blocks": blocks,
+            "py_peak_bytes": peak,
+            "verts": verts,
+            "faces": faces,
+            "tris": tris,
+            }
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:]
+    case_path, out_path = argv[0], argv[1]
+    with open(case_path) as f:
+        case = json.load(f)
+
+    result = {"id": case["id"],
+              "operator": case["operator"],
+              "params": case["params"],
+              "blender": bpy.app.version_string,
+              }
+    try:
+        result.update(run_case(case, case.get("repeat", 3)))
+        result["status"] = "ok"
+    except Exception:
+        result["status"] = "error"
+        result["error"] = traceback.format_exc()
+
+    with open(out_path, "w") as f:
+        json.dump(result, f, indent=4, sort_keys=True)
+
+
+main()
@@ -0,0 +1,119 @@
+# License for this script is GNU GPL Version 3
+# The text for this license can be found here:
+# https://www.gnu.org/licenses/gpl-3.0.en.html
+
+#Runs inside Blender and checks the analytic cuts in
+#generator_utils against BOOLEAN modifiers, for the
+#ejection port, barrel and recoil spring holes of the
+#handgun's slide:
+#blender -b --factory-startup --python check_cuts.py -- --tolerance 0.01
+#Exits with 1 if a hole took out a different volume than
+#the boolean did, or with --strict if any of them had to
+#fall back to the boolean.
+
+import os
+import sys
+import argparse
+import importlib.util
+
+import bpy
+
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+#The handgun's defaults, with the bevel and cylinder
+#segments (str, seg, cyl_seg) that get checked:
+LENGTH = 0.5
+WIDTH = 0.0
+HEIGHT = 1.0
+SLIDE_H = 0.0325
+THICK = 0.025
+EP = (0.0, -0.035, 0.575 / 2.0, 0.401774 / 2.0, 0.25)
+B_RAD = 0.1
+C_RAD = 0.075
+SETTINGS = [(0.5, 2, 3),
+            (0.5, 2, 8),
+            (0.5, 2, 32),
+            (0.5, 2, 64),
+            (0.5, 0, 32),
+            (0.1, 2, 32),
+            (0.5, 4, 128),
+            ]
+
+HOLES = ("port", "barrel", "spring")
+
+
+#Loads add_handgun by its path without registering it,
+#with Python/Modules on the path for generator_utils:
+def load_handgun():
+    modules_dir = os.path.join(PYTHON_DIR, "Modules")
+    if modules_dir not in sys.path:
+        sys.path.insert(0, modules_dir)
+
+    path = os.path.join(PYTHON_DIR, "Weapon", "Handgun", "add_handgun.py")
+    spec = importlib.util.spec_from_file_location("add_handgun", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def clear_scene():
+    scene = bpy.context.scene
+    for obj in list(scene.objects):
+        scene.objects.unlink(obj)
+        bpy.data.objects.remove(obj)
+    for mesh in list(bpy.data.meshes):
+        if mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+
+
+def check_slide(handgun, str, seg, cyl_seg):
+    from generator_utils import compare_cut
+
+    scene = bpy.context.scene
+    slide_obj = handgun.make_slide(str, seg, SLIDE_H, LENGTH, WIDTH)
+    port_cut = handgun.make_ejection_port(EP[0], EP[1], EP[2], EP[3], EP[4], SLIDE_H, WIDTH)
+    barrel_obj, barrel_cut = handgun.make_barrel(str, seg, cyl_seg, LENGTH, B_RAD, THICK, HEIGHT, SLIDE_H)
+    spring_obj, spring_cut = handgun.make_recoil_spring(str, seg, LENGTH, C_RAD, HEIGHT, cyl_seg)
+    results = compare_cut(slide_obj, [port_cut, barrel_cut, spring_cut], scene)
+    clear_scene()
+    return results
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description="Compare the analytic slide cuts with booleans")
+    parser.add_argument("--tolerance", type=float, default=0.01,
+                        help="How far the removed volumes can be apart, relative to the boolean "
+                             "(or to 0.01 for holes smaller than that)")
+    parser.add_argument("--strict", action="store_true",
+                        help="Also fail when a hole falls back to the boolean")
+    args = parser.parse_args(argv)
+
+    handgun = load_handgun()
+    clear_scene()
+
+    failed = 0
+    for str, seg, cyl_seg in SETTINGS:
+        results = check_slide(handgun, str, seg, cyl_seg)
+        for name, result in zip(HOLES, results):
+            problems = []
+            a = result["analytic"]
+            b = result["boolean"]
+            if abs(a - b) > args.tolerance * max(abs(b), 0.01):
+                problems.append("volume %.6g != boolean %.6g" % (a, b))
+            if args.strict and result["fallback"]:
+                problems.append("fell back to the boolean")
+            if problems:
+                failed += 1
+            print("%s str=%g seg=%d cyl_seg=%d %s: %.6g/%.6g, %d/%d verts%s" % (
+                "FAIL" if problems else "ok", str, seg, cyl_seg, name, a, b,
+                result["analytic_verts"], result["boolean_verts"],
+                " (fallback)" if result["fallback"] else ""))
+            for p in problems:
+                print("    " + p)
+
+    print("%d of %d holes failed" % (failed, len(SETTINGS) * len(HOLES)))
+    return 1 if failed else 0
+
+
+sys.exit(main())
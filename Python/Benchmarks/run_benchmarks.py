@@ -0,0 +1,177 @@
+# License for this script is GNU GPL Version 3
+# The text for this license can be found here:
+# https://www.gnu.org/licenses/gpl-3.0.en.html
+
+#Runs every case in cases.json through a headless Blender
+#(see bench_worker.py), writes all of the results to one
+#JSON file and compares them to the stored budgets.
+#Exits with 1 if any case failed or went over budget.
+#
+#python run_benchmarks.py --blender /path/to/blender
+#python run_benchmarks.py --filter handgun --update-budgets
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import itertools
+import subprocess
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+#How much worse than the budget a measurement can be
+#before it counts as a regression (0.25 = 25% over).
+#Wall time is noisy, so it gets the most slack:
+DEFAULT_TOLERANCE = {"wall_time": 0.25,
+                     "peak_rss": 0.10,
+                     "py_alloc_count": 0.10,
+                     "py_peak_bytes": 0.10,
+                     }
+
+#These have to match exactly, otherwise the output
+#geometry changed and the budget is out of date:
+EXACT_KEYS = ("verts", "faces")
+
+
+def case_id(operator, params):
+    args = ",".join(k + "=" + str(params[k]) for k in sorted(params))
+    return operator + "[" + args + "]"
+
+
+#Expands each entry's matrix into one case per combination:
+def expand_cases(config):
+    cases = []
+    for entry in config["cases"]:
+        keys = sorted(entry.get("matrix", {}))
+        values = [entry["matrix"][k] for k in keys]
+        for combo in itertools.product(*values):
+            params = dict(entry.get("base", {}))
+            params.update(zip(keys, combo))
+            #Cases run with the geometry cache cleared before
+            #every run, unless they ask to time cache hits:
+            cache = entry.get("cache", False)
+            cid = case_id(entry["operator"], params)
+            cases.append({"id": cid + ":cached" if cache else cid,
+                          "operator": entry["operator"],
+                          "addon": entry["addon"],
+                          "params": params,
+                          "repeat": entry.get("repeat", config.get("repeat", 3)),
+                          "cache": cache,
+                          })
+    return cases
+
+
+def run_case(blender, case, timeout):
+    worker = os.path.join(HERE, "bench_worker.py")
+    tmp = tempfile.mkdtemp(prefix="bench_")
+    case_path = os.path.join(tmp, "case.json")
+    out_path = os.path.join(tmp, "result.json")
+    with open(case_path, "w") as f:
+        json.dump(case, f)
+
+    cmd = [blender, "-b", "--factory-startup", "--python", worker, "--", case_path, out_path]
+    try:
+        try:
+            proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, timeout=timeout)
+            log = proc.stdout.decode("utf-8", "replace")
+        except subprocess.TimeoutExpired:
+            return {"id": case["id"], "operator": case["operator"], "params": case["params"],
+                    "status": "timeout"}
+
+        if not os.path.exists(out_path):
+            return {"id": case["id"], "operator": case["operator"], "params": case["params"],
+                    "status": "crash", "error": log[-4000:]}
+        with open(out_path) as f:
+            return json.load(f)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+#Returns a list of messages, one for every measurement
+#that is over its budget. No budget means no check:
+def check_budget(result, budget, tolerance):
+    problems = []
+    if result["status"] != "ok":
+        return [result["status"] + ": " + result.get("error", "").strip().split("\n")[-1]]
+    if budget is None:
+        return problems
+
+    for key, slack in sorted(tolerance.items()):
+        if budget.get(key) is None or result.get(key) is None:
+            continue
+        limit = budget[key] * (1.0 + slack)
+        if result[key] > limit:
+            problems.append("%s %.6g > budget %.6g (+%d%%)" % (key, result[key], budget[key], int(slack * 100)))
+
+    for key in EXACT_KEYS:
+        if key in budget and result.get(key) != budget[key]:
+            problems.append("%s %s != budget %s" % (key, result.get(key), budget[key]))
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the generator operators in headless Blender")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"),
+                        help="Blender executable (default: $BLENDER or blender)")
+    parser.add_argument("--cases", default=os.path.join(HERE, "cases.json"))
+    parser.add_argument("--budgets", default=os.path.join(HERE, "budgets.json"))
+    parser.add_argument("--output", default=os.path.join(HERE, "results.json"))
+    parser.add_argument("--filter", default="", help="Only run cases whose id contains this")
+    parser.add_argument("--timeout", type=float, default=600.0, help="Seconds before a case is killed")
+    parser.add_argument("--tolerance", type=float, default=None,
+                        help="Use this slack for every measurement instead of the defaults")
+    parser.add_argument("--update-budgets", action="store_true",
+                        help="Store the results of this run as the new budgets")
+    args = parser.parse_args()
+
+    with open(args.cases) as f:
+        cases = [c for c in expand_cases(json.load(f)) if args.filter in c["id"]]
+
+    budgets = {}
+    if os.path.exists(args.budgets):
+        with open(args.budgets) as f:
+            budgets = json.load(f)
+
+    tolerance = dict(DEFAULT_TOLERANCE)
+    if args.tolerance is not None:
+        tolerance = dict((k, args.tolerance) for k in tolerance)
+
+    results = []
+    failed = 0
+    for i, case in enumerate(cases):
+        result = run_case(args.blender, case, args.timeout)
+        results.append(result)
+
+        problems = check_budget(result, budgets.get(case["id"]), tolerance)
+        if args.update_budgets and result["status"] == "ok":
+            problems = []
+        if problems:
+            failed += 1
+        status = "FAIL" if problems else "ok"
+        timing = ""
+        if result.get("wall_time") is not None:
+            timing = " %.4fs %d verts" % (result["wall_time"], result["verts"])
+        print("[%d/%d] %s %s%s" % (i + 1, len(cases), status, case["id"], timing))
+        for p in problems:
+            print("    " + p)
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=4, sort_keys=True)
+
+    if args.update_budgets:
+        for result in results:
+            if result["status"] != "ok":
+                continue
+            budgets[result["id"]] = dict((k, result[k]) for k in list(DEFAULT_TOLERANCE) + list(EXACT_KEYS))
+        with open(args.budgets, "w") as f:
+            json.dump(budgets, f, indent=4, sort_keys=True)
+        print("Stored budgets for %d cases in %s" % (len(results), args.budgets))
+
+    print("%d of %d cases failed" % (failed, len(cases)))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,6 +19,8 @@ import bmesh
 import mathutils
 import math
 
+from generator_utils import build_lods, lod_segments
+
 from bpy.props import (
         BoolProperty,
         BoolVectorProperty,
@@ -27,17 +29,13 @@ from bpy.props import (
         IntProperty,
         )
 
-#Takes a vert, and adds a table leg
-#to the bmesh at vert's coordinates
+#Takes a spot, and adds a table leg
+#to the bmesh at the spot's coordinates
 #and finally, it returns the bmesh:
-def add_table_leg(bm, v, ln, lt, ts, h, t, r):
-    #bm is the bmesh, v is the vert, 
-    #ln is the number of legs, lt is
-    #leg thickness, while r contains
-    #the rotation to use on each leg
-    
-    #Location of the new leg
-    loc = mathutils.Matrix.Translation(v.co)
+def add_table_leg(bm, co, ln, lt, ts, h, t):
+    #bm is the bmesh, co is where the
+    #leg goes, ln is the number of legs
+    #and lt is the leg thickness
     
     #Bmesh that holds the new leg data
     bm_leg = bmesh.new()
@@ -58,7 +56,7 @@ def add_table_leg(bm, v, ln, lt, ts, h, t, r):
     #Resize the table leg:
     bmesh.ops.scale(bm_leg, vec=(lt, lt, (h - t)), verts=bm_leg.verts)
     
-    bmesh.ops.translate(bm_leg, vec=v.co, verts=bm_leg.verts)
+    bmesh.ops.translate(bm_leg, vec=co, verts=bm_leg.verts)
     
     #Dump the new leg into bm:
     for v in bm_leg.verts:
@@ -79,7 +77,66 @@ def add_table_leg(bm, v, ln, lt, ts, h, t, r):
     bm_leg.free()
     
     return bm
+
+
+#Works out where each leg goes. This doesn't depend on
+#the segment counts, so every level of detail shares it:
+def leg_spots(legs, l, w, h, t, lo):
+    if legs == 0:
+        return []
     
+    #Holds locations for each leg
+    bm_loc = bmesh.new()
+
+    #Rotation amount:
+    r = 360.0 / legs
+    m = mathutils.Matrix.Rotation(math.radians(r), 3, 'Z')
+
+    #Position the first leg based
+    #off the number of table legs
+    if legs == 1:
+        #if only 1 leg, it goes
+        #in the table's center:
+        bm_loc.verts.new((0.0 , 0.0, ((h / 2.0) - (t / 2.0))))
+
+    elif legs == 4:
+        #If just 4 legs, one
+        #goes on each corner
+        bm_loc.verts.new((lo , lo, ((h / 2.0) - (t / 2.0))))
+    else:
+        #Otherwise, we always want at least
+        #one leg to line up with the x-axis
+        bm_loc.verts.new((lo , 0.0, ((h / 2.0) - (t / 2.0))))
+
+    #Skip if there's only 1 leg:
+    if legs > 1:
+        #Duplicate the vert, and
+        #rotate it for each leg:
+        geom_v = bm_loc.verts[:]
+
+        for i in range(0, legs):
+            #Add a new leg:
+            geom_ret = bmesh.ops.duplicate(bm_loc, geom=geom_v)
+
+            #Rotate it:
+            geom_v = [e for e in geom_ret["geom"] 
+                      if isinstance(e, bmesh.types.BMVert)]
+            del geom_ret
+
+            bmesh.ops.rotate(bm_loc,
+                             verts=geom_v,
+                             cent=(0.0, 0.0, 0.0),
+                             matrix=m)
+
+    #Resize the leg placement by
+    #multiplying x and y scales:
+    bmesh.ops.scale(bm_loc, vec=(l, w, 1.0), verts=bm_loc.verts)
+
+    spots = [v.co.copy() for v in bm_loc.verts]
+    bm_loc.free()
+    return spots
+
+
 class AddTable(bpy.types.Operator):
     """Add a simple table mesh"""
     bl_idname = "mesh.table_add"
@@ -140,6 +197,26 @@ class AddTable(bpy.types.Operator):
             min=0.0,
             default=0.75,
             )
+    lod_count = IntProperty(
+            name="LOD Levels",
+            description="How many levels of detail to make (1 makes just the mesh)",
+            min=1,
+            max=8,
+            default=1,
+            )
+    lod_ratio = FloatProperty(
+            name="LOD Ratio",
+            description="How much of the detail each level keeps from the one before",
+            min=0.05,
+            max=1.0,
+            default=0.5,
+            )
+    lod_budget = IntProperty(
+            name="Triangle Budget",
+            description="Most triangles LOD0 can have, the next levels get the ratio of the one before (0 for no limit)",
+            min=0,
+            default=0,
+            )
     location = FloatVectorProperty(
             name="Location",
             subtype='TRANSLATION',
@@ -169,6 +246,13 @@ class AddTable(bpy.types.Operator):
         col.prop(self, "leg_thick")
         col.prop(self, "leg_offset")
         
+        box = layout.box()
+        col = box.column()
+        col.label(text="Levels of Detail", icon="MOD_DECIM")
+        col.prop(self, "lod_count")
+        col.prop(self, "lod_ratio")
+        col.prop(self, "lod_budget")
+        
         box = layout.box()
         col = box.column()
         col.label(text="Placement", icon="NDOF_TURN")
@@ -176,18 +260,34 @@ class AddTable(bpy.types.Operator):
         col.prop(self, "rotation")
     
     def execute(self, context):
+        
+        #The legs go in the same spots on every level:
+        spots = leg_spots(self.legs, self.length, self.width, self.height, self.thick, self.leg_offset / 2.0)
+        build = lambda detail, level: [self.build(context, spots, detail)]
+        build_lods(build, self.lod_count, self.lod_ratio, self.lod_budget, "Table")
+        
+        return {'FINISHED'}
+    
+    #Makes the table with its segment counts scaled by
+    #detail, and returns the object:
+    def build(self, context, spots, detail=1.0):
 
         #Rename the variables
-        #to something simpler
+        #to something simpler.
+        #Square tops and legs (4
+        #segments) stay square:
         l = self.length
         w = self.width
         h = self.height
         ts = self.table_seg
+        if ts != 4:
+            ts = lod_segments(ts, detail, min(ts, 5))
         t = self.thick
         legs = self.legs
         lt = self.leg_thick
         ls = self.leg_seg
-        lo = self.leg_offset / 2.0
+        if ls != 4:
+            ls = lod_segments(ls, detail, min(ls, 5))
         
         #Create the tabletop object:
         mesh1 = bpy.data.meshes.new("tabletop")
@@ -227,59 +327,9 @@ class AddTable(bpy.types.Operator):
                             verts=bm.verts,
                             vec=(0.0, 0.0, h - (t / 2.0)))
         
-        #Make the table legs (If any):
-        if legs > 0:
-            #Holds locations for each leg
-            bm_loc = bmesh.new()
-            
-            #Rotation amount:
-            r = 360.0 / legs
-            m = mathutils.Matrix.Rotation(math.radians(r), 3, 'Z')
-            
-            #Position the first leg based
-            #off the number of table legs
-            if legs == 1:
-                #if only 1 leg, it goes
-                #in the table's center:
-                bm_loc.verts.new((0.0 , 0.0, ((h / 2.0) - (t / 2.0))))
-            
-            elif legs == 4:
-                #If just 4 legs, one
-                #goes on each corner
-                bm_loc.verts.new((lo , lo, ((h / 2.0) - (t / 2.0))))
-            else:
-                #Otherwise, we always want at least
-                #one leg to line up with the x-axis
-                bm_loc.verts.new((lo , 0.0, ((h / 2.0) - (t / 2.0))))
-            
-            #Skip if there's only 1 leg:
-            if legs > 1:
-                #Duplicate the vert, and
-                #rotate it for each leg:
-                geom_v = bm_loc.verts[:]
-                
-                for i in range(0, legs):
-                    #Add a new leg:
-                    geom_ret = bmesh.ops.duplicate(bm_loc, geom=geom_v)
-                    
-                    #Rotate it:
-                    geom_v = [e for e in geom_ret["geom"] 
-                              if isinstance(e, bmesh.types.BMVert)]
-                    del geom_ret
-                    
-                    bmesh.ops.rotate(bm_loc,
-                                     verts=geom_v,
-                                     cent=(0.0, 0.0, 0.0),
-                                     matrix=m)
-            
-            #Resize the leg placement by
-            #multiplying x and y scales:
-            bmesh.ops.scale(bm_loc, vec=(l, w, 1.0), verts=bm_loc.verts)
-            
-            #Now create the table legs at the
-            #location of each vert in bm_loc:
-            for v in bm_loc.verts:
-                bm = add_table_leg(bm, v, legs, lt, ls, h, t, m)
+        #Make the table legs (If any) at each spot:
+        for co in spots:
+            bm = add_table_leg(bm, co, legs, lt, ls, h, t)
         
         
         #Now update the mesh object:
@@ -287,7 +337,7 @@ class AddTable(bpy.types.Operator):
         mesh1.update()
         bm.free()
         
-        return {'FINISHED'}
+        return tabletop_obj
 
 
 def menu_func(self, context):
@@ -1,38 +1,105 @@
 import bpy
 import bmesh
-import math
+import numpy as np
+
+from generator_utils import MeshData, solidify, crease_rim, TextureSet, texture_dir, build_lods, lod_segments, lod_name
+from generator_utils import COLLISION_SHAPES, ENGINES, MAX_HULL_VERTS, collision_name, add_collision
 
 #ADDON WILL CURRENTLY RUN!
-#TODO: https://blender.stackexchange.com/questions/643/is-it-possible-to-create-image-data-and-save-to-a-file-from-a-script
-#Sync bmesh selection with UV selection, then select all base faces
-#Import your selection methods from other scripts to get the selection methods, if you need them
-#Create the image based off of the texture sizes (texture_w, texture_h)
-#Fill the entire image with the basic orange color (color1)
-#make another method that determines the highest x, smallest x, highest y, and lowest y (of the selected UV coordinates) and
-#then make a square of color3 that completely covers all selected UV coordinates
-#Deselect all
-#Try to select each exterior face of the cone, one at a time
-#Put all stripes (if any) 3/4 of the way up the face.
-#MAKE SURE YOU MAKE AN ALBEDO MAP, ROUGHNESS MAP, AND METAL MAP
 
 #bpy.context.scene.render.engine = 'CYCLES'
 
-def get_dist(a, b):
-    
-    #Break a and b into
-    #6 simple variables
-    x1 = a[0]
-    y1 = a[1]
-    z1 = a[2]
-    
-    x2 = b[0]
-    y2 = a[1]
-    z2 = a[2]
-    
-    #Do the distance formula
-    #and return the results:
-    return math.sqrt((((x2 - x1)**2) + ((y2 - y1)**2) + ((z2 - z1)**2)))
-    
+#Where each stripe goes, as (bottom, top) fractions of
+#the cone's height. All of them sit in the upper part of
+#the cone, the first one 3/4 of the way up:
+def stripe_bands(stripes, top=0.8, height=0.15, gap=0.1):
+    bands = []
+    for i in range(stripes):
+        upper = top - (i * (height + gap))
+        bands += [(upper - height, upper)]
+    return bands
+
+
+#Finds the UV rectangles that each stripe band covers,
+#straight from the mesh arrays (no edit mode, no UV
+#selection). A face is on the outside of the cone when it
+#is a quad and all 4 corners are on the outer surface,
+#which goes from radius2 at the bottom to radius1 at the
+#top. Each of those quads has two sides that go from the
+#bottom ring to the top ring, and a band is the part of
+#the quad between the same two heights on both sides.
+#Returns one (n, 4) array of (u0, v0, u1, v1) per band.
+def stripe_regions(data, bands, thick, coneh, radius1, radius2, tol=None):
+    if tol is None:
+        tol = min(thick, radius1) * 0.25
+    bands = np.asarray(bands, np.float64).reshape(-1, 2)
+    empty = [np.zeros((0, 4), np.float32) for b in bands]
+    if data.uv is None or not data.face_count:
+        return empty
+
+    #Radial distance and height of every loop, all at once:
+    co = data.co[data.loops].astype(np.float64)
+    dist = np.hypot(co[:, 0], co[:, 1])
+    z = co[:, 2]
+    outer = radius2 + ((radius1 - radius2) * (z - thick) / coneh)
+    on_cone = ((np.abs(dist - outer) <= tol) & (z >= thick - tol) & (z <= thick + coneh + tol))
+
+    #Every quad with all 4 loops on the outer surface:
+    quads = np.flatnonzero(data.loop_total == 4)
+    loops = data.loop_start[quads][:, None] + np.arange(4)
+    keep = on_cone[loops].all(axis=1)
+    quads, loops = quads[keep], loops[keep]
+
+    #Two corners on the top ring and two on the bottom one,
+    #next to each other. Roll every quad so the top corners
+    #come first, then the sides are (1, 2) and (0, 3):
+    quad_z = z[loops]
+    top = quad_z > quad_z.mean(axis=1)[:, None]
+    pair = top & np.roll(top, -1, axis=1)
+    first = np.argmax(pair, axis=1)
+    keep = (top.sum(axis=1) == 2) & pair.any(axis=1)
+    loops = loops[np.arange(len(loops))[:, None], (first[:, None] + np.arange(4)) % 4][keep]
+    if not len(loops):
+        return empty
+
+    z = z[loops]
+    uv = data.uv[loops].astype(np.float64)
+    sides = ((0, 3), (1, 2))
+
+    regions = []
+    for lo, hi in bands:
+        corners = []
+        for t_idx, b_idx in sides:
+            zb = z[:, b_idx]
+            span = np.maximum(z[:, t_idx] - zb, 1e-9)
+            for frac in (lo, hi):
+                t = np.clip(((thick + (frac * coneh)) - zb) / span, 0.0, 1.0)
+                corners += [uv[:, b_idx] + (t[:, None] * (uv[:, t_idx] - uv[:, b_idx]))]
+        corners = np.stack(corners, axis=1)
+        rects = np.concatenate((corners.min(axis=1), corners.max(axis=1)), axis=1)
+        regions += [rects.astype(np.float32)]
+    return regions
+
+
+#Finds the UV rectangles of the base, the same way. A
+#face is part of the base when all of its corners are
+#no higher than the top of the base, which is thick. The
+#base's UV islands are only base faces, so each face's
+#UV bounds can be filled whole.
+#Returns an (n, 4) array of (u0, v0, u1, v1).
+def base_regions(data, thick, tol=None):
+    if tol is None:
+        tol = thick * 0.25
+    if data.uv is None or not data.face_count:
+        return np.zeros((0, 4), np.float32)
+
+    start = data.loop_start
+    low = data.co[data.loops][:, 2] <= thick + tol
+    base = np.logical_and.reduceat(low, start)
+    uv = data.uv.astype(np.float64)
+    lo = np.minimum.reduceat(uv, start, axis=0)
+    hi = np.maximum.reduceat(uv, start, axis=0)
+    return np.concatenate((lo, hi), axis=1)[base].astype(np.float32)
 
 from bpy.props import (
         BoolProperty,
@@ -41,6 +108,7 @@ from bpy.props import (
         FloatVectorProperty,
         IntProperty,
         EnumProperty,
+        StringProperty,
         )
 
 
@@ -122,20 +190,31 @@ class AddTrafficCone(bpy.types.Operator):
             min=1,
             default=2048,
             )
+    output_dir = StringProperty(
+            name="Save To",
+            description="Folder the texture maps get saved to as PNG files",
+            default="//textures/",
+            subtype='DIR_PATH',
+            )
     col_mesh = EnumProperty(
             name="Collision Mesh",
             description="Collision mesh to generate for the object",
             items=(('BOX', 'Box', 'A simple box'),
                 ('TIGHT', 'Tight Box', 'A box that better matches the mesh'),
-                ('SIMPLE', 'Simple', 'A simple mesh that tightly matches the bounds'),
-                ('NONE', 'None', 'Do not generate collision for this object')),
+                ('SIMPLE', 'Simple', 'A simple mesh that tightly matches the bounds'))
+                + tuple(s for s in COLLISION_SHAPES if s[0] != 'BOX'),
             default='SIMPLE',
             )
+    col_verts = IntProperty(
+            name="Vertex Limit",
+            description="Most verts a convex hull collision mesh can have",
+            min=4,
+            default=MAX_HULL_VERTS,
+            )
     engine_type = EnumProperty(
             name="Game Engine",
             description="Which engine this will be exported to (Unity if unsure)",
-            items=(('UNITY', 'Unity', 'For the Unity Game Engine or any other engines'),
-                ('UNREAL', 'Unreal', 'For Unreal Engine 4')),
+            items=ENGINES,
             default='UNITY',
             )
     vis = BoolProperty(
@@ -143,6 +222,26 @@ class AddTrafficCone(bpy.types.Operator):
             description="Toggles the visibility of the collision mesh",
             default=True,
             )
+    lod_count = IntProperty(
+            name="LOD Levels",
+            description="How many levels of detail to make (1 makes just the mesh)",
+            min=1,
+            max=8,
+            default=1,
+            )
+    lod_ratio = FloatProperty(
+            name="LOD Ratio",
+            description="How much of the detail each level keeps from the one before",
+            min=0.05,
+            max=1.0,
+            default=0.5,
+            )
+    lod_budget = IntProperty(
+            name="Triangle Budget",
+            description="Most triangles LOD0 can have, the next levels get the ratio of the one before (0 for no limit)",
+            min=0,
+            default=0,
+            )
     layers = BoolVectorProperty(
             name="Layers",
             description="Object Layers",
@@ -191,28 +290,47 @@ class AddTrafficCone(bpy.types.Operator):
         col.label(text="Resolution:")
         col.prop(self, "texture_w")
         col.prop(self, "texture_h")
+        col.prop(self, "output_dir")
+        
+        box = layout.box()
+        col = box.column()
+        col.label(text="Levels of Detail", icon="MOD_DECIM")
+        col.prop(self, "lod_count")
+        col.prop(self, "lod_ratio")
+        col.prop(self, "lod_budget")
         
         box = layout.box()
         col = box.column()
         col.label(text="Collision", icon="MOD_PHYSICS")
         col.prop(self, "col_mesh")
+        col.prop(self, "col_verts")
         col.prop(self, "engine_type")
         col.prop(self, "vis")
     
     def execute(self, context):
+        build = lambda detail, level: [self.build(context, detail, level)]
+        levels = build_lods(build, self.lod_count, self.lod_ratio, self.lod_budget, "Traffic_Cone")
+        
+        #Only the most detailed level gets collision:
+        for obj in levels[0][0]:
+            self.make_collision(context, obj)
+        
+        return {'FINISHED'}
+    
+    #Makes the cone with its segments scaled by detail,
+    #and returns the object:
+    def build(self, context, detail=1.0, level=0):
         
         coneh = self.coneh
-        cones = self.cones
+        cones = lod_segments(self.cones, detail)
         radius1 = self.radius1
         radius2 = self.radius2
         basew = (self.basew / 2.0)
         thick = self.thick
         color1 = self.color1
         color2 = self.color2
+        color3 = self.color3
         stripes = self.stripes
-        col = self.col_mesh
-        eng = self.engine_type
-        vis = self.vis
         texture_w = self.texture_w
         texture_h = self.texture_h
         
@@ -267,16 +385,11 @@ class AddTrafficCone(bpy.types.Operator):
         for face in bm.faces:
             face.smooth = True
         
-        bm.to_mesh(mesh2)
-        mesh2.update()
-        
-        #Solidify the empty cone
-        bpy.context.scene.objects.active = cone_cone_obj
-        cone_cone_obj.data = cone_cone_obj.data.copy()
-        solid = cone_cone_obj.modifiers.new("solid", type='SOLIDIFY')
-        solid.edge_crease_rim = 1.0
-        solid.thickness = thick
-        bpy.ops.object.modifier_apply(apply_as='DATA', modifier=solid.name)
+        #Solidify the empty cone, with its rim creased:
+        solid, rim_faces = solidify(MeshData.from_bmesh(bm), thick)
+        bm.free()
+        solid.to_mesh(mesh2)
+        crease_rim(mesh2, solid, rim_faces, 1.0)
         bpy.ops.object.select_all(action='DESELECT')
         
         #Make the object that gets cut out of cone_base:
@@ -345,190 +458,35 @@ class AddTrafficCone(bpy.types.Operator):
         material1 = bpy.context.active_object.data.materials[0]
         material1.diffuse_color = color1
         
-        #EXPERIMENTAL----------------------
-        #
-        #
-        #
-        #Make the albedo, metallic, and roughness maps:
-        albedo_image = bpy.data.images.new("Traffic_Cone_Albedo", width=texture_w, height=texture_h)
-        metallic_image = bpy.data.images.new("Traffic_Cone_Metallic", width=texture_w, height=texture_h)
-        roughness_image = bpy.data.images.new("Traffic_Cone_Roughness", width=texture_w, height=texture_h)
-        
-        #albedo colors (color1)
-        r_alb = color1[0]
-        g_alb = color1[1]
-        b_alb = color1[2]
-        a_alb = 1.0
-        #Metallic colors (All black for now)
-        #Only the stripes would be metallic.
-        r_met = 0.0
-        g_met = 0.0
-        b_met = 0.0
-        a_met = 1.0
-        #Roughness colors (Completely rough)
-        r_rough = 1.0
-        g_rough = 1.0
-        b_rough = 1.0
-        a_rough = 1.0
-        
-        albedo_map = [None] * texture_w * texture_h
-        metallic_map = [None] * texture_w * texture_h
-        roughness_map = [None] * texture_w * texture_h
-        
-        for x in range(texture_w):
-            for y in range(texture_h):
-                #Fill the albedo map with color1
-                albedo_map[(y * texture_w) + x] = [r_alb, g_alb, b_alb, a_alb]
-                #Fill the metallic map:
-                metallic_map[(y * texture_w) + x] = [r_met, g_met, b_met, a_met]
-                #Fill the roughness map:
-                roughness_map[(y * texture_w) + x] = [r_rough, g_rough, b_rough, a_rough]
-        
-        #Figure out the locations for the
-        #stripe (if any) on the textures:
+        #Make the albedo, metallic, and roughness maps.
+        #Albedo starts as color1, metallic all black
+        #(only the stripes would be metallic) and the
+        #roughness completely rough. Every LOD has its
+        #own UVs, so each one gets its own maps:
+        name = "Traffic_Cone"
+        if self.lod_count > 1:
+            name = lod_name(name, level)
+        textures = TextureSet(name, texture_w, texture_h)
+        textures["albedo"].fill(color1)
+        
+        #The base gets color3:
+        data = MeshData.from_mesh(context.active_object.data)
+        textures["albedo"].fill_rects(base_regions(data, thick), color3)
+        
+        #Paint the stripes (if any) onto the textures.
+        #They're the only metallic part of the cone, and
+        #smoother than the rest of it:
         if stripes > 0:
-            #Sync mesh selection to UV selection
-            bpy.data.scenes["Scene"].tool_settings.use_uv_select_sync = True
-            
-            #List of selected UV coordinates:
-            uv_x_list = []
-            uv_y_list = []
-            
-            bpy.ops.object.mode_set(mode='EDIT')
-            bm = bmesh.from_edit_mesh(context.active_object.data)
-            
-            uv_layer = bm.loops.layers.uv.verify()
-            bm.faces.layers.tex.verify()  #Currently, Blender needs both layers.
-            
-            #Deselect everything so that no
-            #UV verts or faces are selected
-            bpy.ops.mesh.select_all(action='DESELECT')
-            
-            #keep track of all stripe vertices
-            #on the outside faces of the cone:
-            for f in bm.faces:
-                #Every one of the cone faces
-                #has only exactly 4 vertices
-                #so ignore faces that don't:
-                if len(f.verts) == 4:
-                    #If the vert's distance from
-                    #the cone's center = radius1 
-                    #or radius2, and all 4 verts
-                    #are equal to either radius,
-                    #then give the face a stripe
-                    
-                    #The cone faces needed
-                    #all have a top-right,
-                    #top-left, bottom-left
-                    #and bottom-right vert
-                    top = []
-                    bottom = []
-                    
-                    matches = 0
-                    for v in f.verts:
-                        #The floats somehow lost 
-                        #accuracy so round them:
-                        #x = round(v.co.x, 3)
-                        #y = round(v.co.y, 3)
-                        #z = round(v.co.z, 3)
-                        #t = round(thick, 3)
-                        #c = round(coneh, 3)
-                        #b = round(basew, 3)
-                        dist1 = get_dist((v.co.x, v.co.y, v.co.z), (0.0, 0.0, thick + coneh))
-                        #print(dist1)
-                        dist2 = get_dist((v.co.x, v.co.y, v.co.z), (0.0, 0.0, thick))
-                        #print(dist2)
-                        if dist1 <= radius1 + 0.0125 and dist1 >= radius1 - 0.0125:
-                            top += [v]
-                            v.select = True
-                            matches += 1
-                            #print("Upper")
-                        elif dist2 <= radius2 + 0.0125 and dist2 >= radius2 - 0.0125:
-                            bottom += [v]
-                            v.select = True
-                            matches += 1
-                            #print("Lower")
-                        #Needs 4 matches, 2 up top, 2 down below:
-                        if matches == 4 and len(bottom) == 2 and len(top) == 2:
-                            print("Found one.")
-                            #And move on with getting their coords...
-                            
-                    #Now deselect any selected verts:
-                    for v in f.verts:
-                        v.select = False
-                        
-                            
-            """for v in bm.verts:
-                #The floats somehow lost 
-                #accuracy so round them:
-                x = round(v.co.x, 3)
-                y = round(v.co.y, 3)
-                z = round(v.co.z, 3)
-                t = round(thick, 3)
-                c = round(coneh, 3)
-                b = round(basew, 3)
-                
-                #If z is as tall as the bottom
-                #of the cone or as tall as the
-                #base plus cone's height then:
-                if z == t or z == (c + t):
-                    #Just a quick note, the inner
-                    #thickness of the cone is not
-                    #level with the outside, so z
-                    #cannot be equal to t or t+c.
-                    
-                    #If v.co.x is not a vert
-                    #found in the base then:
-                    if x < b and x > -b and y < b and y > -b:
-                        v.select = True
-                        print("Hi")
-                        
-                        
-                        
-                        
-                        #"Go through vertices, then go through faces, and during that, go through loops?"
-                        #None of this makes sense, so rewrite it.
-                        for f in bm.faces:
-                            for l in f.loops:
-                                luv = l[uv_layer]
-                                if luv.select:
-                                    # get the uv location
-                                    uv_x_list += luv.uv.x
-                                    uv_y_list += luv.uv.y
-                                    print("sdf")"""
-                        
-        bmesh.update_edit_mesh(context.active_object.data)
-        bpy.ops.object.mode_set(mode='OBJECT')
-        
-        #Finalize the images and save them as PNG files:--------------------------------------------------------
-        
-        #Flatten Each image
-        albedo_map = [channels for pixel in albedo_map for channels in pixel]
-        metallic_map = [channels for pixel in metallic_map for channels in pixel]
-        roughness_map = [channels for pixel in roughness_map for channels in pixel]
+            regions = stripe_regions(data, stripe_bands(stripes), thick, coneh, radius1, radius2)
+            for rects in regions:
+                textures["albedo"].fill_rects(rects, color2)
+                textures["metallic"].fill_rects(rects, (1.0, 1.0, 1.0))
+                textures["roughness"].fill_rects(rects, (0.25, 0.25, 0.25))
         
-        #Dump each map's pixels into their respective image
-        albedo_image.pixels = albedo_map
-        metallic_image.pixels = metallic_map
-        roughness_image.pixels = roughness_map
-        
-        #Save the albedo map as a PNG:
-        albedo_image.filepath_raw = "C:/Users/Austin/Desktop/traffic_cone_albedo.png"
-        albedo_image.file_format = 'PNG'
-        albedo_image.save()
-        
-        #Save the metallic map as a PNG:
-        metallic_image.filepath_raw = "C:/Users/Austin/Desktop/traffic_cone_metallic.png"
-        metallic_image.file_format = 'PNG'
-        metallic_image.save()
-        
-        #Save the roughness map as a PNG:
-        roughness_image.filepath_raw = "C:/Users/Austin/Desktop/traffic_cone_roughness.png"
-        roughness_image.file_format = 'PNG'
-        roughness_image.save()
-        #
-        #
-        #---------------------------------------------------------------------------
+        #Finalize the images and save them as PNG files.
+        #The files get written in the background:
+        images = textures.to_images()
+        textures.save(texture_dir(self.output_dir), images)
         
         #Create the cone albedo texture:
         #albedo = bpy.data.images.new(name='Traffic_Cone_Albedo', width=texture_w, height=texture_h)
@@ -537,13 +495,23 @@ class AddTrafficCone(bpy.types.Operator):
         #slot = material1.texture_slots.add()
         #slot.texture = albedo
         
+        return context.active_object
+    
+    #Collision mesh for obj, named after it:
+    def make_collision(self, context, obj):
+        coneh = self.coneh
+        radius1 = self.radius1
+        radius2 = self.radius2
+        basew = (self.basew / 2.0)
+        thick = self.thick
+        col = self.col_mesh
+        eng = self.engine_type
+        vis = self.vis
+        
         #Generate collision mesh:
         #Name the collision mesh based off of what engine will be used
-        if col != 'NONE':
-            if eng == 'UNITY':
-                col_name = context.active_object.name + "_collision_00"
-            elif eng == 'UNREAL':
-                col_name = "UCX_" + context.active_object.name + "_00"
+        if col in ('BOX', 'TIGHT', 'SIMPLE'):
+            col_name = collision_name(obj.name, eng)
             
             col_verts = []
             col_faces = []
@@ -644,8 +612,10 @@ class AddTrafficCone(bpy.types.Operator):
         
             #Hide collision mesh:
             bpy.data.objects[cone_col_obj.name].hide = vis
-
-        return {'FINISHED'}
+        
+        #The other shapes get fit to the finished cone:
+        elif col != 'NONE':
+            add_collision(context, obj, col, eng, vis, self.col_verts)
 
 
 def menu_func(self, context):
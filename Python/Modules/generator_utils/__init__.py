@@ -0,0 +1,25 @@
+# License for this script is GNU GPL Version 3
+# The text for this license can be found here:
+# https://www.gnu.org/licenses/gpl-3.0.en.html
+
+#Shared code for the generator addons. This package
+#has to be somewhere on Blender's python path, like
+#the scripts/modules folder (see README.txt).
+
+from .mesh_data import MeshData, add_mesh_object
+from .spatial_index import SpatialIndex, FaceExtents, bm_verts, bm_edges, bm_faces
+from .geometry_cache import GeometryCache, geometry_cache, props_key, snapshot_objects, restore_objects, PLACEMENT_PROPS
+from .cutting import box_cutter, cylinder_cutter, mesh_cutter, cut_bmesh, cut_mesh, cut_object, boolean_cut, boolean_fallback, compare_cut
+from .topology import TopologyGroups
+from .template_store import TemplateStore
+from .textures import TextureBuffer, TextureSet, TextureWriter, texture_writer, texture_dir, encode_png, write_png
+from .collision import COLLISION_SHAPES, COLLISION_PROPS, ENGINES, MAX_HULL_VERTS, collision_name, collision_mesh
+from .collision import add_collision, add_collisions, quickhull, kdop, oriented_box, box_mesh
+from .lod import LOD_PROPS, lod_name, lod_details, lod_segments, tri_count, remove_objects, build_lods
+from .bezier import BezierCurve
+from .solidify import face_normals, vertex_normals, boundary_loops, solidify, crease_rim, solidify_object
+from .scatter import poisson_disk, density_from_array, image_density, plane_transforms
+from .noise import noise_tables, value_noise, fractal_noise
+from .rocks import ROCK_VERSION, icosphere, rock_mesh, rock_variants
+from .overlap import BoxIndex, rect_polygon, rect_intersection, polygon_area, clip_polygon, find_overlaps, overlap_regions, object_bounds
+from .footprint import region_loops, polygon_union, point_in_polygon, nest_loops, triangulate, extrude_loops, cap_loops
@@ -0,0 +1,158 @@
+# License for this script is GNU GPL Version 3
+# The text for this license can be found here:
+# https://www.gnu.org/licenses/gpl-3.0.en.html
+
+#Cubic Bezier math on plain arrays, so a generator can
+#lay things out along a curve without making a curve
+#object, converting it to a mesh or switching modes.
+#
+#A BezierCurve is a chain of cubic segments, one (4, 3)
+#block of control points each. A point on the chain is
+#picked with a parameter u from 0 to the segment count:
+#the whole part is the segment and the rest is the t
+#inside of it. Lengths come from Gauss-Legendre
+#quadrature of the derivative, which is exact enough
+#with a handful of points per segment, and samples that
+#are evenly spaced by length come from a table of
+#lengths that gets inverted with a Newton step.
+
+import numpy as np
+
+#Bernstein coefficients of a cubic and its derivatives:
+_B0 = np.array([[1, 0, 0, 0], [-3, 3, 0, 0], [3, -6, 3, 0], [-1, 3, -3, 1]], np.float64)
+
+
+class BezierCurve(object):
+    """A chain of cubic Bezier segments"""
+
+    def __init__(self, points):
+        self.points = np.asarray(points, np.float64).reshape(-1, 4, 3)
+        #Power basis, so p(t) = c0 + c1 t + c2 t^2 + c3 t^3:
+        self.coeffs = np.einsum('ij,sjk->sik', _B0, self.points)
+        self._table = None
+
+    #From the knots and their handles, the way Blender
+    #keeps bezier_points (co, handle_left, handle_right):
+    @classmethod
+    def from_knots(cls, co, handle_left, handle_right, cyclic=False):
+        co = np.asarray(co, np.float64).reshape(-1, 3)
+        left = np.asarray(handle_left, np.float64).reshape(-1, 3)
+        right = np.asarray(handle_right, np.float64).reshape(-1, 3)
+        end = np.roll(np.arange(len(co)), -1)
+        if not cyclic:
+            end = end[:-1]
+        start = end - 1
+        return cls(np.stack((co[start], right[start], left[end], co[end]), axis=1))
+
+    #Reads the first spline of a curve object's data:
+    @classmethod
+    def from_spline(cls, spline):
+        n = len(spline.bezier_points)
+        arrays = []
+        for name in ("co", "handle_left", "handle_right"):
+            arr = np.empty(n * 3, np.float32)
+            spline.bezier_points.foreach_get(name, arr)
+            arrays.append(arr)
+        return cls.from_knots(*arrays, cyclic=spline.use_cyclic_u)
+
+    @property
+    def segment_count(self):
+        return len(self.points)
+
+    def _split(self, u):
+        u = np.asarray(u, np.float64)
+        seg = np.clip(np.floor(u).astype(np.int64), 0, self.segment_count - 1)
+        return seg, u - seg
+
+    #Position at every u:
+    def evaluate(self, u):
+        seg, t = self._split(u)
+        c = self.coeffs[seg]
+        t = t[..., None]
+        return c[..., 0, :] + (t * (c[..., 1, :] + (t * (c[..., 2, :] + (t * c[..., 3, :])))))
+
+    #First derivative, the (unnormalized) tangent:
+    def derivative(self, u):
+        seg, t = self._split(u)
+        c = self.coeffs[seg]
+        t = t[..., None]
+        return c[..., 1, :] + (t * ((2.0 * c[..., 2, :]) + (3.0 * t * c[..., 3, :])))
+
+    def second_derivative(self, u):
+        seg, t = self._split(u)
+        c = self.coeffs[seg]
+        return (2.0 * c[..., 2, :]) + (6.0 * t[..., None] * c[..., 3, :])
+
+    def tangent(self, u):
+        d = self.derivative(u)
+        return d / np.maximum(np.linalg.norm(d, axis=-1), 1e-12)[..., None]
+
+    #Length of the curve between u0 and u1 for each pair,
+    #with order Gauss-Legendre points per segment crossed:
+    def _lengths(self, u0, u1, order):
+        x, w = np.polynomial.legendre.leggauss(order)
+        half = (u1 - u0) / 2.0
+        u = ((u0 + u1) / 2.0)[:, None] + (half[:, None] * x)
+        speed = np.linalg.norm(self.derivative(u), axis=-1)
+        return half * speed.dot(w)
+
+    def segment_lengths(self, order=8):
+        start = np.arange(self.segment_count, dtype=np.float64)
+        return self._lengths(start, start + 1.0, order)
+
+    def length(self, order=8):
+        return float(self.segment_lengths(order).sum())
+
+    #Lengths from the start of the curve at steps evenly
+    #spaced in u (steps per segment), worked out once:
+    def arc_table(self, steps=32, order=5):
+        if self._table is None or self._table[0] != (steps, order):
+            u = np.linspace(0.0, self.segment_count, (self.segment_count * steps) + 1)
+            s = np.concatenate(([0.0], np.cumsum(self._lengths(u[:-1], u[1:], order))))
+            self._table = ((steps, order), u, s)
+        return self._table[1:]
+
+    #The u where the curve is s long, for every s. The table
+    #gets it close and a Newton step on the speed polishes it:
+    def param_at_length(self, s, steps=32):
+        u_table, s_table = self.arc_table(steps)
+        s = np.clip(np.asarray(s, np.float64), 0.0, s_table[-1])
+        u = np.interp(s, s_table, u_table)
+        i = np.clip(np.searchsorted(u_table, u, side='right') - 1, 0, len(u_table) - 2)
+        done = s_table[i] + self._lengths(u_table[i], u, 4)
+        speed = np.maximum(np.linalg.norm(self.derivative(u), axis=-1), 1e-12)
+        return np.clip(u - ((done - s) / speed), 0.0, self.segment_count)
+
+    #count points spread evenly by length, from end to end:
+    def sample(self, count, steps=32):
+        u_table, s_table = self.arc_table(steps)
+        s = np.linspace(0.0, s_table[-1], count)
+        u = self.param_at_length(s, steps)
+        return self.evaluate(u), self.tangent(u), s
+
+    #Rotation minimizing frames at count points evenly spread
+    #by length, with the double reflection method. normal
+    #is where the first frame's normal should point (it is
+    #made perpendicular to the tangent). Returns positions,
+    #tangents, normals and binormals as (count, 3) arrays.
+    def frames(self, count, normal=(0.0, 0.0, 1.0), steps=32):
+        pos, tan, s = self.sample(count, steps)
+        nor = np.empty_like(pos)
+        n = np.asarray(normal, np.float64)
+        n = n - (n.dot(tan[0]) * tan[0])
+        if np.linalg.norm(n) < 1e-9:
+            n = np.cross(tan[0], (1.0, 0.0, 0.0) if abs(tan[0][0]) < 0.9 else (0.0, 1.0, 0.0))
+        nor[0] = n / np.linalg.norm(n)
+
+        v1 = pos[1:] - pos[:-1]
+        c1 = np.maximum((v1 * v1).sum(axis=1), 1e-300)
+        for i in range(count - 1):
+            r = nor[i] - ((2.0 / c1[i]) * v1[i].dot(nor[i]) * v1[i])
+            t = tan[i] - ((2.0 / c1[i]) * v1[i].dot(tan[i]) * v1[i])
+            v2 = tan[i + 1] - t
+            c2 = v2.dot(v2)
+            if c2 > 1e-300:
+                r = r - ((2.0 / c2) * v2.dot(r) * v2)
+            nor[i + 1] = r
+        nor /= np.linalg.norm(nor, axis=1)[:, None]
+        return pos, tan, nor, np.cross(tan, nor)
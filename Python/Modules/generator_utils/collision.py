@@ -0,0 +1,308 @@
+# License for this script is GNU GPL Version 3
+# The text for this license can be found here:
+# https://www.gnu.org/licenses/gpl-3.0.en.html
+
+#Collision meshes for the generators, made from the verts
+#of whatever they built: an axis aligned box, an oriented
+#box, a 14, 18 or 26-DOP (the box with its edges and/or
+#corners cut off), or the convex hull itself. All of them
+#come out as convex MeshData, which is what Unity's and
+#Unreal's convex colliders want.
+#
+#The hull is a numpy quickhull. Points get added farthest
+#first, so stopping at the vertex cap still leaves a
+#proper convex hull, just of fewer points, which is how
+#a hull can be kept under the engine's limits.
+#
+#Names follow the engine conventions the traffic cone
+#started with: "<name>_collision_00" for Unity and
+#"UCX_<name>_00" for Unreal, counting up for each extra
+#collision mesh of the same object.
+
+import numpy as np
+
+from .mesh_data import MeshData
+
+#Shapes every generator can pick, for an EnumProperty:
+COLLISION_SHAPES = (('BOX', 'Box', 'A simple box'),
+                    ('OBB', 'Oriented Box', 'A box turned to fit the mesh as tightly as it can'),
+                    ('DOP14', '14-DOP', 'A box with its corners cut off'),
+                    ('DOP18', '18-DOP', 'A box with its edges cut off'),
+                    ('DOP26', '26-DOP', 'A box with its edges and corners cut off'),
+                    ('HULL', 'Convex Hull', 'The convex hull of the mesh, up to the vertex limit'),
+                    ('NONE', 'None', 'Do not generate collision for this object'),
+                    )
+
+ENGINES = (('UNITY', 'Unity', 'For the Unity Game Engine or any other engines'),
+           ('UNREAL', 'Unreal', 'For Unreal Engine 4'),
+           )
+
+#Operator properties that only pick the collision mesh,
+#for leaving out of a geometry_cache key:
+COLLISION_PROPS = ("col_mesh", "col_verts", "engine_type", "vis")
+
+#Unity won't take a convex mesh with more than 255
+#triangles, and a hull with v verts has 2v - 4 of them:
+MAX_HULL_VERTS = 128
+
+_FACES = np.array([(0, 2, 6, 4), (1, 5, 7, 3), (0, 4, 5, 1),
+                   (2, 3, 7, 6), (0, 1, 3, 2), (4, 6, 7, 5)], np.int32)
+
+_CORNERS = np.array([(x, y, z) for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)], np.float64)
+
+
+def _dirs(rows):
+    dirs = np.array(rows, np.float64)
+    return dirs / np.linalg.norm(dirs, axis=1)[:, None]
+
+_AXES = [(1, 0, 0), (0, 1, 0), (0, 0, 1)]
+_CORNER_DIRS = [(1, 1, 1), (1, 1, -1), (1, -1, 1), (1, -1, -1)]
+_EDGE_DIRS = [(1, 1, 0), (1, -1, 0), (1, 0, 1), (1, 0, -1), (0, 1, 1), (0, 1, -1)]
+
+#The slab directions of each k-DOP, k/2 of them:
+DOP_DIRS = {6: _dirs(_AXES),
+            14: _dirs(_AXES + _CORNER_DIRS),
+            18: _dirs(_AXES + _EDGE_DIRS),
+            26: _dirs(_AXES + _CORNER_DIRS + _EDGE_DIRS),
+            }
+
+
+def collision_name(name, engine, index=0):
+    if engine == 'UNREAL':
+        return "UCX_%s_%02d" % (name, index)
+    return "%s_collision_%02d" % (name, index)
+
+
+def _points(points):
+    if isinstance(points, MeshData):
+        points = points.co
+    return np.asarray(points, np.float64).reshape(-1, 3)
+
+
+def box_mesh(center, axes, half):
+    co = np.asarray(center, np.float64) + (_CORNERS * np.asarray(half, np.float64)).dot(np.asarray(axes, np.float64))
+    return MeshData(co, _FACES.ravel(), np.full(6, 4, np.int32))
+
+
+#The smallest and biggest corner along x, y and z:
+def aabb(points):
+    points = _points(points)
+    return points.min(axis=0), points.max(axis=0)
+
+
+#An oriented box as (center, axes, half size), where the
+#rows of axes are the box's directions. It tries the
+#world axes, the principal axes of the hull's points and
+#the principal axes of each pair of them turned through
+#a few angles, and keeps whichever has the least volume.
+def oriented_box(points):
+    points = _points(points)
+    if len(points) > 4:
+        hull = quickhull(points)
+        if hull.vert_count >= 4:
+            points = hull.co.astype(np.float64)
+    center = points.mean(axis=0)
+    _, vecs = np.linalg.eigh(np.cov((points - center).T) + np.eye(3) * 1e-12)
+    bases = [np.eye(3), vecs.T]
+
+    #Turn the principal axes around each other:
+    for a in range(3):
+        u, v = vecs[:, (a + 1) % 3], vecs[:, (a + 2) % 3]
+        for angle in np.linspace(0.0, np.pi / 2.0, 10)[1:-1]:
+            c, s = np.cos(angle), np.sin(angle)
+            bases += [np.array((vecs[:, a], (c * u) + (s * v), (c * v) - (s * u)))]
+
+    best = None
+    for axes in bases:
+        proj = points.dot(axes.T)
+        lo, hi = proj.min(axis=0), proj.max(axis=0)
+        volume = np.prod(np.maximum(hi - lo, 1e-9))
+        if best is None or volume < best[0]:
+            best = (volume, ((lo + hi) / 2.0).dot(axes), axes, (hi - lo) / 2.0)
+    return best[1:]
+
+
+#np.unique(axis=0) needs a newer numpy than Blender has:
+def _unique_rows(rows):
+    rows = np.ascontiguousarray(rows, np.float64) + 0.0
+    keys = rows.view(np.dtype((np.void, rows.dtype.itemsize * rows.shape[1])))
+    _, first = np.unique(keys.ravel(), return_index=True)
+    return rows[np.sort(first)]
+
+
+def _plane(a, b, c):
+    n = np.cross(b - a, c - a)
+    length = np.linalg.norm(n, axis=-1)
+    n = n / np.maximum(length, 1e-300)[..., None]
+    return n, np.einsum('...i,...i', n, a), length
+
+
+#Convex hull of the points, as triangles with their
+#normals pointing out. With max_verts the hull stops
+#growing once it has that many verts.
+def quickhull(points, max_verts=None, eps=None):
+    points = _unique_rows(_points(points))
+    empty = MeshData()
+    if len(points) < 4:
+        return empty
+    scale = np.abs(points).max()
+    if eps is None:
+        eps = max(scale, 1.0) * 1e-9
+
+    #Start from the biggest tetrahedron found quickly: the
+    #two points farthest apart along an axis, the point
+    #farthest from that line, then from that plane:
+    lo, hi = points.argmin(axis=0), points.argmax(axis=0)
+    axis = np.argmax(points[hi, range(3)] - points[lo, range(3)])
+    i0, i1 = lo[axis], hi[axis]
+    line = points[i1] - points[i0]
+    line /= max(np.linalg.norm(line), 1e-300)
+    rel = points - points[i0]
+    i2 = np.argmax(np.linalg.norm(rel - np.outer(rel.dot(line), line), axis=1))
+    n, d, length = _plane(points[i0], points[i1], points[i2])
+    if length <= eps:
+        return empty
+    side = points.dot(n) - d
+    i3 = np.argmax(np.abs(side))
+    if abs(side[i3]) <= eps:
+        return empty
+    if side[i3] > 0.0:
+        i1, i2 = i2, i1
+
+    faces = [(i0, i1, i2), (i0, i3, i1), (i1, i3, i2), (i2, i3, i0)]
+    tri = np.array(faces, np.int64)
+    normals, offsets, _ = _plane(points[tri[:, 0]], points[tri[:, 1]], points[tri[:, 2]])
+    alive = np.ones(4, bool)
+    hull_verts = 4
+    if max_verts is None:
+        max_verts = len(points)
+
+    #Every point outside the hull belongs to one face it
+    #is in front of (owner), -1 means it's inside:
+    def assign(candidates, first):
+        dist = points[candidates].dot(normals[first:].T) - offsets[first:]
+        best = np.argmax(dist, axis=1)
+        far = dist[np.arange(len(candidates)), best]
+        owner[candidates] = np.where(far > eps, best + first, -1)
+        height[candidates] = np.where(far > eps, far, 0.0)
+
+    owner = np.full(len(points), -1, np.int64)
+    height = np.zeros(len(points))
+    others = np.setdiff1d(np.arange(len(points)), (i0, i1, i2, i3))
+    assign(others, 0)
+
+    while hull_verts < max_verts:
+        eye = np.argmax(height)
+        if height[eye] <= 0.0:
+            break
+        p = points[eye]
+
+        #Every face the new point can see, and the edges
+        #around them, which get joined to the new point:
+        visible = alive & ((normals.dot(p) - offsets) > eps)
+        visible[owner[eye]] = True
+        edges = tri[visible][:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+        n = len(points)
+        forward = edges[:, 0] * n + edges[:, 1]
+        backward = edges[:, 1] * n + edges[:, 0]
+        backward.sort()
+        found = backward[np.minimum(np.searchsorted(backward, forward), len(backward) - 1)] == forward
+        horizon = edges[~found]
+
+        first = len(tri)
+        new = np.column_stack((horizon, np.full(len(horizon), eye)))
+        n_new, d_new, _ = _plane(points[new[:, 0]], points[new[:, 1]], points[new[:, 2]])
+        tri = np.concatenate((tri, new))
+        normals = np.concatenate((normals, n_new))
+        offsets = np.concatenate((offsets, d_new))
+        alive = np.concatenate((alive & ~visible, np.ones(len(new), bool)))
+        hull_verts += 1
+
+        #Points that belonged to a face that's gone now go
+        #to one of the new faces, or inside:
+        orphans = np.flatnonzero(visible[np.maximum(owner, 0)] & (owner >= 0))
+        owner[eye] = -1
+        height[eye] = 0.0
+        orphans = orphans[orphans != eye]
+        if len(orphans):
+            assign(orphans, first)
+
+    tri = tri[alive]
+    used, loops = np.unique(tri, return_inverse=True)
+    return MeshData(points[used], loops.ravel(), np.full(len(tri), 3, np.int32))
+
+
+#A k-DOP is the points squeezed between two planes along
+#each of its k/2 directions. Its corners are where three
+#of those planes meet, inside all the others:
+def kdop(points, k=26, max_verts=None):
+    points = _points(points)
+    dirs = DOP_DIRS[k]
+    proj = points.dot(dirs.T)
+    normals = np.concatenate((dirs, -dirs))
+    offsets = np.concatenate((proj.max(axis=0), -proj.min(axis=0)))
+
+    i, j, l = np.array([(a, b, c) for a in range(len(normals))
+                        for b in range(a + 1, len(normals))
+                        for c in range(b + 1, len(normals))]).T
+    mats = np.stack((normals[i], normals[j], normals[l]), axis=1)
+    ok = np.abs(np.linalg.det(mats)) > 1e-9
+    rhs = np.stack((offsets[i], offsets[j], offsets[l]), axis=1)[ok]
+    corners = np.linalg.solve(mats[ok], rhs[..., None])[..., 0]
+
+    tol = max(np.abs(points).max(), 1.0) * 1e-7
+    corners = corners[(corners.dot(normals.T) <= offsets + tol).all(axis=1)]
+    corners = _unique_rows(np.round(corners / tol) * tol)
+    return quickhull(corners, max_verts)
+
+
+#The collision mesh for one of COLLISION_SHAPES:
+def collision_mesh(points, shape, max_verts=MAX_HULL_VERTS):
+    points = _points(points)
+    if shape == 'NONE' or not len(points):
+        return None
+    if shape == 'BOX':
+        lo, hi = aabb(points)
+        return box_mesh((lo + hi) / 2.0, np.eye(3), (hi - lo) / 2.0)
+
+    if shape == 'HULL':
+        hull = quickhull(points, max_verts)
+    elif shape.startswith('DOP'):
+        hull = kdop(points, int(shape[3:]), max_verts)
+    else:
+        hull = None
+
+    #Flat or otherwise degenerate meshes don't have a hull,
+    #a box (of no thickness along one axis) still works:
+    if hull is None or not hull.face_count:
+        center, axes, half = oriented_box(points)
+        return box_mesh(center, axes, half)
+    return hull
+
+
+#Makes the collision object for obj from its mesh, with
+#the same transform, and links it to the scene:
+def add_collision(context, obj, shape, engine, hide=True, max_verts=MAX_HULL_VERTS, index=0):
+    import bpy
+
+    co = np.empty(len(obj.data.vertices) * 3, np.float32)
+    obj.data.vertices.foreach_get("co", co)
+    data = collision_mesh(co, shape, max_verts)
+    if data is None:
+        return None
+
+    name = collision_name(obj.name, engine, index)
+    mesh = bpy.data.meshes.new(name)
+    data.to_mesh(mesh)
+    col_obj = bpy.data.objects.new(name, mesh)
+    col_obj.matrix_world = obj.matrix_world.copy()
+    context.scene.objects.link(col_obj)
+    col_obj.hide = hide
+    return col_obj
+
+
+#One collision object for each of objects:
+def add_collisions(context, objects, shape, engine, hide=True, max_verts=MAX_HULL_VERTS):
+    if shape == 'NONE':
+        return []
+    return [add_collision(context, obj, shape, engine, hide, max_verts) for obj in objects]
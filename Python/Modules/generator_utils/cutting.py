@@ -0,0 +1,696 @@
+# License for this script is GNU GPL Version 3
+# The text for this license can be found here:
+# https://www.gnu.org/licenses/gpl-3.0.en.html
+
+#Cuts boxes and cylinders out of a mesh without going
+#through a BOOLEAN modifier. A cutter is a convex solid,
+#given as a MeshData whose faces wind counter-clockwise
+#around their outward normal.
+#
+#For every cutter the faces of the target near it get
+#clipped by the face planes of the cutter, one plane
+#after the other, and the pieces that end up inside the
+#cutter get removed. The walls of the hole are the parts
+#of the cutter faces inside the target: the border the
+#removed pieces leave behind, plus the cutter's own
+#edges wherever they run inside the target, chained
+#into loops. Cutters are done one after another, so a
+#cutter can go through a hole that an earlier one made
+#(like the barrel going through the ejection port).
+#
+#Apart from clipping the faces near the cutter and the
+#final edit, all of it is numpy over arrays read off a
+#scratch mesh, so it never walks the whole target in
+#python. A cutter that can't be cut cleanly (the result
+#wouldn't be manifold) is left out and logged, and
+#cut_object cuts it with a boolean instead. compare_cut
+#does both, to check the two agree.
+#
+#Everything happens in one bmesh, so cutting a target
+#is a single from_mesh/to_mesh however many cutters it
+#takes. The target has to be closed around the holes,
+#with its normals pointing out, same as for the BOOLEAN
+#modifier.
+
+import math
+import logging
+
+import numpy as np
+
+from .mesh_data import MeshData
+
+log = logging.getLogger(__name__)
+
+AXES = {'X': 0, 'Y': 1, 'Z': 2}
+
+
+#An axis aligned box from its lowest to highest corner:
+def box_cutter(lo, hi, smooth=False):
+    x0, y0, z0 = lo
+    x1, y1, z1 = hi
+    co = [(x0, y0, z0), (x1, y0, z0), (x1, y1, z0), (x0, y1, z0),
+          (x0, y0, z1), (x1, y0, z1), (x1, y1, z1), (x0, y1, z1),
+         ]
+    faces = [(0, 3, 2, 1),
+             (4, 5, 6, 7),
+             (0, 1, 5, 4),
+             (1, 2, 6, 5),
+             (2, 3, 7, 6),
+             (3, 0, 4, 7),
+            ]
+    return MeshData.from_pydata(co, faces, smooth)
+
+
+#A cylinder along axis ('X', 'Y' or 'Z') from start to
+#end. center is where the axis sits on the other two
+#axes, in X, Y, Z order (so (y, z) for 'X'). Along 'X'
+#the segments line up with a bmesh.ops.create_cone that
+#was turned 90 degrees around Y, like the barrel is.
+#The sides are smooth and the caps flat by default:
+def cylinder_cutter(axis, start, end, center, radius, segments, smooth=True):
+    a = AXES[axis.upper()]
+    rest = [i for i in range(3) if i != a]
+    at_axis = dict(zip(rest, center))
+    #u, v and the axis have to stay right handed:
+    u, v = (a + 1) % 3, (a + 2) % 3
+
+    phi = np.arange(segments) * ((2.0 * math.pi) / segments)
+    co = np.zeros((2, segments, 3))
+    co[:, :, u] = at_axis[u] + (radius * np.cos(phi))
+    co[:, :, v] = at_axis[v] + (radius * np.sin(phi))
+    co[0, :, a] = min(start, end)
+    co[1, :, a] = max(start, end)
+
+    #The low cap, the high cap, then a quad per segment:
+    i = np.arange(segments)
+    j = np.roll(i, -1)
+    sides = np.stack((i, j, j + segments, i + segments), axis=1)
+    loops = np.concatenate((i[::-1], i + segments, sides.ravel()))
+    loop_total = np.concatenate(((segments, segments), np.full(segments, 4)))
+    flags = np.concatenate(((False, False), np.full(segments, bool(smooth))))
+    return MeshData(co.reshape(-1, 3), loops, loop_total, flags)
+
+
+#A cutter made from the faces of a convex MeshData, like
+#a generated part (bevels and all) that gets cut out of
+#another one. Cutters are MeshData already, so it's
+#used as it is:
+def mesh_cutter(data):
+    return data
+
+
+#The verts and faces lists of a cutter, for from_pydata:
+def cutter_pydata(cutter):
+    return cutter.co.tolist(), list(cutter.faces())
+
+
+#Every (i, j) where a[i] == b[j], for int arrays a and b.
+#This is the sort based join the cutting uses instead of
+#comparing everything with everything:
+def _matches(a, b):
+    order = np.argsort(b, kind="mergesort")
+    sorted_b = b[order]
+    lo = np.searchsorted(sorted_b, a, 'left')
+    found = np.searchsorted(sorted_b, a, 'right') - lo
+    i = np.repeat(np.arange(len(a)), found)
+    j = order[np.arange(found.sum()) - np.repeat(np.cumsum(found) - found, found) + np.repeat(lo, found)]
+    return i, j
+
+
+#Merges points closer than dist, along with any chain of
+#points that are each closer than dist to the next one.
+#Returns the points that are left and which of them each
+#point became.
+#
+#Points go in a grid of dist sized cells, so only points
+#in the same or a neighbouring cell get compared:
+def _weld(co, dist):
+    #The same corners come up in a few faces, those only
+    #need comparing once:
+    rows = np.ascontiguousarray(co).view(np.dtype((np.void, co.dtype.itemsize * 3))).ravel()
+    rows, first, index = np.unique(rows, return_index=True, return_inverse=True)
+    unique = co[first]
+    count = len(unique)
+
+    #Every cell gets a single int key. The cells on each
+    #axis are numbered in order, counting the neighbours
+    #too, so the keys stay small however far out the
+    #points are:
+    cell = np.floor(unique / dist).astype(np.int64)
+    steps = np.array((-1, 0, 1))
+    axes = [np.unique(cell[:, k][:, None] + steps) for k in range(3)]
+    size = max(len(values) for values in axes)
+
+    def key(c):
+        x, y, z = [np.searchsorted(axes[k], c[:, k]) for k in range(3)]
+        return (((x * size) + y) * size) + z
+
+    own = key(cell)
+
+    #Every pair of points in neighbouring cells that are
+    #closer than dist:
+    pair_a = []
+    pair_b = []
+    for offset in np.stack(np.meshgrid(steps, steps, steps), axis=-1).reshape(-1, 3):
+        a, b = _matches(key(cell + offset), own)
+        d = unique[a] - unique[b]
+        close = (a < b) & (np.einsum('ij,ij->i', d, d) < dist * dist)
+        pair_a.append(a[close])
+        pair_b.append(b[close])
+    pair_a = np.concatenate(pair_a)
+    pair_b = np.concatenate(pair_b)
+
+    #Every point takes the lowest label of the points near
+    #it, until the labels stop changing:
+    label = np.arange(count)
+    while True:
+        lower = label.copy()
+        np.minimum.at(lower, pair_a, label[pair_b])
+        np.minimum.at(lower, pair_b, label[pair_a])
+        if np.all(lower == label):
+            break
+        label = lower
+    keep, label = np.unique(label, return_inverse=True)
+    return unique[keep], label[index]
+
+
+#The unit normal of a planar polygon from its area
+#vector, or None if it has no area:
+def _normal(poly):
+    n = np.cross(poly, np.roll(poly, -1, axis=0)).sum(axis=0)
+    length = np.sqrt(n.dot(n))
+    if length < 1e-12:
+        return None
+    return n / length
+
+
+#The cutter as arrays: its welded corners, the corner of
+#every loop and how many loops each face has, and the
+#plane of every face as a unit normal n and an offset d,
+#so that n.co - d is how far co is outside of that face:
+def _cutter_arrays(cutter, dist):
+    co, index = _weld(cutter.co.astype(np.float64), dist)
+    loops = index[cutter.loops]
+    loop_face = cutter.loop_face
+    start = cutter.loop_start
+    prev = np.arange(len(loops)) - 1
+    prev[start] = start + cutter.loop_total - 1
+
+    #Welding leaves corners twice in a row where a face
+    #got squashed (like a clamped bevel), and faces with
+    #no area left don't make a plane:
+    keep = loops != loops[prev]
+    loops = loops[keep]
+    loop_face = loop_face[keep]
+    total = np.bincount(loop_face, minlength=len(cutter.loop_total))
+    start = np.cumsum(total) - total
+    nxt = np.arange(len(loops)) + 1
+    nxt[(start + total - 1)[total > 0]] = start[total > 0]
+    area = np.cross(co[loops], co[loops[nxt]])
+    n = np.stack([np.bincount(loop_face, area[:, k], len(total)) for k in range(3)], axis=1)
+    length = np.sqrt(np.einsum('ij,ij->i', n, n))
+    good = (total >= 3) & (length >= 1e-12)
+
+    keep = good[loop_face]
+    loops = loops[keep]
+    normals = n[good] / length[good][:, None]
+    total = total[good]
+    loop_face = np.repeat(np.arange(len(total)), total)
+    offsets = np.bincount(loop_face, np.einsum('ij,ij->i', co[loops], normals[loop_face]), len(total)) / total
+    return co, loops, total, normals, offsets, cutter.smooth[good].tolist()
+
+
+def _get(seq, attr, dtype, width=1):
+    out = np.empty(len(seq) * width, dtype)
+    seq.foreach_get(attr, out)
+    if width > 1:
+        return out.reshape(-1, width)
+    return out
+
+
+class _MeshArrays(object):
+    """The verts, edges and faces of a bmesh as arrays"""
+
+    #BMesh has no foreach_get, so it gets copied to a
+    #scratch mesh first. to_mesh() keeps the element
+    #order, so indices still match bm.verts/edges/faces:
+    def __init__(self, bm):
+        import bpy
+
+        scratch = bpy.data.meshes.new("cut_scratch")
+        try:
+            bm.to_mesh(scratch)
+            self.co = _get(scratch.vertices, "co", np.float32, 3).astype(np.float64)
+            self.edges = _get(scratch.edges, "vertices", np.int32, 2)
+            self.loops = _get(scratch.loops, "vertex_index", np.int32)
+            self.loop_edge = _get(scratch.loops, "edge_index", np.int32)
+            self.loop_start = _get(scratch.polygons, "loop_start", np.int32)
+            self.loop_total = _get(scratch.polygons, "loop_total", np.int32)
+        finally:
+            bpy.data.meshes.remove(scratch)
+
+        #Which face every loop is in, and the loop after it
+        #going around that face:
+        self.loop_face = np.repeat(np.arange(len(self.loop_total)), self.loop_total)
+        self.loop_next = np.arange(len(self.loops)) + 1
+        self.loop_next[self.loop_start + self.loop_total - 1] = self.loop_start
+
+    #Every face fanned out into triangles, as corner coords:
+    def triangles(self):
+        first = np.repeat(self.loop_start, self.loop_total)
+        i = np.arange(len(self.loops))
+        i = i[(i != first) & (self.loop_next != first)]
+        tri = np.stack((self.loops[first[i]], self.loops[i], self.loops[self.loop_next[i]]), axis=1)
+        return self.co[tri]
+
+
+#How many times the surface made of the triangles winds
+#around each point. Around 1 inside a closed mesh, 0
+#outside, and it still gives a sensible answer for a
+#mesh with a few holes in it. Summed over the triangles'
+#solid angles a few points at a time, to keep the
+#arrays small (about size points x triangles at once):
+def _winding(points, tri, size=1 << 16):
+    out = np.zeros(len(points))
+    chunk = max(1, size // max(len(tri), 1))
+    for i in range(0, len(points), chunk):
+        r = tri[None, :, :, :] - points[i:i + chunk, None, None, :]
+        l = np.sqrt(np.einsum('ptck,ptck->ptc', r, r))
+        a, b, c = r[:, :, 0], r[:, :, 1], r[:, :, 2]
+        la, lb, lc = l[:, :, 0], l[:, :, 1], l[:, :, 2]
+        det = np.einsum('ptk,ptk->pt', a, np.cross(b, c))
+        div = (la * lb * lc) + (np.einsum('ptk,ptk->pt', a, b) * lc) + \
+              (np.einsum('ptk,ptk->pt', b, c) * la) + (np.einsum('ptk,ptk->pt', c, a) * lb)
+        out[i:i + chunk] = np.arctan2(det, div).sum(axis=1) / (2.0 * math.pi)
+    return out
+
+
+#For every face, whether reduce (np.minimum or np.maximum)
+#over its corners' distances outside of a plane is below
+#limit, for every plane. Done a few planes at a time, so
+#a cutter with lots of faces doesn't need a distance for
+#every corner and plane at once:
+def _every_plane(corners, loop_start, normals, offsets, reduce, limit, size=1 << 20):
+    out = np.ones(len(loop_start), bool)
+    step = max(1, size // max(len(corners), 1))
+    for k in range(0, len(normals), step):
+        side = corners.dot(normals[k:k + step].T) - offsets[k:k + step]
+        out &= np.all(reduce.reduceat(side, loop_start, axis=0) < limit, axis=1)
+    return out
+
+
+#How many corners each face has, and all of their coords
+#one face after the other:
+def _face_corners(faces):
+    total = np.fromiter((len(f.verts) for f in faces), np.int32, len(faces))
+    co = np.array([v.co[:] for f in faces for v in f.verts], np.float64).reshape(-1, 3)
+    return total, co
+
+
+#Cuts one cutter out of bm. Returns None when it worked,
+#otherwise why it didn't (with bm only bisected, the
+#shape unchanged), so the caller can fall back to a
+#boolean:
+def _cut(bm, cutter, dist):
+    import bmesh
+
+    c_co, c_loops, c_total, normals, offsets, smooth = _cutter_arrays(cutter, dist)
+    if not len(c_total):
+        return None
+
+    #Only the faces that have a corner inside of every
+    #plane can reach into the cutter:
+    m = _MeshArrays(bm)
+    if not len(m.loop_total):
+        return None
+    near = _every_plane(m.co[m.loops], m.loop_start, normals, offsets, np.minimum, -dist)
+    bm.faces.ensure_lookup_table()
+    region = [bm.faces[i] for i in np.flatnonzero(near)]
+    total = m.loop_total[near]
+    co = m.co[m.loops[np.repeat(near, m.loop_total)]]
+
+    #Clip them by one plane after the other. Whatever is
+    #outside of a plane can't be in the cutter, so the
+    #planes after it leave that part alone:
+    for n, d in zip(normals, offsets):
+        if not region:
+            return None
+        s = co.dot(n) - d
+        if np.any(s > dist):
+            edges = set(e for f in region for e in f.edges)
+            verts = set(v for e in edges for v in e.verts)
+            ret = bmesh.ops.bisect_plane(bm, geom=region + list(edges) + list(verts), dist=dist,
+                                         plane_co=tuple(n * d), plane_no=tuple(n))
+            region = [f for f in ret["geom"] if isinstance(f, bmesh.types.BMFace)]
+            total, co = _face_corners(region)
+            s = co.dot(n) - d
+        start = np.zeros(len(total), np.int64)
+        np.cumsum(total[:-1], out=start[1:])
+        inside = np.logical_or.reduceat(s < -dist, start)
+        region = [f for f, keep in zip(region, inside) if keep]
+        co = co[np.repeat(inside, total)]
+        total = total[inside]
+    if not region:
+        return None
+
+    #From here on it's the whole mesh as arrays again, now
+    #that it's been cut up. The pieces inside the cutter
+    #get removed, along with any lying on it, since the
+    #walls put those back where they're needed:
+    m = _MeshArrays(bm)
+    remove = _every_plane(m.co[m.loops], m.loop_start, normals, offsets, np.maximum, dist)
+
+    #The border of the hole is the edges between removed
+    #and remaining faces. The walls go along it the other
+    #way around from the faces that are left:
+    removed = remove[m.loop_face]
+    linked = np.bincount(m.loop_edge, minlength=len(m.edges))
+    gone = np.bincount(m.loop_edge[removed], minlength=len(m.edges))
+    border = (gone > 0) & (gone < linked)
+    at = np.flatnonzero(~removed & border[m.loop_edge])
+    b_a = m.loops[m.loop_next[at]]
+    b_b = m.loops[at]
+
+    #The cutter's edges, each from its lower corner to its
+    #higher one, the two faces on each of them, and which
+    #way every face goes along them:
+    f_face = np.repeat(np.arange(len(c_total)), c_total)
+    c_start = np.cumsum(c_total) - c_total
+    c_next = np.arange(len(c_loops)) + 1
+    c_next[c_start + c_total - 1] = c_start
+    ci = c_loops.astype(np.int64)
+    cj = c_loops[c_next].astype(np.int64)
+    c_keys = (np.minimum(ci, cj) * len(c_co)) + np.maximum(ci, cj)
+    c_keys, f_edge = np.unique(c_keys, return_inverse=True)
+    c_edges = np.stack((c_keys // len(c_co), c_keys % len(c_co)), axis=1)
+    f_flip = ci < cj
+    if np.any(np.bincount(f_edge) != 2):
+        return "the cutter isn't closed"
+    e_faces = f_face[np.argsort(f_edge, kind="mergesort")].reshape(-1, 2)
+
+    #Which cutter faces every border vert is on. Bisecting
+    #counts anything within dist of a plane as on it, so a
+    #vert on two faces is on the edge between them (even
+    #when they meet at such a shallow angle that it's a
+    #bit further than dist from that edge), and a vert on
+    #every face around a corner is that corner:
+    vert_count = len(m.co)
+    b_verts = np.unique(np.concatenate((b_a, b_b)))
+    on = np.abs(m.co[b_verts].dot(normals.T) - offsets) < dist
+
+    #Each border edge is on a cutter face that both of its
+    #ends are on, the closest one if there's a choice:
+    ends = on[np.searchsorted(b_verts, b_a)] & on[np.searchsorted(b_verts, b_b)]
+    mid = (m.co[b_a] + m.co[b_b]) / 2.0
+    off = np.where(ends, np.abs(mid.dot(normals.T) - offsets), np.inf)
+    b_face = off.argmin(axis=1)
+    if np.any(np.isinf(off[np.arange(len(b_a)), b_face])):
+        return "the border of the hole is off the cutter"
+
+    #Ids up to the target's vert count are its verts, the
+    #ones after are the cutter's corners. A corner that's
+    #on the border already (a border vert on every face
+    #around that corner) is that border vert:
+    on_b, on_f = np.nonzero(on)
+    i, j = _matches(on_f, f_face)
+    pair = np.unique((on_b[i] * np.int64(len(c_co))) + c_loops[j], return_counts=True)
+    hit_b, hit_c = np.divmod(pair[0], len(c_co))
+    hit = pair[1] == np.bincount(c_loops, minlength=len(c_co))[hit_c]
+    hit_b = hit_b[hit]
+    hit_c = hit_c[hit]
+    c_id = vert_count + np.arange(len(c_co))
+    first_c, at = np.unique(hit_c, return_index=True)
+    c_id[first_c] = b_verts[hit_b[at]]
+    is_corner = np.zeros(len(b_verts), bool)
+    is_corner[hit_b] = True
+    all_co = np.concatenate((m.co, c_co))
+
+    #Split the cutter's edges at the border verts on them.
+    #The pieces inside the target are wall edges:
+    i, e_i = _matches(on_f, e_faces[:, 0])
+    b_i = on_b[i]
+    keep = on[b_i, e_faces[e_i, 1]] & ~is_corner[b_i]
+    e_i = e_i[keep]
+    b_i = b_i[keep]
+    p = c_co[c_edges[e_i, 0]]
+    pq = c_co[c_edges[e_i, 1]] - p
+    t = np.einsum('ik,ik->i', m.co[b_verts[b_i]] - p, pq) / np.einsum('ik,ik->i', pq, pq)
+    keep = (t > 0.0) & (t < 1.0)
+    e_i = e_i[keep]
+    b_i = b_i[keep]
+    t = t[keep]
+
+    count = len(c_edges)
+    p_edge = np.concatenate((np.arange(count), np.arange(count), e_i))
+    p_t = np.concatenate((np.zeros(count), np.ones(count), t))
+    p_id = np.concatenate((c_id[c_edges[:, 0]], c_id[c_edges[:, 1]], b_verts[b_i]))
+    order = np.lexsort((p_t, p_edge))
+    p_edge = p_edge[order]
+    p_id = p_id[order]
+    same = p_edge[1:] == p_edge[:-1]
+    s_edge = p_edge[:-1][same]
+    s_a = p_id[:-1][same]
+    s_b = p_id[1:][same]
+    keep = s_a != s_b
+    s_edge = s_edge[keep]
+    s_a = s_a[keep]
+    s_b = s_b[keep]
+
+    #A piece that ends at a new corner is on the same side
+    #of the target as that corner, and so are the corners
+    #joined to it by whole edges. So only one corner of each
+    #group, and the pieces between two border verts, need
+    #testing against the target:
+    corner = np.where(s_a >= vert_count, s_a, s_b) - vert_count
+    has_corner = corner >= 0
+    whole = (s_a >= vert_count) & (s_b >= vert_count)
+    ja = s_a[whole] - vert_count
+    jb = s_b[whole] - vert_count
+    group = np.arange(len(c_co))
+    while True:
+        lower = group.copy()
+        np.minimum.at(lower, ja, group[jb])
+        np.minimum.at(lower, jb, group[ja])
+        if np.all(lower == group):
+            break
+        group = lower
+    tested = np.unique(group[corner[has_corner]])
+    between = np.flatnonzero(~has_corner)
+    points = np.concatenate((c_co[tested], (all_co[s_a[between]] + all_co[s_b[between]]) / 2.0))
+    inside = _winding(points, m.triangles()) > 0.5
+    keep = np.zeros(len(s_a), bool)
+    keep[between] = inside[len(tested):]
+    keep[has_corner] = inside[np.searchsorted(tested, group[corner[has_corner]])]
+    s_edge = s_edge[keep]
+    s_a = s_a[keep]
+    s_b = s_b[keep]
+
+    #Both faces on a cutter edge get its pieces. The walls
+    #face into the hole, so they go around the other way
+    #from the cutter's faces:
+    first = np.searchsorted(s_edge, f_edge, 'left')
+    n_pieces = np.searchsorted(s_edge, f_edge, 'right') - first
+    rep = np.repeat(np.arange(len(f_edge)), n_pieces)
+    piece = np.arange(n_pieces.sum()) - np.repeat(np.cumsum(n_pieces) - n_pieces, n_pieces) + np.repeat(first, n_pieces)
+    flip = f_flip[rep]
+    w_face = np.concatenate((b_face, f_face[rep]))
+    w_a = np.concatenate((b_a, np.where(flip, s_b[piece], s_a[piece])))
+    w_b = np.concatenate((b_b, np.where(flip, s_a[piece], s_b[piece])))
+
+    #Every edge has to end up with exactly two faces, one
+    #going each way along it: the faces that are left and
+    #the walls, or two walls:
+    id_count = np.int64(len(all_co))
+    kept = ~removed
+    u = np.concatenate((m.loops[kept], w_a)).astype(np.int64)
+    v = np.concatenate((m.loops[m.loop_next][kept], w_b)).astype(np.int64)
+    undirected = (np.minimum(u, v) * id_count) + np.maximum(u, v)
+    w_keys = undirected[kept.sum():]
+    touched = np.in1d(undirected, w_keys)
+    counts = np.unique(undirected[touched], return_counts=True)[1]
+    if np.any(counts != 2) or len(np.unique((u * id_count + v)[touched])) != touched.sum():
+        return "the result wouldn't be manifold"
+
+    #Chain the wall edges of each face into loops. The
+    #walls go around against their cutter face's normal,
+    #anything else would be a wall with a hole in it:
+    start_key = (w_face * id_count) + w_a
+    end_key = (w_face * id_count) + w_b
+    order = np.argsort(start_key, kind="mergesort")
+    sorted_key = start_key[order]
+    if np.any(sorted_key[1:] == sorted_key[:-1]):
+        return "a wall touches itself"
+    nxt = order[np.minimum(np.searchsorted(sorted_key, end_key), max(len(order) - 1, 0))]
+    if np.any(start_key[nxt] != end_key):
+        return "a wall isn't closed"
+
+    polys = []
+    seen = np.zeros(len(w_a), bool)
+    for i in range(len(w_a)):
+        if seen[i]:
+            continue
+        loop = []
+        j = i
+        while not seen[j]:
+            seen[j] = True
+            loop.append(w_a[j])
+            j = nxt[j]
+        normal = _normal(all_co[loop]) if len(loop) >= 3 else None
+        if j != i or normal is None or normal.dot(normals[w_face[i]]) > 0.0:
+            return "a wall isn't a single loop"
+        polys.append((loop, smooth[w_face[i]]))
+
+    #Good to go, take the pieces out along with the edges
+    #and verts that were only theirs:
+    dead_edge = (gone > 0) & (gone == linked)
+    v_total = np.bincount(m.edges.ravel(), minlength=vert_count)
+    v_dead = np.bincount(m.edges[dead_edge].ravel(), minlength=vert_count)
+    dead_vert = (v_dead > 0) & (v_dead == v_total)
+
+    bm.verts.ensure_lookup_table()
+    bm.edges.ensure_lookup_table()
+    bm.faces.ensure_lookup_table()
+    verts = dict((i, bm.verts[i]) for i in b_verts.tolist())
+    dead = ([bm.faces[i] for i in np.flatnonzero(remove)],
+            [bm.edges[i] for i in np.flatnonzero(dead_edge)],
+            [bm.verts[i] for i in np.flatnonzero(dead_vert)])
+    for f in dead[0]:
+        bm.faces.remove(f)
+    for e in dead[1]:
+        bm.edges.remove(e)
+    for v in dead[2]:
+        bm.verts.remove(v)
+
+    #And put the walls in, with new verts for the cutter's
+    #corners inside the target:
+    for loop, s in polys:
+        for i in loop:
+            if i not in verts:
+                verts[i] = bm.verts.new(tuple(all_co[i]))
+        f = bm.faces.new([verts[i] for i in loop])
+        f.smooth = s
+    return None
+
+
+#Cuts every cutter out of bm, in order. Returns the
+#cutters that couldn't be cut cleanly (and were left
+#out), which is an empty list when everything worked:
+def cut_bmesh(bm, cutters, dist=1e-5):
+    failed = []
+    for i, cutter in enumerate(cutters):
+        why = _cut(bm, cutter, dist)
+        if why is not None:
+            log.warning("Cutter %d of %d can't be cut analytically (%s)", i + 1, len(cutters), why)
+            failed.append(cutter)
+    bm.normal_update()
+    return failed
+
+
+#Same for a bpy.types.Mesh:
+def cut_mesh(mesh, cutters, dist=1e-5):
+    import bmesh
+
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    failed = cut_bmesh(bm, cutters, dist)
+    bm.to_mesh(mesh)
+    bm.free()
+    mesh.update()
+    return failed
+
+
+#Cuts the cutters out of an object's mesh. Any cutter
+#that doesn't work out analytically still gets cut by
+#a BOOLEAN modifier, which is evaluated with to_mesh()
+#instead of modifier_apply, so nothing needs selecting.
+#Returns the cutters that needed the boolean:
+def cut_object(obj, cutters, scene, dist=1e-5):
+    failed = cut_mesh(obj.data, cutters, dist)
+    boolean_fallback(obj, failed, scene)
+    return failed
+
+
+#Cuts the cutters that cut_bmesh gave back out of obj
+#with booleans, and logs that it had to:
+def boolean_fallback(obj, failed, scene):
+    if not failed:
+        return
+    log.warning("Cutting %d cutter(s) out of %s with a BOOLEAN modifier instead", len(failed), obj.name)
+    for cutter in failed:
+        boolean_cut(obj, cutter, scene)
+
+
+def boolean_cut(obj, cutter, scene):
+    import bpy
+
+    verts, faces = cutter_pydata(cutter)
+    c_mesh = bpy.data.meshes.new("cutter")
+    c_mesh.from_pydata(verts, [], faces)
+    c_mesh.update()
+    c_obj = bpy.data.objects.new("Cutter", c_mesh)
+    c_obj.matrix_world = obj.matrix_world
+    scene.objects.link(c_obj)
+
+    cut = obj.modifiers.new("cut_hole", type='BOOLEAN')
+    cut.operation = 'DIFFERENCE'
+    cut.object = c_obj
+    old = obj.data
+    obj.data = obj.to_mesh(scene, True, 'PREVIEW')
+    obj.data.name = old.name
+    obj.modifiers.remove(cut)
+    if not old.users:
+        bpy.data.meshes.remove(old)
+
+    scene.objects.unlink(c_obj)
+    bpy.data.objects.remove(c_obj)
+    bpy.data.meshes.remove(c_mesh)
+
+
+#Cuts the cutters out of copies of obj's mesh both ways,
+#analytically and with booleans, one after the other.
+#Returns a dict for every cutter with the volume each
+#way took out, the vert counts after it, and whether the
+#analytic cut fell back. The volumes are signed, so a
+#target that's open somewhere away from the holes still
+#gives the right difference:
+def compare_cut(obj, cutters, scene, dist=1e-5):
+    import bpy
+    import bmesh
+
+    bm = bmesh.new()
+    bm.from_mesh(obj.data)
+    copy = bpy.data.objects.new("Compare_Obj", obj.data.copy())
+    copy.matrix_world = obj.matrix_world
+    scene.objects.link(copy)
+
+    results = []
+    a_volume = b_volume = bm.calc_volume(signed=True)
+    for cutter in cutters:
+        failed = cut_bmesh(bm, [cutter], dist)
+        boolean_cut(copy, cutter, scene)
+        b_bm = bmesh.new()
+        b_bm.from_mesh(copy.data)
+
+        a_after = bm.calc_volume(signed=True)
+        b_after = b_bm.calc_volume(signed=True)
+        results.append({"analytic": a_volume - a_after,
+                        "boolean": b_volume - b_after,
+                        "analytic_verts": len(bm.verts),
+                        "boolean_verts": len(b_bm.verts),
+                        "fallback": bool(failed),
+                        })
+        b_bm.free()
+        #The next cutter starts from the boolean result on
+        #both sides, so a fallback doesn't throw off the
+        #cutters after it:
+        bm.free()
+        bm = bmesh.new()
+        bm.from_mesh(copy.data)
+        a_volume = b_volume = b_after
+    bm.free()
+
+    mesh = copy.data
+    scene.objects.unlink(copy)
+    bpy.data.objects.remove(copy)
+    bpy.data.meshes.remove(mesh)
+    return results
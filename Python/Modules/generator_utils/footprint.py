@@ -0,0 +1,353 @@
+# License for this script is GNU GPL Version 3
+# The text for this license can be found here:
+# https://www.gnu.org/licenses/gpl-3.0.en.html
+
+#Unions (and differences) of 2D footprints, and the
+#meshes that get extruded from them.
+#
+#Instead of cutting 3D parts into each other, every edge
+#of every footprint is split where it meets the others,
+#and each piece is kept only if the region is on one
+#side of it and not on the other. The pieces that are
+#left get chained into loops: outlines go counter-
+#clockwise and holes clockwise (seen from above), so the
+#region is always on the left. Edges that two footprints
+#share, or that end up inside the region, are gone, so
+#nothing extruded from the loops has internal faces.
+#
+#The footprints going in have to be convex and counter-
+#clockwise, like the ones from overlap.rect_polygon or
+#the beveled structure footprints. What comes out can be
+#any shape, with holes.
+
+import math
+
+import numpy as np
+
+from .mesh_data import MeshData
+from .overlap import BoxIndex, polygon_area
+
+#Points closer than this are the same point:
+TOLERANCE = 1e-6
+
+
+def _cross(a, b):
+    return (a[..., 0] * b[..., 1]) - (a[..., 1] * b[..., 0])
+
+
+#Which points are inside any of the convex polygons:
+def _inside_any(points, polygons):
+    inside = np.zeros(len(points), bool)
+    for poly in polygons:
+        edge = np.roll(poly, -1, axis=0) - poly
+        cross = _cross(edge[None, :, :], points[:, None, :] - poly[None, :, :])
+        inside |= np.all(cross > 0.0, axis=1)
+    return inside
+
+
+#Which points are inside a polygon of any shape (even-odd
+#rule, so holes given as their own polygon don't count):
+def point_in_polygon(points, poly):
+    points = np.asarray(points, np.float64).reshape(-1, 2)
+    a = np.asarray(poly, np.float64)
+    b = np.roll(a, -1, axis=0)
+    x, y = points[:, 0, None], points[:, 1, None]
+    spans = (a[None, :, 1] > y) != (b[None, :, 1] > y)
+    dy = np.where(spans, b[:, 1] - a[:, 1], 1.0)
+    at = a[:, 0] + (((y - a[:, 1]) * (b[:, 0] - a[:, 0])) / dy)
+    return (np.count_nonzero(spans & (x < at), axis=1) % 2) == 1
+
+
+#Splits every edge of the polygons where it crosses or
+#touches the edges of the others. Returns the points of
+#the pieces and every piece as a pair of point indices:
+def _split_edges(polygons, tol):
+    a = np.concatenate(polygons)
+    b = np.concatenate([np.roll(p, -1, axis=0) for p in polygons])
+    cuts = [[0.0, 1.0] for k in range(len(a))]
+
+    #Only edges with overlapping boxes can meet:
+    i, j = BoxIndex(np.minimum(a, b) - tol, np.maximum(a, b) + tol).pairs()
+    r = b - a
+    length2 = np.maximum(np.einsum('ij,ij->i', r, r), tol * tol)
+
+    #Where two edges cross each other:
+    denom = _cross(r[i], r[j])
+    crossing = np.abs(denom) > tol * np.sqrt(length2[i] * length2[j])
+    denom = np.where(crossing, denom, 1.0)
+    t = _cross(a[j] - a[i], r[j]) / denom
+    u = _cross(a[j] - a[i], r[i]) / denom
+    crossing &= (t > 0.0) & (t < 1.0) & (u > 0.0) & (u < 1.0)
+    for e, s in zip(np.concatenate((i[crossing], j[crossing])).tolist(),
+                    np.concatenate((t[crossing], u[crossing])).tolist()):
+        cuts[e].append(s)
+
+    #Where an end of one edge lies on the other, which
+    #is also how edges that run along each other meet:
+    for e, f in ((i, j), (j, i)):
+        for p in (a[f], b[f]):
+            s = np.einsum('ij,ij->i', p - a[e], r[e]) / length2[e]
+            dist = np.abs(_cross(r[e], p - a[e])) / np.sqrt(length2[e])
+            on = (dist < tol) & (s > 0.0) & (s < 1.0)
+            for k, v in zip(e[on].tolist(), s[on].tolist()):
+                cuts[k].append(v)
+
+    #Snap the ends of the pieces together, so the pieces
+    #of edges that meet share their points:
+    points = []
+    keys = {}
+    pieces = []
+    for k in range(len(a)):
+        ts = np.unique(np.array(cuts[k]))
+        ends = []
+        for p in (a[k] + (r[k] * ts[:, None])).tolist():
+            key = (int(round(p[0] / tol)), int(round(p[1] / tol)))
+            if key not in keys:
+                keys[key] = len(points)
+                points.append(p)
+            ends.append(keys[key])
+        pieces.extend((p, q) for p, q in zip(ends[:-1], ends[1:]) if p != q)
+    return np.array(points, np.float64).reshape(-1, 2), pieces
+
+
+#Chains directed edges into loops. Where more than one
+#edge leaves a point (two parts that only touch at a
+#corner), the sharpest left turn is taken, which keeps
+#the parts apart:
+def _chain(points, edges):
+    leaving = {}
+    for e, (p, q) in enumerate(edges):
+        leaving.setdefault(p, []).append(e)
+
+    used = [False] * len(edges)
+    loops = []
+    for first in range(len(edges)):
+        if used[first]:
+            continue
+        loop = []
+        e = first
+        while not used[e]:
+            used[e] = True
+            p, q = edges[e]
+            loop.append(p)
+            d_in = points[q] - points[p]
+            best, turn = None, None
+            for n in leaving.get(q, ()):
+                if used[n] and n != first:
+                    continue
+                d = points[edges[n][1]] - points[q]
+                angle = math.atan2(_cross(d_in, d), np.dot(d_in, d))
+                if turn is None or angle > turn:
+                    best, turn = n, angle
+            if best is None:
+                break
+            e = best
+        if len(loop) >= 3:
+            loops.append(_drop_straight(points[loop]))
+    return [l for l in loops if len(l) >= 3]
+
+
+#Drops points that sit on a straight line between their
+#neighbours, like where a shared edge got split:
+def _drop_straight(loop):
+    while len(loop) > 3:
+        before = loop - np.roll(loop, 1, axis=0)
+        after = np.roll(loop, -1, axis=0) - loop
+        scale = np.linalg.norm(before, axis=1) * np.linalg.norm(after, axis=1)
+        straight = (np.abs(_cross(before, after)) <= 1e-9 * scale) & (np.einsum('ij,ij->i', before, after) > 0.0)
+        if not straight.any():
+            break
+        loop = loop[~straight]
+    return loop
+
+
+#The loops around everything that is inside any of add
+#but not inside any of sub. Whatever is inside any of
+#keep is in the region too, sub or not. All of them are
+#lists of convex, counter-clockwise (n, 2) polygons:
+def region_loops(add, sub=(), keep=(), tol=TOLERANCE):
+    add = [np.asarray(p, np.float64).reshape(-1, 2) for p in add]
+    sub = [np.asarray(p, np.float64).reshape(-1, 2) for p in sub]
+    keep = [np.asarray(p, np.float64).reshape(-1, 2) for p in keep]
+    if not add and not keep:
+        return []
+    points, pieces = _split_edges(add + sub + keep, tol)
+
+    #Edges that both sides made are the same edge:
+    pieces = sorted(set((min(p, q), max(p, q)) for p, q in pieces))
+    if not pieces:
+        return []
+    ends = np.array(pieces)
+    p, q = points[ends[:, 0]], points[ends[:, 1]]
+    d = q - p
+    left = np.stack((-d[:, 1], d[:, 0]), axis=1) / np.linalg.norm(d, axis=1)[:, None]
+    mid = (p + q) / 2.0
+    off = left * (10.0 * tol)
+
+    def inside(pt):
+        return (_inside_any(pt, add) & ~_inside_any(pt, sub)) | _inside_any(pt, keep)
+
+    on_left = inside(mid + off)
+    on_right = inside(mid - off)
+
+    #The region has to be on the left of every edge:
+    edges = [tuple(e) for e in ends[on_left & ~on_right].tolist()]
+    edges += [(e[1], e[0]) for e in ends[on_right & ~on_left].tolist()]
+    return _chain(points, edges)
+
+
+def polygon_union(polygons, tol=TOLERANCE):
+    return region_loops(polygons, tol=tol)
+
+
+#Groups loops into (outline, holes) pairs. A hole goes
+#with the smallest outline that it is inside of:
+def nest_loops(loops):
+    outlines = [l for l in loops if polygon_area(l) > 0.0]
+    holes = [l for l in loops if polygon_area(l) <= 0.0]
+    areas = [polygon_area(l) for l in outlines]
+    nested = [(l, []) for l in outlines]
+    for hole in holes:
+        #A point just inside the region, next to the hole:
+        d = hole[1] - hole[0]
+        probe = ((hole[0] + hole[1]) / 2.0) + (np.array((-d[1], d[0])) * (10.0 * TOLERANCE / np.linalg.norm(d)))
+        owners = [k for k, l in enumerate(outlines) if point_in_polygon(probe, l)[0]]
+        if owners:
+            nested[min(owners, key=lambda k: areas[k])][1].append(hole)
+    return nested
+
+
+#Whether p is inside the corner of a counter-clockwise
+#ring at v, between the edges from prev and to nxt:
+def _in_corner(prev, v, nxt, p):
+    a = _cross(v - prev, p - v) > 0.0
+    b = _cross(nxt - v, p - v) > 0.0
+    if _cross(v - prev, nxt - v) >= 0.0:
+        return a and b
+    return a or b
+
+
+def _crosses_any(p, q, a, b):
+    r = q - p
+    s = b - a
+    denom = _cross(r, s)
+    ok = np.abs(denom) > 1e-12
+    denom = np.where(ok, denom, 1.0)
+    t = _cross(a - p, s) / denom
+    u = _cross(a - p, r) / denom
+    eps = 1e-9
+    return bool(np.any(ok & (t > eps) & (t < 1.0 - eps) & (u > eps) & (u < 1.0 - eps)))
+
+
+#Joins the holes into the outline with a bridge edge
+#each (there and back), so the whole thing is one ring
+#of indices into points, which is outline then holes:
+def _bridge(outline, holes):
+    points = np.concatenate([outline] + holes)
+    ring = list(range(len(outline)))
+    starts = np.cumsum([len(outline)] + [len(h) for h in holes])[:-1]
+    a = points
+    b = np.concatenate([np.roll(l, -1, axis=0) for l in [outline] + holes])
+
+    #The rightmost holes go first, so bridges don't cross:
+    order = sorted(range(len(holes)), key=lambda k: -holes[k][:, 0].max())
+    for k in order:
+        hole = holes[k]
+        m = int(np.argmax(hole[:, 0]))
+        cycle = [starts[k] + ((m + n) % len(hole)) for n in range(len(hole))]
+        pm = points[cycle[0]]
+
+        #The closest point of the ring that can be reached
+        #from the hole without crossing anything:
+        dist = np.linalg.norm(points[ring] - pm, axis=1)
+        spot = None
+        for at in np.argsort(dist, kind="mergesort").tolist():
+            pv = points[ring[at]]
+            if not _in_corner(points[ring[at - 1]], pv, points[ring[(at + 1) % len(ring)]], pm):
+                continue
+            if not _crosses_any(pm, pv, a, b):
+                spot = at
+                break
+        if spot is None:
+            spot = int(np.argmin(dist))
+        ring = ring[:spot + 1] + cycle + [cycle[0]] + ring[spot:]
+    return points, ring
+
+
+#Triangulates an outline with holes by ear clipping.
+#Returns the points (outline, then every hole) and an
+#(n, 3) array of counter-clockwise triangles into them:
+def triangulate(outline, holes=()):
+    outline = np.asarray(outline, np.float64).reshape(-1, 2)
+    holes = [np.asarray(h, np.float64).reshape(-1, 2) for h in holes]
+    points, ring = _bridge(outline, holes)
+
+    tris = []
+    at = 0
+    misses = 0
+    while len(ring) > 3:
+        n = len(ring)
+        i0, i1, i2 = ring[(at - 1) % n], ring[at % n], ring[(at + 1) % n]
+        pa, pb, pc = points[i0], points[i1], points[i2]
+        area = _cross(pb - pa, pc - pb)
+        ear = area > 1e-12
+        if ear:
+            #No other point of the ring can be in the ear:
+            others = np.array([r for r in ring if r != i0 and r != i1 and r != i2], np.int64)
+            if len(others):
+                pt = points[others]
+                inside = ((_cross(pb - pa, pt - pa) >= 0.0) & (_cross(pc - pb, pt - pb) >= 0.0) &
+                          (_cross(pa - pc, pt - pc) >= 0.0))
+                same = np.all(np.isclose(pt[:, None, :], np.array((pa, pb, pc))[None, :, :]), axis=2).any(axis=1)
+                ear = not np.any(inside & ~same)
+        #Points on a straight line (or bridges folding back)
+        #can go without a triangle, and if nothing is left
+        #that looks like an ear, the ring gets cut anyway:
+        if ear or abs(area) <= 1e-12 or misses > n:
+            if abs(area) > 1e-12:
+                tris.append((i0, i1, i2))
+            del ring[at % n]
+            at = max(at - 1, 0)
+            misses = 0
+        else:
+            at += 1
+            misses += 1
+    if len(ring) == 3 and _cross(points[ring[1]] - points[ring[0]], points[ring[2]] - points[ring[1]]) > 1e-12:
+        tris.append(tuple(ring))
+    return points, np.array(tris, np.int64).reshape(-1, 3)
+
+
+#Walls going straight up from z0 to z1 along loops. They
+#face away from the region, out of an outline and into a
+#hole:
+def extrude_loops(loops, z0, z1):
+    verts = []
+    faces = []
+    for loop in loops:
+        n = len(loop)
+        start = len(verts)
+        verts.extend((x, y, z0) for x, y in loop.tolist())
+        verts.extend((x, y, z1) for x, y in loop.tolist())
+        for k in range(n):
+            m = (k + 1) % n
+            faces.append((start + k, start + m, start + n + m, start + n + k))
+    return MeshData.from_pydata(verts, faces)
+
+
+#Flat faces at height z covering the region of loops,
+#facing up (or down). Outlines without holes stay one
+#n-gon each, the ones with holes get triangulated:
+def cap_loops(loops, z, up=True):
+    parts = []
+    for outline, holes in nest_loops(loops):
+        if not holes:
+            verts = [(x, y, z) for x, y in outline.tolist()]
+            parts.append(MeshData.from_pydata(verts, [range(len(verts))]))
+            continue
+        points, tris = triangulate(outline, holes)
+        verts = [(x, y, z) for x, y in points.tolist()]
+        parts.append(MeshData.from_pydata(verts, tris.tolist()))
+    data = MeshData.join(parts)
+    if not up:
+        data.flip()
+    return data
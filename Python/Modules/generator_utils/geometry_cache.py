@@ -0,0 +1,143 @@
+# License for this script is GNU GPL Version 3
+# The text for this license can be found here:
+# https://www.gnu.org/licenses/gpl-3.0.en.html
+
+#Every operator here is REGISTER/UNDO, so each change
+#in the redo panel runs execute() again from scratch.
+#The cache keeps the MeshData of recent results keyed
+#by the operator's properties, so going back to values
+#that were already built skips the whole rebuild. It
+#only lives as long as Blender is open.
+
+import hashlib
+
+from collections import OrderedDict
+
+#Properties that only move the result around. They're
+#left out of the key, and get applied after a cache hit:
+PLACEMENT_PROPS = ("location", "rotation", "view_align", "layers")
+
+
+class GeometryCache(object):
+    """LRU cache of generated geometry with a byte budget"""
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    #Returns the cached value, or None on a miss. The
+    #value is shared, so don't change it in place
+    #(copy() it first if it has to be transformed).
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    #Stores a MeshData, or a list/tuple holding them.
+    #The least recently used entries get dropped until
+    #everything fits in max_bytes again:
+    def put(self, key, value):
+        size = _size(value)
+        if key in self._entries:
+            self.nbytes -= self._entries.pop(key)[1]
+        if size > self.max_bytes:
+            return False
+
+        self._entries[key] = (value, size)
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            old_key, (old_value, old_size) = self._entries.popitem(last=False)
+            self.nbytes -= old_size
+            self.evictions += 1
+        return True
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        return {"entries": len(self._entries),
+                "bytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                }
+
+
+def _size(value):
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    if isinstance(value, (list, tuple)):
+        return sum(_size(v) for v in value)
+    #Names, matrices and such, small enough to not count:
+    return 0
+
+
+#Makes a stable key out of every property of an operator
+#(apart from the placement ones), its bl_idname and the
+#version of the addon, so updating the addon never hands
+#back geometry built by the old code:
+def props_key(operator, version, exclude=PLACEMENT_PROPS):
+    values = []
+    for prop in operator.bl_rna.properties:
+        name = prop.identifier
+        if name == "rna_type" or name in exclude:
+            continue
+        value = getattr(operator, name)
+        if hasattr(value, "__len__") and not isinstance(value, str):
+            value = tuple(value)
+        values.append((name, value))
+    text = repr((operator.bl_idname, tuple(version), values))
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+#For operators that make more than one object. Stores
+#the name, world matrix and MeshData of every object:
+def snapshot_objects(objects):
+    from .mesh_data import MeshData
+
+    entries = []
+    for obj in objects:
+        matrix = tuple(tuple(row) for row in obj.matrix_world)
+        entries.append((obj.name, matrix, MeshData.from_mesh(obj.data)))
+    return entries
+
+
+#Makes the objects from snapshot_objects() again:
+def restore_objects(context, entries):
+    import bpy
+    from mathutils import Matrix
+
+    objects = []
+    for name, matrix, data in entries:
+        mesh = bpy.data.meshes.new(name)
+        data.to_mesh(mesh)
+        obj = bpy.data.objects.new(name, mesh)
+        obj.matrix_world = Matrix(matrix)
+        context.scene.objects.link(obj)
+        objects.append(obj)
+    return objects
+
+
+#Shared by all the addons, so the budget is for all of them:
+geometry_cache = GeometryCache()
@@ -0,0 +1,109 @@
+# License for this script is GNU GPL Version 3
+# The text for this license can be found here:
+# https://www.gnu.org/licenses/gpl-3.0.en.html
+
+#Levels of detail in one go. A generator that supports
+#LODs splits its execute() into a build(detail, level)
+#that makes the objects with every segment count scaled
+#by detail (1.0 for LOD0), and build_lods() calls it once
+#per level. Anything that doesn't depend on the segment
+#counts (templates, leg spots, footprints) should be
+#worked out once outside of build, or cached, so the
+#extra levels only pay for the parts that change.
+#
+#The levels are named <name>_LOD0, <name>_LOD1 and so on
+#and parented to an empty called <name>, which is what
+#both Unity and Unreal look for to make a LOD group when
+#the FBX is imported.
+
+import numpy as np
+
+#Operator properties that only control the LOD chain,
+#for leaving out of a geometry_cache key:
+LOD_PROPS = ("lod_count", "lod_ratio", "lod_budget")
+
+
+def lod_name(name, level):
+    return "%s_LOD%d" % (name, level)
+
+
+#How much detail each level keeps, 1.0 for LOD0:
+def lod_details(count, ratio):
+    return [ratio ** level for level in range(max(count, 1))]
+
+
+#A segment count scaled down for a level. Counts at
+#or below minimum are left alone, so a square table
+#top (4 segments) doesn't turn into a triangle:
+def lod_segments(value, detail, minimum=3):
+    if value <= minimum:
+        return value
+    return max(minimum, int(round(value * detail)))
+
+
+def tri_count(objects):
+    tris = 0
+    for obj in objects:
+        loop_total = np.empty(len(obj.data.polygons), np.int32)
+        obj.data.polygons.foreach_get("loop_total", loop_total)
+        tris += int((loop_total - 2).sum())
+    return tris
+
+
+def remove_objects(objects):
+    import bpy
+
+    for obj in objects:
+        mesh = obj.data
+        bpy.data.objects.remove(obj, do_unlink=True)
+        if mesh is not None and mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+
+
+#Builds every level with build(detail, level), which has
+#to return the objects it made. With a budget, LOD0 can
+#have up to budget triangles and every level after that
+#ratio times as many as the one before. A level that
+#goes over is built again with less detail, until it
+#fits or the segment counts can't go any lower.
+#
+#Returns a list of (objects, tris) for every level.
+def build_lods(build, count, ratio, budget=0, name=None, tries=4):
+    import bpy
+
+    levels = []
+    for level, detail in enumerate(lod_details(count, ratio)):
+        objects = build(detail, level)
+        tris = tri_count(objects)
+        limit = budget * (ratio ** level)
+        for i in range(tries if budget > 0 else 0):
+            if tris <= limit:
+                break
+            detail *= limit / float(tris)
+            smaller = build(detail, level)
+            smaller_tris = tri_count(smaller)
+            if smaller_tris >= tris:
+                remove_objects(smaller)
+                break
+            remove_objects(objects)
+            objects, tris = smaller, smaller_tris
+
+        #Renamed right away, so the next level gets the
+        #plain names again instead of .001, .002...
+        if count > 1:
+            for obj in objects:
+                obj.name = lod_name(obj.name, level)
+                obj.data.name = obj.name
+        levels.append((objects, tris))
+
+    #Parent all of them to one empty for the LOD group.
+    #Objects that already have a parent (like instances
+    #parented to their level's main object) keep it:
+    if count > 1 and name is not None:
+        group = bpy.data.objects.new(name, None)
+        bpy.context.scene.objects.link(group)
+        for objects, tris in levels:
+            for obj in objects:
+                if obj.parent is None:
+                    obj.parent = group
+    return levels
@@ -0,0 +1,359 @@
+# License for this script is GNU GPL Version 3
+# The text for this license can be found here:
+# https://www.gnu.org/licenses/gpl-3.0.en.html
+
+#MeshData is the plain array mesh that the generators
+#build their geometry into. Nothing in here needs bpy
+#until the data gets committed to a Blender mesh, so
+#the geometry can be timed and checked without Blender.
+
+import numpy as np
+
+
+class MeshData(object):
+    """Contiguous vertex, loop and polygon arrays for one mesh"""
+
+    def __init__(self, co=None, loops=None, loop_total=None, smooth=None, uv=None, edges=None):
+        #co is an (n, 3) float32 array of vertex coordinates,
+        #loops holds the vertex index of every face corner,
+        #and loop_total says how many corners each face has
+        if co is None:
+            co = np.zeros((0, 3), np.float32)
+        if loops is None:
+            loops = np.zeros(0, np.int32)
+        if loop_total is None:
+            loop_total = np.zeros(0, np.int32)
+
+        self.co = np.ascontiguousarray(co, np.float32).reshape(-1, 3)
+        self.loops = np.ascontiguousarray(loops, np.int32).ravel()
+        self.loop_total = np.ascontiguousarray(loop_total, np.int32).ravel()
+
+        if smooth is None:
+            smooth = np.zeros(len(self.loop_total), bool)
+        elif np.ndim(smooth) == 0:
+            smooth = np.full(len(self.loop_total), bool(smooth))
+        self.smooth = np.ascontiguousarray(smooth, bool).ravel()
+
+        #One (u, v) pair per loop, or None for no UV map:
+        if uv is not None:
+            uv = np.ascontiguousarray(uv, np.float32).reshape(-1, 2)
+        self.uv = uv
+
+        #Only loose edges need to be stored, face edges
+        #are worked out from the loops (see face_edges):
+        if edges is None:
+            edges = np.zeros((0, 2), np.int32)
+        self.edges = np.ascontiguousarray(edges, np.int32).reshape(-1, 2)
+
+        if self.loop_total.sum() != len(self.loops):
+            raise ValueError("loop_total does not add up to the number of loops")
+        if len(self.smooth) != len(self.loop_total):
+            raise ValueError("smooth needs one flag per face")
+        if self.uv is not None and len(self.uv) != len(self.loops):
+            raise ValueError("uv needs one coordinate per loop")
+
+    #Builds MeshData out of the same verts and faces
+    #lists that the generators used to feed to bmesh:
+    @classmethod
+    def from_pydata(cls, verts, faces=(), smooth=False, edges=None):
+        faces = list(faces)
+        loop_total = np.fromiter((len(f) for f in faces), np.int32, len(faces))
+        loops = np.fromiter((i for f in faces for i in f), np.int32, int(loop_total.sum()))
+        return cls(np.array(verts, np.float32).reshape(-1, 3), loops, loop_total, smooth, edges=edges)
+
+    #Reads a bpy.types.Mesh back into arrays with foreach_get:
+    @classmethod
+    def from_mesh(cls, mesh):
+        co = np.empty(len(mesh.vertices) * 3, np.float32)
+        mesh.vertices.foreach_get("co", co)
+        loops = np.empty(len(mesh.loops), np.int32)
+        mesh.loops.foreach_get("vertex_index", loops)
+        loop_total = np.empty(len(mesh.polygons), np.int32)
+        mesh.polygons.foreach_get("loop_total", loop_total)
+        smooth = np.empty(len(mesh.polygons), bool)
+        mesh.polygons.foreach_get("use_smooth", smooth)
+
+        #Blender is free to store the loops of a face
+        #anywhere, so put them back in polygon order:
+        loop_start = np.empty(len(mesh.polygons), np.int32)
+        mesh.polygons.foreach_get("loop_start", loop_start)
+        order = _loop_order(loop_start, loop_total)
+
+        uv = None
+        if mesh.uv_layers.active is not None:
+            uv = np.empty(len(mesh.loops) * 2, np.float32)
+            mesh.uv_layers.active.data.foreach_get("uv", uv)
+            uv = uv.reshape(-1, 2)[order]
+
+        edges = np.empty(len(mesh.edges) * 2, np.int32)
+        mesh.edges.foreach_get("vertices", edges)
+        loop_edge = np.empty(len(mesh.loops), np.int32)
+        mesh.loops.foreach_get("edge_index", loop_edge)
+        loose = np.ones(len(mesh.edges), bool)
+        loose[loop_edge] = False
+        edges = edges.reshape(-1, 2)[loose]
+
+        return cls(co, loops[order], loop_total, smooth, uv, edges)
+
+    #Reads a BMesh into arrays. There is no foreach_get
+    #for bmesh, so this is one pass over the elements:
+    @classmethod
+    def from_bmesh(cls, bm):
+        bm.verts.index_update()
+        co = np.array([v.co[:] for v in bm.verts], np.float32).reshape(-1, 3)
+        loop_total = np.fromiter((len(f.verts) for f in bm.faces), np.int32, len(bm.faces))
+        loops = np.fromiter((v.index for f in bm.faces for v in f.verts), np.int32, int(loop_total.sum()))
+        smooth = np.fromiter((f.smooth for f in bm.faces), bool, len(bm.faces))
+
+        uv = None
+        uv_layer = bm.loops.layers.uv.active
+        if uv_layer is not None:
+            uv = np.array([l[uv_layer].uv[:] for f in bm.faces for l in f.loops], np.float32)
+
+        edges = [(e.verts[0].index, e.verts[1].index) for e in bm.edges if not e.link_faces]
+        return cls(co, loops, loop_total, smooth, uv, edges)
+
+    @property
+    def loop_start(self):
+        start = np.zeros(len(self.loop_total), np.int32)
+        np.cumsum(self.loop_total[:-1], out=start[1:])
+        return start
+
+    @property
+    def vert_count(self):
+        return len(self.co)
+
+    @property
+    def face_count(self):
+        return len(self.loop_total)
+
+    @property
+    def loop_count(self):
+        return len(self.loops)
+
+    @property
+    def tri_count(self):
+        return int((self.loop_total - 2).sum())
+
+    #Bytes held by the arrays, used for cache budgets:
+    @property
+    def nbytes(self):
+        size = self.co.nbytes + self.loops.nbytes + self.loop_total.nbytes
+        size += self.smooth.nbytes + self.edges.nbytes
+        if self.uv is not None:
+            size += self.uv.nbytes
+        return size
+
+    #Index of the face that owns each loop:
+    @property
+    def loop_face(self):
+        return np.repeat(np.arange(len(self.loop_total), dtype=np.int32), self.loop_total)
+
+    #Yields each face as a tuple of vertex indices:
+    def faces(self):
+        start = 0
+        for total in self.loop_total:
+            yield tuple(self.loops[start:start + total].tolist())
+            start += total
+
+    def copy(self):
+        uv = None if self.uv is None else self.uv.copy()
+        return MeshData(self.co.copy(), self.loops.copy(), self.loop_total.copy(),
+                        self.smooth.copy(), uv, self.edges.copy())
+
+    #Concatenates meshes into one, offsetting the indices.
+    #The UV map is only kept when every part has one.
+    @staticmethod
+    def join(parts):
+        parts = list(parts)
+        if not parts:
+            return MeshData()
+        counts = np.array([p.vert_count for p in parts])
+        offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        co = np.concatenate([p.co for p in parts])
+        loops = np.concatenate([p.loops + o for p, o in zip(parts, offsets)])
+        loop_total = np.concatenate([p.loop_total for p in parts])
+        smooth = np.concatenate([p.smooth for p in parts])
+        edges = np.concatenate([p.edges + o for p, o in zip(parts, offsets)])
+        uv = None
+        if all(p.uv is not None for p in parts):
+            uv = np.concatenate([p.uv for p in parts])
+        return MeshData(co, loops, loop_total, smooth, uv, edges)
+
+    #Repeats the mesh once for every offset, with each copy
+    #moved by its offset, all in one go. This is what the
+    #duplicate + translate loops used to do one at a time.
+    def tile(self, offsets):
+        offsets = np.asarray(offsets, np.float32).reshape(-1, 3)
+        n = len(offsets)
+        shift = np.arange(n, dtype=np.int32) * self.vert_count
+        co = (self.co[None, :, :] + offsets[:, None, :]).reshape(-1, 3)
+        loops = (self.loops[None, :] + shift[:, None]).ravel()
+        edges = (self.edges[None, :, :] + shift[:, None, None]).reshape(-1, 2)
+        uv = None
+        if self.uv is not None:
+            uv = np.tile(self.uv, (n, 1))
+        return MeshData(co, loops, np.tile(self.loop_total, n), np.tile(self.smooth, n), uv, edges)
+
+    #Like tile(), but every copy gets its own 4x4 matrix,
+    #given as an (n, 4, 4) array. The matrices shouldn't
+    #mirror, since the faces aren't flipped here:
+    def instance(self, matrices):
+        m = np.asarray(matrices, np.float64).reshape(-1, 4, 4)
+        n = len(m)
+        shift = np.arange(n, dtype=np.int32) * self.vert_count
+        co = np.einsum('nij,vj->nvi', m[:, :3, :3], self.co.astype(np.float64)) + m[:, None, :3, 3]
+        loops = (self.loops[None, :] + shift[:, None]).ravel()
+        edges = (self.edges[None, :, :] + shift[:, None, None]).reshape(-1, 2)
+        uv = None
+        if self.uv is not None:
+            uv = np.tile(self.uv, (n, 1))
+        return MeshData(co.reshape(-1, 3), loops, np.tile(self.loop_total, n), np.tile(self.smooth, n), uv, edges)
+
+    #Applies a 4x4 (or 3x3) matrix to every vertex in place.
+    #mathutils matrices work here too since numpy reads them.
+    def transform(self, matrix):
+        m = np.array(matrix, np.float64)
+        co = self.co.astype(np.float64).dot(m[:3, :3].T)
+        if m.shape == (4, 4):
+            co += m[:3, 3]
+        self.co[:] = co
+        #A mirroring matrix turns every face inside out:
+        if np.linalg.det(m[:3, :3]) < 0.0:
+            self.flip()
+        return self
+
+    def translate(self, vec):
+        self.co += np.asarray(vec, np.float32)
+        return self
+
+    def scale(self, vec, center=(0.0, 0.0, 0.0)):
+        center = np.asarray(center, np.float32)
+        self.co[:] = ((self.co - center) * np.asarray(vec, np.float32)) + center
+        return self
+
+    #Returns the face edges in the order bm.faces.new()
+    #creates them, plus the edge used by every loop. For
+    #each face bmesh makes (v[-1], v[0]) first, then goes
+    #(v[0], v[1]), (v[1], v[2]) and so on around the face.
+    def face_edges(self):
+        if not self.loop_count:
+            return np.zeros((0, 2), np.int32), np.zeros(0, np.int32)
+        face = self.loop_face
+        start = self.loop_start[face]
+        total = self.loop_total[face]
+        local = np.arange(self.loop_count) - start
+        prev = start + ((local - 1) % total)
+        nxt = start + ((local + 1) % total)
+
+        pairs = np.stack((self.loops[prev], self.loops[np.arange(self.loop_count)]), axis=1)
+        keys = np.sort(pairs, axis=1).astype(np.int64)
+        keys = (keys[:, 0] << 32) | keys[:, 1]
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+
+        #np.unique sorts by key, put them back in creation order:
+        order = np.argsort(first)
+        rank = np.empty(len(order), np.int32)
+        rank[order] = np.arange(len(order))
+        edges = pairs[first[order]].astype(np.int32)
+
+        #A loop uses the edge going to the next loop's vert:
+        loop_edge = rank[inverse.ravel()][nxt].astype(np.int32)
+        return edges, loop_edge
+
+    #Reverses the winding of every face:
+    def flip(self):
+        #Keep the first corner, reverse the rest, which
+        #is the same thing bmesh.ops.reverse_faces does
+        face = self.loop_face
+        start = self.loop_start[face]
+        total = self.loop_total[face]
+        local = np.arange(self.loop_count) - start
+        flipped = start + ((total - local) % total)
+        self.loops = self.loops[flipped]
+        if self.uv is not None:
+            self.uv = self.uv[flipped]
+        return self
+
+    #Bulk commit into an empty bpy.types.Mesh:
+    def to_mesh(self, mesh, uv_name="UVMap"):
+        if len(mesh.vertices) or len(mesh.polygons):
+            raise ValueError("to_mesh() expects an empty mesh")
+
+        mesh.vertices.add(self.vert_count)
+        mesh.vertices.foreach_set("co", self.co.ravel())
+
+        #Edges are written in the same order bmesh would make
+        #them, so edge index groups stay valid after from_mesh:
+        edges, loop_edge = self.face_edges()
+        edges = np.concatenate((edges, self.edges))
+        mesh.edges.add(len(edges))
+        mesh.edges.foreach_set("vertices", edges.ravel())
+
+        mesh.loops.add(self.loop_count)
+        mesh.loops.foreach_set("vertex_index", self.loops)
+        mesh.loops.foreach_set("edge_index", loop_edge)
+
+        mesh.polygons.add(self.face_count)
+        mesh.polygons.foreach_set("loop_start", self.loop_start)
+        mesh.polygons.foreach_set("loop_total", self.loop_total)
+        mesh.polygons.foreach_set("use_smooth", self.smooth)
+
+        if self.uv is not None:
+            #2.79 makes UV maps through uv_textures:
+            if hasattr(mesh, "uv_textures"):
+                mesh.uv_textures.new(uv_name)
+            else:
+                mesh.uv_layers.new(name=uv_name)
+            mesh.uv_layers[-1].data.foreach_set("uv", self.uv.ravel())
+
+        mesh.update()
+        return mesh
+
+    #Loads the data into a bmesh for the generators that
+    #still need bmesh.ops afterwards. It goes through a
+    #scratch mesh so the copy is done by foreach_set too.
+    def to_bmesh(self, bm=None):
+        import bpy
+        import bmesh
+
+        if bm is None:
+            bm = bmesh.new()
+        scratch = bpy.data.meshes.new("mesh_data_scratch")
+        try:
+            self.to_mesh(scratch)
+            bm.from_mesh(scratch)
+        finally:
+            bpy.data.meshes.remove(scratch)
+        bm.verts.ensure_lookup_table()
+        bm.edges.ensure_lookup_table()
+        bm.faces.ensure_lookup_table()
+        return bm
+
+
+#Position of every loop inside its own face:
+def _loop_order(loop_start, loop_total):
+    face = np.repeat(np.arange(len(loop_total)), loop_total)
+    first = np.zeros(len(loop_total), np.int64)
+    np.cumsum(loop_total[:-1], out=first[1:])
+    return (loop_start[face] + (np.arange(int(loop_total.sum())) - first[face])).astype(np.int32)
+
+
+#Makes a new mesh from data and links it as an object.
+#When an operator is given, object_data_add is used so
+#the object gets the operator's location and rotation.
+def add_mesh_object(context, data, name, operator=None):
+    import bpy
+
+    mesh = bpy.data.meshes.new(name)
+    data.to_mesh(mesh)
+
+    if operator is not None:
+        from bpy_extras import object_utils
+        base = object_utils.object_data_add(context, mesh, operator=operator)
+        #2.79 hands back an ObjectBase, newer versions the object:
+        return getattr(base, "object", base)
+
+    obj = bpy.data.objects.new(name, mesh)
+    context.scene.objects.link(obj)
+    return obj
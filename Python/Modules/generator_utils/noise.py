@@ -0,0 +1,58 @@
+# License for this script is GNU GPL Version 3
+# The text for this license can be found here:
+# https://www.gnu.org/licenses/gpl-3.0.en.html
+
+#3D value noise over whole coordinate arrays at once.
+#The lattice is hashed through a permutation table that
+#comes from the seed, so the same seed always gives the
+#same noise, whatever else has used the random module.
+
+import numpy as np
+
+#Offsets to the 8 corners of a lattice cell:
+_CORNERS = np.array([(x, y, z) for x in (0, 1) for y in (0, 1) for z in (0, 1)], np.int64)
+
+
+#The permutation table (doubled, so hashing never has to
+#wrap) and one random value per lattice hash:
+def noise_tables(seed=0):
+    rng = np.random.RandomState(seed % (2 ** 32))
+    perm = rng.permutation(256)
+    return np.concatenate((perm, perm)), rng.uniform(-1.0, 1.0, 256)
+
+
+#Noise from -1 to 1 at every point of an (n, 3) array,
+#smoothly blended between the lattice corners:
+def value_noise(points, seed=0, tables=None):
+    perm, values = tables if tables is not None else noise_tables(seed)
+    p = np.asarray(points, np.float64).reshape(-1, 3)
+    cell = np.floor(p)
+    f = p - cell
+    u = f * f * (3.0 - (2.0 * f))
+
+    corner = (cell.astype(np.int64)[:, None, :] + _CORNERS[None, :, :]) & 255
+    h = perm[perm[perm[corner[:, :, 0]] + corner[:, :, 1]] + corner[:, :, 2]]
+    v = values[h]
+
+    #Blend the 8 corners along z, then y, then x:
+    v = v.reshape(-1, 2, 2, 2)
+    v = v[..., 0] + ((v[..., 1] - v[..., 0]) * u[:, None, None, 2])
+    v = v[..., 0] + ((v[..., 1] - v[..., 0]) * u[:, None, 1])
+    return v[:, 0] + ((v[:, 1] - v[:, 0]) * u[:, 0])
+
+
+#Octaves of value noise added together (fractal noise),
+#each one lacunarity times finer and gain times weaker.
+#The sum is scaled back to -1 to 1:
+def fractal_noise(points, octaves=4, lacunarity=2.0, gain=0.5, seed=0):
+    tables = noise_tables(seed)
+    p = np.asarray(points, np.float64).reshape(-1, 3)
+    total = np.zeros(len(p))
+    amplitude = 1.0
+    weight = 0.0
+    for octave in range(max(octaves, 1)):
+        #Shift each octave, so the lattices don't line up:
+        total += amplitude * value_noise((p * (lacunarity ** octave)) + (octave * 17.31), tables=tables)
+        weight += amplitude
+        amplitude *= gain
+    return total / weight
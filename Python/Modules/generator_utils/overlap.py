@@ -0,0 +1,207 @@
+# License for this script is GNU GPL Version 3
+# The text for this license can be found here:
+# https://www.gnu.org/licenses/gpl-3.0.en.html
+
+#Finds which footprints overlap, and where, without
+#running a boolean against every object to see if
+#anything is left over.
+#
+#The broad phase is sweep and prune: the boxes are kept
+#sorted by their lowest x, so only the run of boxes that
+#start before a box ends has to be looked at, and the
+#other axes are checked on that run with numpy. The
+#narrow phase is exact 2D geometry on the pairs that are
+#left: rectangles are intersected straight away, other
+#polygons are clipped against each other. Polygons have
+#to be convex (beveled corners are fine), and wind
+#counter-clockwise seen from above.
+
+import numpy as np
+
+
+class BoxIndex(object):
+    """Sweep and prune index over axis aligned boxes"""
+
+    def __init__(self, lo=None, hi=None, dims=2):
+        self.lo = np.zeros((0, dims))
+        self.hi = np.zeros((0, dims))
+        self._order = None
+        if lo is not None:
+            self.add(lo, hi)
+
+    def __len__(self):
+        return len(self.lo)
+
+    #Adds boxes and returns their indices. The sort is
+    #only redone on the next query, so adding one box at
+    #a time while placing things stays cheap:
+    def add(self, lo, hi):
+        lo = np.asarray(lo, np.float64).reshape(-1, self.lo.shape[1])
+        hi = np.asarray(hi, np.float64).reshape(-1, self.lo.shape[1])
+        start = len(self.lo)
+        self.lo = np.concatenate((self.lo, lo))
+        self.hi = np.concatenate((self.hi, hi))
+        self._order = None
+        return np.arange(start, len(self.lo))
+
+    def _sorted(self):
+        if self._order is None:
+            self._order = np.argsort(self.lo[:, 0], kind="mergesort")
+            self._lo_x = self.lo[self._order, 0]
+        return self._order, self._lo_x
+
+    #Every (query, box) pair that overlaps, for a whole
+    #array of query boxes at once. eps is how far two
+    #boxes have to go into each other to count, so boxes
+    #that only touch can be left out:
+    def query_many(self, lo, hi, eps=0.0):
+        lo = np.asarray(lo, np.float64).reshape(-1, self.lo.shape[1])
+        hi = np.asarray(hi, np.float64).reshape(-1, self.lo.shape[1])
+        if not len(self.lo) or not len(lo):
+            return np.zeros(0, np.int64), np.zeros(0, np.int64)
+        order, lo_x = self._sorted()
+
+        #Boxes that start before each query ends:
+        end = np.searchsorted(lo_x, hi[:, 0] - eps, side="left")
+        query = np.repeat(np.arange(len(lo)), end)
+        first = np.cumsum(end) - end
+        box = order[np.arange(len(query)) - np.repeat(first, end)]
+
+        keep = np.all((self.hi[box] - eps > lo[query]) & (self.lo[box] + eps < hi[query]), axis=1)
+        return query[keep], box[keep]
+
+    def query(self, lo, hi, eps=0.0):
+        return np.sort(self.query_many(lo, hi, eps)[1])
+
+    #Every pair of boxes in the index that overlap, as
+    #(i, j) arrays with i < j:
+    def pairs(self, eps=0.0):
+        n = len(self.lo)
+        if n < 2:
+            return np.zeros(0, np.int64), np.zeros(0, np.int64)
+        order, lo_x = self._sorted()
+
+        #In sorted order, box k can only hit the boxes
+        #after it that start before it ends:
+        rank = np.arange(n)
+        end = np.searchsorted(lo_x, self.hi[order, 0] - eps, side="left")
+        count = np.maximum(end - rank - 1, 0)
+        a = np.repeat(rank, count)
+        first = np.cumsum(count) - count
+        b = a + 1 + (np.arange(len(a)) - np.repeat(first, count))
+        i, j = order[a], order[b]
+
+        keep = np.all((self.hi[i] - eps > self.lo[j]) & (self.lo[i] + eps < self.hi[j]), axis=1)
+        i, j = i[keep], j[keep]
+        swap = i > j
+        i[swap], j[swap] = j[swap], i[swap]
+        return i, j
+
+
+#The 4 corners of a rectangle, counter-clockwise:
+def rect_polygon(lo, hi):
+    return np.array([(lo[0], lo[1]), (hi[0], lo[1]), (hi[0], hi[1]), (lo[0], hi[1])], np.float64)
+
+
+#Intersections of rectangles, for whole arrays of them.
+#Returns the lowest and highest corners, and which ones
+#actually overlap (by more than eps):
+def rect_intersection(a_lo, a_hi, b_lo, b_hi, eps=0.0):
+    lo = np.maximum(a_lo, b_lo)
+    hi = np.minimum(a_hi, b_hi)
+    return lo, hi, np.all(hi - lo > eps, axis=-1)
+
+
+def polygon_area(poly):
+    p = np.asarray(poly, np.float64)
+    if len(p) < 3:
+        return 0.0
+    x, y = p[:, 0], p[:, 1]
+    return 0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+
+#The part of subject that is inside clip (Sutherland-
+#Hodgman). clip has to be convex, subject can be any
+#simple polygon. Returns an (n, 2) array, empty if they
+#don't overlap:
+def clip_polygon(subject, clip):
+    out = np.asarray(subject, np.float64)
+    clip = np.asarray(clip, np.float64)
+    for a, b in zip(clip, np.roll(clip, -1, axis=0)):
+        if not len(out):
+            break
+        edge = b - a
+        #Which side of the edge every vert is on:
+        side = (edge[0] * (out[:, 1] - a[1])) - (edge[1] * (out[:, 0] - a[0]))
+        nxt = np.roll(out, -1, axis=0)
+        side_nxt = np.roll(side, -1)
+        inside = side >= 0.0
+        crosses = (side >= 0.0) != (side_nxt >= 0.0)
+        t = side / np.where(crosses, side - side_nxt, 1.0)
+        hits = out + ((nxt - out) * t[:, None])
+
+        #Keep the inside verts, and put the crossings
+        #right after the vert they start from:
+        points = np.stack((out, hits), axis=1).reshape(-1, 2)
+        keep = np.stack((inside, crosses), axis=1).ravel()
+        out = points[keep]
+    return out
+
+
+#Whether a polygon is an axis aligned rectangle, so it
+#can go through the quick rectangle test:
+def _is_rect(poly):
+    if len(poly) != 4:
+        return False
+    x = np.unique(poly[:, 0])
+    y = np.unique(poly[:, 1])
+    return len(x) == 2 and len(y) == 2
+
+
+#Where polygons overlap. Given one list, every pair in it
+#is tested. Given others too, every polygon is tested
+#against every one of others instead. Returns a list of
+#(i, j, region) where region is the (n, 2) polygon that
+#i and j share, for every pair that shares more than
+#min_area:
+def find_overlaps(polygons, others=None, min_area=1e-9):
+    polygons = [np.asarray(p, np.float64).reshape(-1, 2) for p in polygons]
+    lo = np.array([p.min(axis=0) for p in polygons]).reshape(-1, 2)
+    hi = np.array([p.max(axis=0) for p in polygons]).reshape(-1, 2)
+    if others is None:
+        targets = polygons
+        i, j = BoxIndex(lo, hi).pairs()
+    else:
+        targets = [np.asarray(p, np.float64).reshape(-1, 2) for p in others]
+        t_lo = np.array([p.min(axis=0) for p in targets]).reshape(-1, 2)
+        t_hi = np.array([p.max(axis=0) for p in targets]).reshape(-1, 2)
+        i, j = BoxIndex(t_lo, t_hi).query_many(lo, hi)
+    return overlap_regions(polygons, targets, i, j, min_area)
+
+
+#The narrow phase on candidate pairs (i into polygons,
+#j into targets) that came out of a BoxIndex:
+def overlap_regions(polygons, targets, i, j, min_area=1e-9):
+    found = []
+    for a, b in zip(i.tolist(), j.tolist()):
+        pa, pb = polygons[a], targets[b]
+        if _is_rect(pa) and _is_rect(pb):
+            lo, hi, hit = rect_intersection(pa.min(axis=0), pa.max(axis=0), pb.min(axis=0), pb.max(axis=0))
+            region = rect_polygon(lo, hi) if hit else np.zeros((0, 2))
+        else:
+            region = clip_polygon(pa, pb)
+        if abs(polygon_area(region)) > min_area:
+            found.append((a, b, region))
+    return found
+
+
+#World space bounds of objects, from their bound_box and
+#matrix_world, as (lo, hi) arrays of (n, 3):
+def object_bounds(objects):
+    objects = list(objects)
+    if not objects:
+        return np.zeros((0, 3)), np.zeros((0, 3))
+    corners = np.array([[c[:] for c in obj.bound_box] for obj in objects], np.float64)
+    matrices = np.array([[row[:] for row in obj.matrix_world] for obj in objects], np.float64)
+    world = np.einsum('nij,nkj->nki', matrices[:, :3, :3], corners) + matrices[:, None, :3, 3]
+    return world.min(axis=1), world.max(axis=1)
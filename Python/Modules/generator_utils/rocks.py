@@ -0,0 +1,85 @@
+# License for this script is GNU GPL Version 3
+# The text for this license can be found here:
+# https://www.gnu.org/licenses/gpl-3.0.en.html
+
+#Rocks (climbing holds and such) made by pushing the
+#verts of an icosphere in and out with fractal noise.
+#A set of variants only depends on its arguments, so
+#rock_variants() keeps them in the geometry cache and
+#hands back the same MeshData every time. Scattered
+#rocks should point at these instead of making new ones.
+
+import numpy as np
+
+from .mesh_data import MeshData
+from .geometry_cache import geometry_cache
+from .noise import fractal_noise
+
+#Bump this when the rock shapes change, so old cache
+#entries don't get used:
+ROCK_VERSION = 1
+
+_T = (1.0 + np.sqrt(5.0)) / 2.0
+_ICO_CO = np.array([(-1, _T, 0), (1, _T, 0), (-1, -_T, 0), (1, -_T, 0),
+                    (0, -1, _T), (0, 1, _T), (0, -1, -_T), (0, 1, -_T),
+                    (_T, 0, -1), (_T, 0, 1), (-_T, 0, -1), (-_T, 0, 1),
+                   ], np.float64)
+_ICO_FACES = np.array([(0, 11, 5), (0, 5, 1), (0, 1, 7), (0, 7, 10), (0, 10, 11),
+                       (1, 5, 9), (5, 11, 4), (11, 10, 2), (10, 7, 6), (7, 1, 8),
+                       (3, 9, 4), (3, 4, 2), (3, 2, 6), (3, 6, 8), (3, 8, 9),
+                       (4, 9, 5), (2, 4, 11), (6, 2, 10), (8, 6, 7), (9, 8, 1),
+                      ], np.int64)
+
+
+#An icosphere as (co, tris) arrays with the verts on
+#the unit sphere. Like bmesh.ops.create_icosphere, 1
+#subdivision is the plain icosahedron, and each one
+#after that splits every triangle into 4:
+def icosphere(subdivisions):
+    co = _ICO_CO / np.linalg.norm(_ICO_CO, axis=1)[:, None]
+    tris = _ICO_FACES
+    for level in range(max(subdivisions, 1) - 1):
+        #One new vert in the middle of every edge:
+        pairs = np.concatenate((tris[:, [0, 1]], tris[:, [1, 2]], tris[:, [2, 0]]))
+        keys = np.sort(pairs, axis=1)
+        keys = (keys[:, 0] << 32) | keys[:, 1]
+        unique, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        mid = co[pairs[first, 0]] + co[pairs[first, 1]]
+        mid /= np.linalg.norm(mid, axis=1)[:, None]
+        mid_index = (inverse.ravel() + len(co)).reshape(3, -1)
+        co = np.concatenate((co, mid))
+
+        a, b, c = tris[:, 0], tris[:, 1], tris[:, 2]
+        ab, bc, ca = mid_index
+        tris = np.concatenate((np.stack((a, ab, ca), axis=1),
+                               np.stack((b, bc, ab), axis=1),
+                               np.stack((c, ca, bc), axis=1),
+                               np.stack((ab, bc, ca), axis=1)))
+    return co, tris
+
+
+#One rock, with a radius of max_size at its biggest
+#bumps and min_size at its deepest dents. offset picks
+#which part of the noise it's carved from:
+def rock_mesh(co, tris, min_size, max_size, seed, offset, frequency=1.5, octaves=4):
+    n = fractal_noise((co * frequency) + offset, octaves, seed=seed)
+    #Stretch the noise so the rock goes all the way
+    #from min_size to max_size:
+    n = (n - n.min()) / max(n.max() - n.min(), 1e-12)
+    radius = min_size + ((max_size - min_size) * n)
+    return MeshData(co * radius[:, None], tris.ravel(), np.full(len(tris), 3, np.int32), smooth=True)
+
+
+#count rocks for one seed, subdivisions and size range,
+#made once and then taken from the cache. The returned
+#MeshData are shared, copy() one before changing it:
+def rock_variants(count, seed, subdivisions, min_size, max_size):
+    key = ("rock_variants", ROCK_VERSION, count, seed, subdivisions, min_size, max_size)
+    variants = geometry_cache.get(key)
+    if variants is None:
+        co, tris = icosphere(subdivisions)
+        rng = np.random.RandomState(seed % (2 ** 32))
+        offsets = rng.uniform(-1000.0, 1000.0, (count, 3))
+        variants = [rock_mesh(co, tris, min_size, max_size, seed, o) for o in offsets]
+        geometry_cache.put(key, variants)
+    return variants
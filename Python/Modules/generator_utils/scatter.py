@@ -0,0 +1,169 @@
+# License for this script is GNU GPL Version 3
+# The text for this license can be found here:
+# https://www.gnu.org/licenses/gpl-3.0.en.html
+
+#Scatters points over a rectangle with Poisson-disk
+#sampling (Bridson's algorithm), so no two points end
+#up closer than a minimum spacing, and turns them into
+#one 4x4 matrix per point for MeshData.instance().
+#
+#The points live on a background grid with cells small
+#enough to hold one point each, so checking a candidate
+#only looks at the cells around it. Each step tries all
+#of its candidates around one active point at once.
+#
+#A density map (any function from (n, 2) points to
+#values from 0 to 1) spreads the points out where it is
+#low: the spacing there grows to radius / sqrt(density),
+#up to max_spread times radius, and no points are put
+#where the density is 0 or less.
+
+import numpy as np
+
+
+#Turns a 2D array of densities into a density function
+#over a size[0] by size[1] rectangle. Rows go along the
+#second axis (bottom row first) and columns along the
+#first, and values in between are blended bilinearly:
+def density_from_array(values, size):
+    values = np.asarray(values, np.float64)
+    rows, cols = values.shape
+
+    def density(points):
+        x = np.clip(points[:, 0] / size[0], 0.0, 1.0) * (cols - 1)
+        y = np.clip(points[:, 1] / size[1], 0.0, 1.0) * (rows - 1)
+        x0 = np.minimum(np.floor(x).astype(np.int64), max(cols - 2, 0))
+        y0 = np.minimum(np.floor(y).astype(np.int64), max(rows - 2, 0))
+        x1 = np.minimum(x0 + 1, cols - 1)
+        y1 = np.minimum(y0 + 1, rows - 1)
+        fx = x - x0
+        fy = y - y0
+        bottom = (values[y0, x0] * (1.0 - fx)) + (values[y0, x1] * fx)
+        top = (values[y1, x0] * (1.0 - fx)) + (values[y1, x1] * fx)
+        return (bottom * (1.0 - fy)) + (top * fy)
+
+    return density
+
+
+#Reads a bpy image as a density array, by brightness:
+def image_density(image):
+    w, h = image.size
+    pixels = np.array(image.pixels[:], np.float32).reshape(h, w, -1)
+    return pixels[:, :, :3].dot((0.2126, 0.7152, 0.0722))
+
+
+#Poisson-disk points inside (0, 0) - size. count stops
+#it early, and k is how many candidates are tried around
+#an active point before it's retired. Returns an (n, 2)
+#array, in the order the points were placed.
+def poisson_disk(size, radius, count=0, density=None, seed=0, k=30, max_spread=4.0):
+    rng = np.random.RandomState(seed)
+    size = np.asarray(size, np.float64)
+    if radius <= 0.0 or size.min() <= 0.0:
+        return np.zeros((0, 2))
+
+    if density is None:
+        spread = 1.0
+    else:
+        spread = max(max_spread, 1.0)
+
+    #Spacing at some points (with their densities):
+    def spacing(points):
+        if density is None:
+            return np.full(len(points), radius), np.ones(len(points))
+        d = np.asarray(density(points), np.float64)
+        r = radius / np.sqrt(np.maximum(d, 1.0 / (spread * spread)))
+        return r, d
+
+    #One point per cell at most, since the cell's
+    #diagonal is the smallest spacing there is:
+    cell = radius / np.sqrt(2.0)
+    shape = np.maximum(np.ceil(size / cell).astype(np.int64), 1)
+    grid = np.full(shape, -1, np.int64)
+    reach = int(np.ceil(spread * np.sqrt(2.0)))
+    steps = np.arange(-reach, reach + 1)
+    near = np.stack(np.meshgrid(steps, steps, indexing="ij"), axis=-1).reshape(-1, 2)
+
+    limit = count if count > 0 else grid.size
+    points = np.zeros((min(limit, grid.size), 2))
+    radii = np.zeros(len(points))
+    placed = 0
+
+    def add(p, r):
+        points[placed] = p
+        radii[placed] = r
+        grid[tuple((p // cell).astype(np.int64))] = placed
+
+    #The first point has to land somewhere with density:
+    for i in range(k * 4):
+        p = rng.uniform(0.0, 1.0, 2) * size
+        r, d = spacing(p[None, :])
+        if d[0] > 0.0:
+            add(p, r[0])
+            placed += 1
+            break
+    active = [0] if placed else []
+
+    while active and placed < limit:
+        pick = rng.randint(len(active))
+        center = points[active[pick]]
+        r_center = radii[active[pick]]
+
+        #k candidates in the ring between r and 2r:
+        angle = rng.uniform(0.0, 2.0 * np.pi, k)
+        dist = r_center * np.sqrt(rng.uniform(1.0, 4.0, k))
+        cand = center + (dist[:, None] * np.stack((np.cos(angle), np.sin(angle)), axis=1))
+        inside = np.all((cand >= 0.0) & (cand < size), axis=1)
+        cand = cand[inside]
+        r_cand, d_cand = spacing(cand)
+        keep = d_cand > 0.0
+        cand, r_cand = cand[keep], r_cand[keep]
+
+        #Everything in the cells around each candidate:
+        cells = (cand // cell).astype(np.int64)[:, None, :] + near[None, :, :]
+        valid = np.all((cells >= 0) & (cells < shape), axis=2)
+        cells = np.clip(cells, 0, shape - 1)
+        other = grid[cells[:, :, 0], cells[:, :, 1]]
+        valid &= other >= 0
+        other = np.maximum(other, 0)
+        gap = np.linalg.norm(points[other] - cand[:, None, :], axis=2)
+        need = np.maximum(r_cand[:, None], radii[other])
+        ok = np.nonzero(np.all(~valid | (gap >= need), axis=1))[0]
+
+        if len(ok):
+            add(cand[ok[0]], r_cand[ok[0]])
+            active.append(placed)
+            placed += 1
+        else:
+            active[pick] = active[-1]
+            active.pop()
+
+    return points[:placed]
+
+
+#Matrices that put instances on a plane. The plane
+#starts at origin and goes along u and v (the points'
+#x and y), and each instance's z axis points along
+#u x v. spins turn the instances around that normal:
+def plane_transforms(points, origin, u, v, scales=1.0, spins=0.0):
+    points = np.asarray(points, np.float64).reshape(-1, 2)
+    n = len(points)
+    u = np.asarray(u, np.float64)
+    v = np.asarray(v, np.float64)
+    normal = np.cross(u, v)
+    u_dir = u / np.linalg.norm(u)
+    v_dir = v / np.linalg.norm(v)
+    normal /= np.linalg.norm(normal)
+
+    scales = np.broadcast_to(np.asarray(scales, np.float64), (n,))
+    spins = np.broadcast_to(np.asarray(spins, np.float64), (n,))
+    cos = np.cos(spins)[:, None]
+    sin = np.sin(spins)[:, None]
+
+    matrices = np.zeros((n, 4, 4))
+    matrices[:, :3, 0] = ((cos * u_dir) + (sin * v_dir)) * scales[:, None]
+    matrices[:, :3, 1] = ((cos * v_dir) - (sin * u_dir)) * scales[:, None]
+    matrices[:, :3, 2] = normal * scales[:, None]
+    matrices[:, :3, 3] = np.asarray(origin, np.float64) + (points[:, :1] * u_dir) + (points[:, 1:] * v_dir)
+    matrices[:, 3, 3] = 1.0
+    return matrices
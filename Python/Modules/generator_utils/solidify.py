@@ -0,0 +1,165 @@
+# License for this script is GNU GPL Version 3
+# The text for this license can be found here:
+# https://www.gnu.org/licenses/gpl-3.0.en.html
+
+#Thickness for open meshes, done on MeshData arrays so
+#a generator doesn't have to add a SOLIDIFY modifier,
+#make its object active and apply it.
+#
+#It works like the modifier with its default settings:
+#every vert gets a copy pushed along its normal, the
+#copies get the faces again (flipped, so they face the
+#other way) and every boundary edge gets a rim quad
+#between the two shells. offset picks where the shell
+#goes, -1 is all the way behind the faces and 1 is all
+#the way in front of them, the same as the modifier's.
+
+import numpy as np
+
+from .mesh_data import MeshData
+
+
+#Normal of every face, scaled by its area. Worked out
+#as the sum of the cross products around the face, so
+#faces with more than 3 corners get a fair normal too:
+def face_normals(data):
+    face = data.loop_face
+    start = data.loop_start[face]
+    total = data.loop_total[face]
+    nxt = start + (((np.arange(data.loop_count) - start) + 1) % total)
+    co = data.co.astype(np.float64)
+    cross = np.cross(co[data.loops], co[data.loops[nxt]])
+    normals = np.zeros((data.face_count, 3))
+    np.add.at(normals, face, cross)
+    return normals * 0.5
+
+
+#Area weighted vertex normals. Loose verts get (0, 0, 0):
+def vertex_normals(data, area_normals=None):
+    if area_normals is None:
+        area_normals = face_normals(data)
+    normals = np.zeros((data.vert_count, 3))
+    np.add.at(normals, data.loops, area_normals[data.loop_face])
+    length = np.linalg.norm(normals, axis=1)
+    normals[length > 0.0] /= length[length > 0.0][:, None]
+    return normals
+
+
+#Edges that only one face uses, as the loops that go
+#along them. Returns the loop and the loop after it:
+def boundary_loops(data):
+    face = data.loop_face
+    start = data.loop_start[face]
+    total = data.loop_total[face]
+    nxt = start + (((np.arange(data.loop_count) - start) + 1) % total)
+    pairs = np.sort(np.stack((data.loops, data.loops[nxt]), axis=1), axis=1).astype(np.int64)
+    keys = (pairs[:, 0] << 32) | pairs[:, 1]
+    _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    loops = np.nonzero(counts[inverse.ravel()] == 1)[0]
+    return loops, nxt[loops]
+
+
+#Gives data a thickness, all in one go. With even, the
+#shell is pushed further out at sharp corners so the
+#faces keep the same thickness everywhere (like the
+#modifier's Even Thickness). Without rim, the two shells
+#aren't joined at the boundary edges.
+#
+#Returns the new MeshData and a flag for every one of
+#its faces that is true for the rim faces.
+def solidify(data, thickness, offset=-1.0, even=False, rim=True):
+    area_normals = face_normals(data)
+    normals = vertex_normals(data, area_normals)
+
+    if even:
+        #The shell moves along the vertex normal, but the
+        #thickness is measured along the face normals, so
+        #scale it by the (area weighted) cosine between them:
+        area = np.linalg.norm(area_normals, axis=1)
+        face = data.loop_face
+        cos = (normals[data.loops] * area_normals[face]).sum(axis=1)
+        weight = np.zeros(data.vert_count)
+        dot = np.zeros(data.vert_count)
+        np.add.at(weight, data.loops, area[face])
+        np.add.at(dot, data.loops, cos)
+        scale = np.ones(data.vert_count)
+        used = dot > 1e-12
+        scale[used] = np.minimum(weight[used] / dot[used], 4.0)
+        normals *= scale[:, None]
+
+    co = data.co.astype(np.float64)
+    front = co + (normals * (thickness * (offset + 1.0) * 0.5))
+    back = co + (normals * (thickness * (offset - 1.0) * 0.5))
+    n = data.vert_count
+
+    #The back shell is the same faces, turned around:
+    shell = data.copy().flip()
+    parts_loops = [data.loops, shell.loops + n]
+    parts_total = [data.loop_total, data.loop_total]
+    parts_smooth = [data.smooth, data.smooth]
+    parts_uv = [data.uv, shell.uv]
+
+    rim_count = 0
+    if rim:
+        #A face going a -> b along a boundary edge gets a
+        #rim quad going b -> a -> a' -> b' next to it:
+        loop, nxt = boundary_loops(data)
+        a = data.loops[loop]
+        b = data.loops[nxt]
+        rim_count = len(loop)
+        parts_loops.append(np.stack((b, a, a + n, b + n), axis=1).ravel())
+        parts_total.append(np.full(rim_count, 4, np.int32))
+        parts_smooth.append(data.smooth[data.loop_face[loop]])
+        if data.uv is not None:
+            parts_uv.append(np.stack((data.uv[nxt], data.uv[loop], data.uv[loop], data.uv[nxt]), axis=1).reshape(-1, 2))
+
+    uv = None
+    if data.uv is not None:
+        uv = np.concatenate(parts_uv)
+    edges = np.concatenate((data.edges, data.edges + n))
+    solid = MeshData(np.concatenate((front, back)),
+                     np.concatenate(parts_loops),
+                     np.concatenate(parts_total),
+                     np.concatenate(parts_smooth),
+                     uv, edges)
+
+    rim_faces = np.zeros(solid.face_count, bool)
+    rim_faces[solid.face_count - rim_count:] = True
+    return solid, rim_faces
+
+
+#Sets the crease of the edges where the rim meets the
+#shells, like the modifier's edge_crease_rim does. mesh
+#has to be the one data was just written to by to_mesh.
+def crease_rim(mesh, data, rim_faces, crease=1.0):
+    edges, loop_edge = data.face_edges()
+    on_rim = rim_faces[data.loop_face]
+    rim = np.zeros(len(edges) + len(data.edges), bool)
+    shell = np.zeros(len(rim), bool)
+    rim[loop_edge[on_rim]] = True
+    shell[loop_edge[~on_rim]] = True
+    creases = np.where(rim & shell, crease, 0.0).astype(np.float32)
+    mesh.edges.foreach_set("crease", creases)
+    return mesh
+
+
+#Solidifies an object's mesh in place of the modifier.
+#The object gets a new mesh with the same name, and the
+#old one is removed if nothing else uses it.
+def solidify_object(obj, thickness, offset=-1.0, even=False, rim=True, crease=0.0):
+    import bpy
+
+    old = obj.data
+    name = old.name
+    data, rim_faces = solidify(MeshData.from_mesh(old), thickness, offset, even, rim)
+    mesh = bpy.data.meshes.new(name)
+    data.to_mesh(mesh)
+    if crease > 0.0:
+        crease_rim(mesh, data, rim_faces, crease)
+    for mat in old.materials:
+        mesh.materials.append(mat)
+    obj.data = mesh
+    if old.users == 0:
+        bpy.data.meshes.remove(old)
+        mesh.name = name
+    return obj
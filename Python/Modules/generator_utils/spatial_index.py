@@ -0,0 +1,247 @@
+# License for this script is GNU GPL Version 3
+# The text for this license can be found here:
+# https://www.gnu.org/licenses/gpl-3.0.en.html
+
+#SpatialIndex answers "which verts/edges are in here"
+#for a mesh without walking every BMVert in python.
+#It is built once from foreach_get arrays and then
+#every box, slab or radius query is a few numpy ops.
+#Queries return sorted index arrays, which can go to
+#bm_verts()/bm_edges() to get the geom for bmesh.ops.
+
+import numpy as np
+
+
+class SpatialIndex(object):
+    """AABB query index over the verts and edges of one mesh"""
+
+    def __init__(self, co, edges=None):
+        self.co = np.ascontiguousarray(co, np.float64).reshape(-1, 3)
+        if edges is None:
+            edges = np.zeros((0, 2), np.int32)
+        self.edges = np.ascontiguousarray(edges, np.int32).reshape(-1, 2)
+
+        #Bounds of the whole mesh, so queries that
+        #miss the mesh entirely return right away:
+        if len(self.co):
+            self.bounds_min = self.co.min(axis=0)
+            self.bounds_max = self.co.max(axis=0)
+        else:
+            self.bounds_min = np.zeros(3)
+            self.bounds_max = np.zeros(3)
+
+        #Verts sorted along x. A box only has to test
+        #the run of verts between its two x planes:
+        self._order = np.argsort(self.co[:, 0], kind="mergesort")
+        self._sorted_x = self.co[self._order, 0]
+
+    #Reads vert and edge arrays off a bpy.types.Mesh:
+    @classmethod
+    def from_mesh(cls, mesh):
+        co = np.empty(len(mesh.vertices) * 3, np.float32)
+        mesh.vertices.foreach_get("co", co)
+        edges = np.empty(len(mesh.edges) * 2, np.int32)
+        mesh.edges.foreach_get("vertices", edges)
+        return cls(co, edges)
+
+    #Builds the index straight from MeshData, using the
+    #same edge order that to_mesh()/to_bmesh() commit:
+    @classmethod
+    def from_mesh_data(cls, data):
+        edges, loop_edge = data.face_edges()
+        return cls(data.co, np.concatenate((edges, data.edges)))
+
+    #BMesh has no foreach_get, so it gets copied to a
+    #scratch mesh first. to_mesh() keeps the element
+    #order, so indices still match bm.verts/bm.edges:
+    @classmethod
+    def from_bmesh(cls, bm):
+        import bpy
+
+        scratch = bpy.data.meshes.new("spatial_index_scratch")
+        try:
+            bm.to_mesh(scratch)
+            return cls.from_mesh(scratch)
+        finally:
+            bpy.data.meshes.remove(scratch)
+
+    @property
+    def vert_count(self):
+        return len(self.co)
+
+    @property
+    def edge_count(self):
+        return len(self.edges)
+
+    #Boolean mask of the verts inside [lo, hi] (inclusive):
+    def _box_mask(self, lo, hi):
+        lo = np.asarray(lo, np.float64)
+        hi = np.asarray(hi, np.float64)
+        mask = np.zeros(len(self.co), bool)
+        if np.any(lo > self.bounds_max) or np.any(hi < self.bounds_min):
+            return mask
+
+        first = np.searchsorted(self._sorted_x, lo[0], side="left")
+        last = np.searchsorted(self._sorted_x, hi[0], side="right")
+        cand = self._order[first:last]
+        co = self.co[cand]
+        inside = np.all((co >= lo) & (co <= hi), axis=1)
+        mask[cand[inside]] = True
+        return mask
+
+    def _slab_mask(self, axis, lo, hi):
+        c = self.co[:, axis]
+        return (c >= lo) & (c <= hi)
+
+    def _radius_mask(self, center, radius):
+        center = np.asarray(center, np.float64)
+        mask = self._box_mask(center - radius, center + radius)
+        cand = np.flatnonzero(mask)
+        d = self.co[cand] - center
+        mask[cand[np.einsum("ij,ij->i", d, d) > radius * radius]] = False
+        return mask
+
+    #Turns a vert mask into the edges that have either
+    #one (both=False) or both endpoints set in it:
+    def _edges_from_mask(self, mask, both):
+        a = mask[self.edges[:, 0]]
+        b = mask[self.edges[:, 1]]
+        if both:
+            return np.flatnonzero(a & b)
+        return np.flatnonzero(a | b)
+
+    #x, y, z is the center of the box and l, w, h
+    #are its length, width and height, the same way
+    #the old select_*_in_bounds functions took them:
+    def verts_in_box(self, x, y, z, l, w, h):
+        lo, hi = _box_bounds(x, y, z, l, w, h)
+        return np.flatnonzero(self._box_mask(lo, hi))
+
+    def edges_in_box(self, x, y, z, l, w, h, both=True):
+        lo, hi = _box_bounds(x, y, z, l, w, h)
+        return self._edges_from_mask(self._box_mask(lo, hi), both)
+
+    #Same as the box queries, but with min/max corners:
+    def verts_in_bounds(self, lo, hi):
+        return np.flatnonzero(self._box_mask(lo, hi))
+
+    def edges_in_bounds(self, lo, hi, both=True):
+        return self._edges_from_mask(self._box_mask(lo, hi), both)
+
+    #A slab is everything between two planes on one
+    #axis (0, 1, 2 or 'X', 'Y', 'Z'), like lo <= z <= hi:
+    def verts_in_slab(self, axis, lo, hi):
+        return np.flatnonzero(self._slab_mask(_axis(axis), lo, hi))
+
+    def edges_in_slab(self, axis, lo, hi, both=True):
+        return self._edges_from_mask(self._slab_mask(_axis(axis), lo, hi), both)
+
+    def verts_in_radius(self, center, radius):
+        return np.flatnonzero(self._radius_mask(center, radius))
+
+    def edges_in_radius(self, center, radius, both=True):
+        return self._edges_from_mask(self._radius_mask(center, radius), both)
+
+
+def _box_bounds(x, y, z, l, w, h):
+    center = np.array((x, y, z), np.float64)
+    half = np.array((l, w, h), np.float64) / 2.0
+    return center - half, center + half
+
+
+def _axis(axis):
+    if axis in ('X', 'Y', 'Z'):
+        return "XYZ".index(axis)
+    return int(axis)
+
+
+AXES = {'X': 0, 'Y': 1, 'Z': 2}
+
+
+class FaceExtents(object):
+    """Per face min/max along x, y and z, for extreme face queries"""
+
+    def __init__(self, co, loops, loop_total):
+        co = np.ascontiguousarray(co, np.float64).reshape(-1, 3)
+        loops = np.asarray(loops, np.int64).ravel()
+        loop_total = np.asarray(loop_total, np.int64).ravel()
+        self.co_min = co.min(axis=0) if len(co) else np.zeros(3)
+        self.co_max = co.max(axis=0) if len(co) else np.zeros(3)
+
+        #One reduceat over the loops gives every face's
+        #extent along all three axes at once:
+        if len(loop_total):
+            start = np.zeros(len(loop_total), np.int64)
+            np.cumsum(loop_total[:-1], out=start[1:])
+            corner = co[loops]
+            self.face_min = np.minimum.reduceat(corner, start, axis=0)
+            self.face_max = np.maximum.reduceat(corner, start, axis=0)
+        else:
+            self.face_min = np.zeros((0, 3))
+            self.face_max = np.zeros((0, 3))
+
+    @classmethod
+    def from_mesh(cls, mesh):
+        co = np.empty(len(mesh.vertices) * 3, np.float32)
+        mesh.vertices.foreach_get("co", co)
+        loops = np.empty(len(mesh.loops), np.int32)
+        mesh.loops.foreach_get("vertex_index", loops)
+        loop_total = np.empty(len(mesh.polygons), np.int32)
+        mesh.polygons.foreach_get("loop_total", loop_total)
+        return cls(co, loops, loop_total)
+
+    @classmethod
+    def from_mesh_data(cls, data):
+        return cls(data.co, data.loops, data.loop_total)
+
+    #Through a scratch mesh, like SpatialIndex.from_bmesh,
+    #so the indices match bm.faces:
+    @classmethod
+    def from_bmesh(cls, bm):
+        import bpy
+
+        scratch = bpy.data.meshes.new("face_extents_scratch")
+        try:
+            bm.to_mesh(scratch)
+            return cls.from_mesh(scratch)
+        finally:
+            bpy.data.meshes.remove(scratch)
+
+    @property
+    def face_count(self):
+        return len(self.face_min)
+
+    #Indices of the faces that lie flat on the outermost
+    #side of the mesh. Every side is a sign and an axis,
+    #like "+X" or "-Z", and more than one side returns
+    #the faces that are on any of them. eps is how far a
+    #vert can be from the side and still count:
+    def extreme(self, *sides, **kwargs):
+        eps = kwargs.get("eps", 1e-6)
+        mask = np.zeros(self.face_count, bool)
+        for side in sides:
+            sign, axis = side[0], AXES[side[1:].upper()]
+            if sign == "+":
+                mask |= self.face_min[:, axis] >= self.co_max[axis] - eps
+            elif sign == "-":
+                mask |= self.face_max[:, axis] <= self.co_min[axis] + eps
+            else:
+                raise ValueError("Side has to start with + or -, not '%s'" % side)
+        return np.flatnonzero(mask)
+
+
+#Looks up the BMVerts/BMEdges for a query result, so
+#it can be passed as geom to bmesh.ops.bevel and co:
+def bm_verts(bm, indices):
+    bm.verts.ensure_lookup_table()
+    return [bm.verts[i] for i in np.asarray(indices).tolist()]
+
+
+def bm_edges(bm, indices):
+    bm.edges.ensure_lookup_table()
+    return [bm.edges[i] for i in np.asarray(indices).tolist()]
+
+
+def bm_faces(bm, indices):
+    bm.faces.ensure_lookup_table()
+    return [bm.faces[i] for i in np.asarray(indices).tolist()]
@@ -0,0 +1,101 @@
+# License for this script is GNU GPL Version 3
+# The text for this license can be found here:
+# https://www.gnu.org/licenses/gpl-3.0.en.html
+
+#TemplateStore keeps the hand made base meshes of a
+#generator as .npy files instead of python literals.
+#Every part is a folder holding co.npy, loops.npy and
+#loop_total.npy (the MeshData arrays), plus one int32
+#array for each index group (faces to smooth, verts to
+#move, edges to bevel and so on, see topology.py).
+#Nothing gets read until a part is first used, and
+#then the arrays are memory mapped read only, so every
+#Blender process that loads them shares the same pages.
+
+import os
+
+import numpy as np
+
+from .mesh_data import MeshData
+from .topology import TopologyGroups
+
+
+class TemplateStore(object):
+    """Lazily memory mapped mesh templates in one folder"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._arrays = {}
+        self._topology = {}
+
+    def path(self, part, name):
+        return os.path.join(self.directory, part, name + ".npy")
+
+    #The arrays are read only. Copy one (np.array) before
+    #changing it, or the next part made from it would
+    #get the changes too:
+    def array(self, part, name):
+        key = (part, name)
+        arr = self._arrays.get(key)
+        if arr is None:
+            arr = np.load(self.path(part, name), mmap_mode='r')
+            self._arrays[key] = arr
+        return arr
+
+    #MeshData straight on top of the mapped arrays:
+    def mesh(self, part):
+        return MeshData(self.array(part, "co"),
+                        self.array(part, "loops"),
+                        self.array(part, "loop_total"))
+
+    #Every index group of a part, checked against its
+    #mesh the first time the part is used:
+    def topology(self, part):
+        topo = self._topology.get(part)
+        if topo is None:
+            groups = dict((g, self.array(part, g)) for g in self.groups(part))
+            topo = TopologyGroups(self.mesh(part), groups, name=part)
+            self._topology[part] = topo
+        return topo
+
+    def index(self, part, group):
+        return self.topology(part)[group]
+
+    def parts(self):
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name for name in os.listdir(self.directory)
+                      if os.path.isdir(os.path.join(self.directory, name)))
+
+    def groups(self, part):
+        names = os.listdir(os.path.join(self.directory, part))
+        return sorted(n[:-4] for n in names
+                      if n.endswith(".npy") and n[:-4] not in ("co", "loops", "loop_total"))
+
+    #Drops the maps, so the files can be written again:
+    def clear(self):
+        self._arrays.clear()
+        self._topology.clear()
+
+    #Writes a part from verts and faces lists, the way
+    #they used to be typed into the generators. Every
+    #keyword is an index group:
+    def save(self, part, verts, faces, **groups):
+        folder = os.path.join(self.directory, part)
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+        for key in [k for k in self._arrays if k[0] == part]:
+            del self._arrays[key]
+        self._topology.pop(part, None)
+
+        #Groups are stored sorted and without duplicates,
+        #and a bad one never makes it to the disk:
+        data = MeshData.from_pydata(verts, faces)
+        groups = dict((name, np.unique(np.asarray(indices, np.int32))) for name, indices in groups.items())
+        TopologyGroups(data, groups, name=part)
+
+        np.save(self.path(part, "co"), data.co)
+        np.save(self.path(part, "loops"), data.loops)
+        np.save(self.path(part, "loop_total"), data.loop_total)
+        for name, indices in groups.items():
+            np.save(self.path(part, name), indices)
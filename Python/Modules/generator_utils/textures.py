@@ -0,0 +1,239 @@
+# License for this script is GNU GPL Version 3
+# The text for this license can be found here:
+# https://www.gnu.org/licenses/gpl-3.0.en.html
+
+#Texture maps for the generators, painted into float32
+#numpy buffers instead of lists of [r, g, b, a] lists.
+#A TextureBuffer is an (height, width, 4) array laid out
+#the way Blender's image.pixels is (bottom row first), so
+#it goes into an image with a single foreach_set.
+#
+#Shapes get painted in UV space (0 to 1 on both axes),
+#so a generator only has to know which UV rectangles a
+#stripe or panel covers, never the pixel size.
+#
+#The PNG files are encoded here with zlib and written on
+#a small thread pool, so the operator can return while
+#a 4k map is still being compressed. Blender's own
+#image.save() can't run off the main thread, and this
+#way the file doesn't depend on a bpy image at all.
+
+import os
+import struct
+import zlib
+import logging
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+#The maps every generator makes, and what they start as:
+PBR_MAPS = OrderedDict((("albedo", (1.0, 1.0, 1.0, 1.0)),
+                        ("metallic", (0.0, 0.0, 0.0, 1.0)),
+                        ("roughness", (1.0, 1.0, 1.0, 1.0)),
+                        ))
+
+
+def rgba(color, alpha=1.0):
+    color = tuple(color)
+    if len(color) == 1:
+        color = color * 3
+    if len(color) == 3:
+        color += (alpha,)
+    return np.array(color, np.float32)
+
+
+class TextureBuffer(object):
+    """A float32 RGBA image in Blender's pixel order"""
+
+    def __init__(self, width, height, color=(0.0, 0.0, 0.0, 1.0)):
+        self.width = width
+        self.height = height
+        self.pixels = np.empty((height, width, 4), np.float32)
+        self.pixels[:] = rgba(color)
+
+    @property
+    def nbytes(self):
+        return self.pixels.nbytes
+
+    def fill(self, color):
+        self.pixels[:] = rgba(color)
+        return self
+
+    #UV rectangle to pixel slices. A pixel is painted when
+    #its center is inside the rectangle, so two rectangles
+    #that share an edge never paint the same pixel twice:
+    def _span(self, lo, hi, size):
+        lo, hi = min(lo, hi), max(lo, hi)
+        start = int(np.clip(np.ceil(lo * size - 0.5), 0, size))
+        end = int(np.clip(np.ceil(hi * size - 0.5), 0, size))
+        return slice(start, end)
+
+    def fill_rect(self, u0, v0, u1, v1, color):
+        self.pixels[self._span(v0, v1, self.height), self._span(u0, u1, self.width)] = rgba(color)
+        return self
+
+    #Several rectangles at once, one (u0, v0, u1, v1) row
+    #each, all in the same color:
+    def fill_rects(self, rects, color):
+        color = rgba(color)
+        for u0, v0, u1, v1 in np.asarray(rects, np.float64).reshape(-1, 4):
+            self.pixels[self._span(v0, v1, self.height), self._span(u0, u1, self.width)] = color
+        return self
+
+    #Horizontal bands across the whole image, as (v0, v1)
+    #pairs, for stripes that wrap around an unwrapped part:
+    def fill_bands(self, bands, color):
+        bands = np.asarray(bands, np.float64).reshape(-1, 2)
+        rects = np.zeros((len(bands), 4))
+        rects[:, 1] = bands[:, 0]
+        rects[:, 2] = 1.0
+        rects[:, 3] = bands[:, 1]
+        return self.fill_rects(rects, color)
+
+    #8 bit RGBA rows, top row first, the way PNG wants them:
+    def to_bytes(self):
+        pixels = np.clip(self.pixels[::-1], 0.0, 1.0) * 255.0 + 0.5
+        return pixels.astype(np.uint8)
+
+    #Into a bpy image of the same size. Blender takes the
+    #flat float32 array as is, no per pixel python objects:
+    def to_image(self, image):
+        if tuple(image.size) != (self.width, self.height):
+            image.scale(self.width, self.height)
+        image.pixels.foreach_set(self.pixels.ravel())
+        image.update()
+        return image
+
+
+def _chunk(tag, data):
+    return (struct.pack(">I", len(data)) + tag + data
+            + struct.pack(">I", zlib.crc32(tag + data) & 0xffffffff))
+
+
+#Encodes a (height, width, 4) uint8 array, top row first:
+def encode_png(rows, level=6):
+    height, width = rows.shape[:2]
+    raw = np.zeros((height, width * 4 + 1), np.uint8)
+    raw[:, 1:] = rows.reshape(height, width * 4)
+    return b"".join((b"\x89PNG\r\n\x1a\n",
+                     _chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)),
+                     _chunk(b"IDAT", zlib.compress(raw.tobytes(), level)),
+                     _chunk(b"IEND", b""),
+                     ))
+
+
+def write_png(path, rows, level=6):
+    data = encode_png(rows, level)
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+#Where the maps go. Blender's "//" paths are relative to
+#the .blend file, and an unsaved file has no folder yet,
+#so those maps go to the temp folder instead:
+def texture_dir(path):
+    import bpy
+    if path.startswith("//") and not bpy.data.filepath:
+        path = os.path.join(bpy.app.tempdir or bpy.context.user_preferences.filepaths.temporary_directory,
+                            path[2:])
+    return os.path.abspath(bpy.path.abspath(path))
+
+
+def _log_failure(future, path):
+    if not future.cancelled() and future.exception() is not None:
+        log.error("Couldn't write %s: %s", path, future.exception())
+
+
+class TextureWriter(object):
+    """Writes PNG files on background threads"""
+
+    def __init__(self, max_workers=2):
+        self.max_workers = max_workers
+        self._pool = None
+        self._pending = []
+
+    #The bytes get made here, on the calling thread, so the
+    #buffer can be painted over as soon as this returns.
+    #Nobody might ever wait on the future, so a file that
+    #can't be written gets logged when it fails:
+    def save(self, buffer, path, level=6):
+        folder = os.path.dirname(path)
+        if folder and not os.path.isdir(folder):
+            os.makedirs(folder)
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        self._pending = [f for f in self._pending if not f.done()]
+        future = self._pool.submit(write_png, path, buffer.to_bytes(), level)
+        future.add_done_callback(lambda f: _log_failure(f, path))
+        self._pending.append(future)
+        return future
+
+    #Blocks until every file is written, and raises the
+    #first error one of them ran into:
+    def wait(self):
+        pending, self._pending = self._pending, []
+        return [f.result() for f in pending]
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        self._pending = []
+
+texture_writer = TextureWriter()
+
+
+class TextureSet(object):
+    """The albedo, metallic and roughness maps of one generated object"""
+
+    def __init__(self, name, width, height, maps=PBR_MAPS):
+        self.name = name
+        self.width = width
+        self.height = height
+        self.maps = OrderedDict((m, TextureBuffer(width, height, color)) for m, color in maps.items())
+
+    def __getitem__(self, name):
+        return self.maps[name]
+
+    def __iter__(self):
+        return iter(self.maps.items())
+
+    #"Traffic_Cone" and "albedo" make Traffic_Cone_Albedo
+    #for the image and traffic_cone_albedo.png for the file:
+    def image_name(self, name):
+        return "%s_%s" % (self.name, name.title())
+
+    def file_name(self, name):
+        return self.image_name(name).lower() + ".png"
+
+    #Puts every map into a bpy image, reusing the images
+    #of the last run so redoing the operator doesn't leave
+    #a trail of .001, .002 images behind:
+    def to_images(self):
+        import bpy
+        images = OrderedDict()
+        for name, buffer in self:
+            image_name = self.image_name(name)
+            image = bpy.data.images.get(image_name)
+            if image is None:
+                image = bpy.data.images.new(image_name, width=self.width, height=self.height, alpha=True)
+            images[name] = buffer.to_image(image)
+        return images
+
+    #Starts writing every map into directory and returns the
+    #futures. Pass the images from to_images() to have them
+    #point at the files once they're saved:
+    def save(self, directory, images=None, writer=texture_writer):
+        futures = OrderedDict()
+        for name, buffer in self:
+            path = os.path.join(directory, self.file_name(name))
+            futures[name] = writer.save(buffer, path)
+            if images is not None and name in images:
+                images[name].filepath_raw = path
+                images[name].file_format = 'PNG'
+        return futures
@@ -0,0 +1,112 @@
+# License for this script is GNU GPL Version 3
+# The text for this license can be found here:
+# https://www.gnu.org/licenses/gpl-3.0.en.html
+
+#Named index groups of a template: the verts, edges or
+#faces of the base mesh that some step works on (move
+#the top, bevel these edges, smooth those faces). What
+#a group holds comes from its name, "*_verts", "*_edges"
+#or "*_faces". Every group is a sorted, duplicate free
+#int32 array that gets checked against the template
+#once when it's loaded, so a bad index is an error right
+#away instead of the wrong vert halfway through a bevel.
+#
+#Groups index the template as it comes out of
+#MeshData.to_bmesh()/to_mesh(), so they have to be used
+#before anything changes the topology (like a bevel).
+
+import numpy as np
+
+KINDS = ("verts", "edges", "faces")
+
+
+def group_kind(name):
+    kind = name.rsplit("_", 1)[-1]
+    if kind not in KINDS:
+        raise ValueError("Index group '%s' has to end in _verts, _edges or _faces" % name)
+    return kind
+
+
+class TopologyGroups(object):
+    """Validated index groups of one template mesh"""
+
+    def __init__(self, data, groups, name="template"):
+        face_edges, loop_edge = data.face_edges()
+        self.name = name
+        self.edges = np.concatenate((face_edges, data.edges))
+        self.loops = data.loops
+        self.loop_face = data.loop_face
+        self.counts = {"verts": data.vert_count,
+                       "edges": len(self.edges),
+                       "faces": data.face_count,
+                       }
+        self._groups = {}
+        self._verts_of = {}
+        for group, indices in groups.items():
+            self._groups[group] = self._check(group, indices)
+
+    def _check(self, group, indices):
+        kind = group_kind(group)
+        indices = np.asarray(indices)
+        if indices.dtype.kind not in "iu":
+            raise ValueError("%s: group '%s' is %s, not integers" % (self.name, group, indices.dtype))
+        indices = indices.astype(np.int32, copy=False).ravel()
+        if len(indices) and np.any(np.diff(indices) <= 0):
+            raise ValueError("%s: group '%s' is not sorted and duplicate free" % (self.name, group))
+        if len(indices) and (indices[0] < 0 or indices[-1] >= self.counts[kind]):
+            raise ValueError("%s: group '%s' goes up to index %d, but the template only has %d %s"
+                             % (self.name, group, indices[-1], self.counts[kind], kind))
+        return indices
+
+    def __contains__(self, group):
+        return group in self._groups
+
+    def __getitem__(self, group):
+        return self._groups[group]
+
+    def names(self):
+        return sorted(self._groups)
+
+    #The group as a bitset, one bool per element:
+    def mask(self, group):
+        kind = group_kind(group)
+        mask = np.zeros(self.counts[kind], bool)
+        mask[self._groups[group]] = True
+        return mask
+
+    #Every vert used by an edge or face group (or the
+    #group itself for a vert group), worked out once:
+    def verts_of(self, group):
+        verts = self._verts_of.get(group)
+        if verts is None:
+            kind = group_kind(group)
+            indices = self._groups[group]
+            if kind == "verts":
+                verts = indices
+            elif kind == "edges":
+                verts = np.unique(self.edges[indices].ravel())
+            else:
+                in_group = np.zeros(self.counts["faces"], bool)
+                in_group[indices] = True
+                verts = np.unique(self.loops[in_group[self.loop_face]])
+            verts = verts.astype(np.int32)
+            self._verts_of[group] = verts
+        return verts
+
+    #The BMVerts/BMEdges/BMFaces of a group, for a bmesh
+    #that was made from the template:
+    def resolve(self, bm, group):
+        kind = group_kind(group)
+        seq = getattr(bm, kind)
+        if len(seq) != self.counts[kind]:
+            raise ValueError("%s: bmesh has %d %s, the template has %d"
+                             % (self.name, len(seq), kind, self.counts[kind]))
+        seq.ensure_lookup_table()
+        return [seq[i] for i in self._groups[group].tolist()]
+
+    def resolve_verts(self, bm, group):
+        if len(bm.verts) != self.counts["verts"]:
+            raise ValueError("%s: bmesh has %d verts, the template has %d"
+                             % (self.name, len(bm.verts), self.counts["verts"]))
+        bm.verts.ensure_lookup_table()
+        return [bm.verts[i] for i in self.verts_of(group).tolist()]
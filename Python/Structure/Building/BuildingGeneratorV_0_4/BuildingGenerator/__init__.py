@@ -11,9 +11,16 @@ bl_info = {
     "category": "Add Mesh"}
 
 import bpy
-import random
-from datetime import datetime
-from . import door_add, window_add, operator_structure_add
+import time
+import shutil
+import tempfile
+
+from mathutils import Euler
+from generator_utils import add_mesh_object
+from . import batch
+from . import layout
+from . import mesher
+from . import sampler
 
 from bpy.props import (
         BoolProperty,
@@ -22,6 +29,7 @@ from bpy.props import (
         FloatVectorProperty,
         EnumProperty,
         IntProperty,
+        StringProperty,
         )
 
 
@@ -46,7 +54,7 @@ class AddBuilding(bpy.types.Operator):
     floor_ceil_dist = FloatProperty(
             name="Floor height",
             description="Height of each floor",
-            min=4.0,
+            min=1.0,
             default=10.0,
             )
     floors = IntProperty(
@@ -76,6 +84,18 @@ class AddBuilding(bpy.types.Operator):
             description="Randomize all above parameters",
             default=False
             )
+    #Which seed the values were last rolled with, so a
+    #redo only rolls them again if that changed:
+    rolled = BoolProperty(
+            name="Rolled",
+            default=False,
+            options={'HIDDEN', 'SKIP_SAVE'},
+            )
+    rolled_seed = IntProperty(
+            name="Rolled Seed",
+            default=0,
+            options={'HIDDEN', 'SKIP_SAVE'},
+            )
     location = FloatVectorProperty(
             name="Location",
             subtype='TRANSLATION',
@@ -87,30 +107,6 @@ class AddBuilding(bpy.types.Operator):
     #EnumProperty for building presets, like apartment/hotel, gas station, store, warehouse, etc.
     
     def draw(self, context):
-        
-        #Randomize values if they need
-        #to be randomized, before they
-        #are all displayed in the menu
-        if self.time_seed:
-            random.seed(datetime.now())
-        else:
-            random.seed(self.rseed)
-        
-        if self.randomize_values == True:
-            self.length = ((round(((random.random() * 50) + 4)), 2))
-            self.width = ((round(((random.random() * 50) + 4)), 2))
-            self.floor_ceil_dist = ((round(((random.random() * 1) + 2.5)), 2))
-            self.structures = random.randint(1, 6)
-            #Many buildings are only 1 floor so this'll
-            #need a bias for buildings that are smaller
-            floor_bias = random.choice([1, 2, 3,]) #3 is anything larger than 1 or 2 floors
-            if floor_bias == 1:
-                self.floors = 1
-            elif floor_bias == 2:
-                self.floors = 2
-            else:
-                self.floors = random.randint(1, 15)
-        
         layout = self.layout
         
         box = layout.box()
@@ -136,30 +132,320 @@ class AddBuilding(bpy.types.Operator):
         col.prop(self, "rseed")
         
         
+    #The time seed is picked once, when the operator is
+    #called, so changing values in the redo panel keeps
+    #the same building instead of rolling a new one:
+    def invoke(self, context, event):
+        if self.time_seed:
+            self.rseed = int(time.time() * 1000.0) % (2 ** 31)
+        return self.execute(context)
+    
+    #Rolls every randomized value in one go. The same seed
+    #always gives the same values:
+    def randomize(self):
+        values = sampler.sample_buildings([0], self.rseed)
+        self.length = values["length"][0]
+        self.width = values["width"][0]
+        self.floor_ceil_dist = values["floor_ceil_dist"][0]
+        self.structures = int(values["structures"][0])
+        self.floors = int(values["floors"][0])
+        self.rolled = True
+        self.rolled_seed = self.rseed
+        
     def execute(self, context):
         
+        #The values only get rolled when Randomize All gets
+        #turned on or the seed changes, so whatever was
+        #edited in the redo panel after that stays put:
+        if not self.randomize_values:
+            self.rolled = False
+        elif not self.rolled or self.rolled_seed != self.rseed:
+            self.randomize()
+        
         #rename variables to something easier:
         l = self.length
         w = self.width
         f = self.floors
         fcd = self.floor_ceil_dist
-        s = structures
+        s = self.structures
         loc = self.location
         rot = self.rotation
         
         #Determine the locations and bounds of each structure:
+        lot = {"id": 0,
+               "center": (loc[0], loc[1]),
+               "length": l,
+               "width": w,
+               "rotation": rot[2],
+               }
+        settings = {"length": l,
+                    "width": w,
+                    "floor_ceil_dist": fcd,
+                    "floors": f,
+                    "structures": s,
+                    "floor_thickness": 0.3,
+                    "wall_thickness": 0.15,
+                    "roof_type": 'FLAT',
+                    "roof_height": 0.3,
+                    }
+        building = batch.roll_building(lot, self.rseed, settings)
+        
+        #Wings can't go through anything already in the scene
+        #at the building's height. Where they overlap each
+        #other doesn't matter, since the building is made
+        #from the union of them all:
+        height = (f * (fcd + settings["floor_thickness"])) + settings["roof_height"]
+        obstacles = layout.object_footprints((o for o in context.scene.objects if o.type == 'MESH'),
+                                             (loc[2], loc[2] + height))
+        structures = layout.place_structures(building["structures"], loc, rot[2], obstacles)[0]
+        dropped = len(building["structures"]) - len(structures)
+        if dropped:
+            self.report({'WARNING'}, "Left out %d wing(s) that ran into other objects" % dropped)
+        
+        scene = context.scene
+        obj = add_mesh_object(context, mesher.generate_building(structures), "Building")
+        obj.location = loc
+        obj.rotation_euler = Euler((0.0, 0.0, rot[2]))
+        
+        for o in scene.objects:
+            o.select = False
+        obj.select = True
+        scene.objects.active = obj
+        
+        return {'FINISHED'}
+
+
+class AddBuildingBatch(bpy.types.Operator):
+    """Add a whole district of buildings, built in background Blender processes"""
+    bl_idname = "mesh.building_batch_add"
+    bl_label = "Add Buildings (Batch)"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    lots = EnumProperty(
+            name="Lots",
+            description="Where to put the buildings",
+            items=(('GRID', 'Grid', 'A grid of lots, separated by streets'),
+                   ('SELECTED', 'Selected', 'One lot for each selected object, using its location, size and rotation')),
+            default='GRID',
+            )
+    rows = IntProperty(
+            name="Rows",
+            description="Number of lots along the y-axis",
+            min=1,
+            default=10,
+            )
+    cols = IntProperty(
+            name="Columns",
+            description="Number of lots along the x-axis",
+            min=1,
+            default=10,
+            )
+    lot_length = FloatProperty(
+            name="Lot Length",
+            description="Length of each lot (x-axis)",
+            min=4.0,
+            default=30.0,
+            )
+    lot_width = FloatProperty(
+            name="Lot Width",
+            description="Width of each lot (y-axis)",
+            min=4.0,
+            default=30.0,
+            )
+    street_width = FloatProperty(
+            name="Street Width",
+            description="Space between the lots",
+            min=0.0,
+            default=10.0,
+            )
+    length = FloatProperty(
+            name="Length",
+            description="Maximum length of each building",
+            min=4.0,
+            default=10.0,
+            )
+    width = FloatProperty(
+            name="Width",
+            description="Maximum width of each building",
+            min=4.0,
+            default=10.0,
+            )
+    floor_ceil_dist = FloatProperty(
+            name="Floor height",
+            description="Height of each floor",
+            min=1.0,
+            default=2.5,
+            )
+    floors = IntProperty(
+            name="Floors",
+            description="Number of floors",
+            min=1,
+            default=1,
+            )
+    structures = IntProperty(
+            name="Number of Structures",
+            description="The number of structures that make up each building",
+            min=1,
+            default=1,
+            )
+    floor_thickness = FloatProperty(
+            name="Floor Thickness",
+            description="How far apart each floor is from one another",
+            min=0.01,
+            default=0.3,
+            )
+    wall_thickness = FloatProperty(
+            name="Wall Thickness",
+            description="How thick the walls are",
+            min=0.01,
+            default=0.15,
+            )
+    roof_type = EnumProperty(
+            name="Roof Type",
+            description="What kind of roof to put on the buildings",
+            items=(('FLAT', 'Flat', 'A flat roof'),
+                   ('NONE', 'None', 'Just a flat plane to cover the top')),
+            default='FLAT',
+            )
+    roof_height = FloatProperty(
+            name="Roof Height",
+            description="How tall the roof is",
+            min=0.0,
+            default=0.3,
+            )
+    rseed = IntProperty(
+            name="Random Seed",
+            description="Seed of the district, each building is seeded with this and its lot number",
+            default = 0,
+            )
+    randomize_values = BoolProperty(
+            name="Randomize All",
+            description="Randomize the size, floors and structures of each building",
+            default=True
+            )
+    workers = IntProperty(
+            name="Workers",
+            description="How many Blender processes build the buildings at once",
+            min=1,
+            default=4,
+            )
+    link = BoolProperty(
+            name="Link",
+            description="Link the buildings from the worker files instead of appending them",
+            default=False
+            )
+    output_dir = StringProperty(
+            name="Output Folder",
+            description="Where the workers save their .blend files (a temporary folder if empty, which only works when appending)",
+            subtype='DIR_PATH',
+            default="",
+            )
+    
+    def draw(self, context):
+        layout = self.layout
+        
+        box = layout.box()
+        col = box.column()
+        col.label(text="Lots", icon="MESH_GRID")
+        col.prop(self, "lots")
+        if self.lots == 'GRID':
+            col.prop(self, "rows")
+            col.prop(self, "cols")
+            col.prop(self, "lot_length")
+            col.prop(self, "lot_width")
+            col.prop(self, "street_width")
+        
+        box = layout.box()
+        col = box.column()
+        col.label(text="Buildings", icon="MOD_BUILD")
+        col.prop(self, "length")
+        col.prop(self, "width")
+        col.prop(self, "floors")
+        col.prop(self, "floor_ceil_dist")
+        col.prop(self, "structures")
+        col.prop(self, "floor_thickness")
+        col.prop(self, "wall_thickness")
+        col.prop(self, "roof_type")
+        col.prop(self, "roof_height")
+        
+        box = layout.box()
+        col = box.column()
+        col.label(text="Randomization", icon="QUESTION")
+        col.prop(self, "randomize_values")
+        col.prop(self, "rseed")
+        
+        box = layout.box()
+        col = box.column()
+        col.label(text="Workers", icon="SCRIPT")
+        col.prop(self, "workers")
+        col.prop(self, "link")
+        col.prop(self, "output_dir")
+        
+    def execute(self, context):
+        
+        if self.lots == 'GRID':
+            lots = batch.lot_grid(self.rows, self.cols, self.lot_length, self.lot_width, self.street_width)
+        else:
+            #Sort by name, so the lot ids (and the buildings
+            #on them) don't depend on the selection order:
+            objs = sorted((o for o in context.selected_objects), key=lambda o: o.name)
+            lots = batch.lots_from_footprints([(o.location.x, o.location.y, o.dimensions.x, o.dimensions.y, o.rotation_euler.z) for o in objs])
+        
+        if not lots:
+            self.report({'ERROR'}, "No lots to build on")
+            return {'CANCELLED'}
+        
+        out_dir = bpy.path.abspath(self.output_dir) if self.output_dir else None
+        if self.link and out_dir is None:
+            self.report({'ERROR'}, "Linking needs an output folder that will stay around")
+            return {'CANCELLED'}
+        
+        #Without an output folder the workers save to a temp
+        #folder, which isn't needed anymore once everything
+        #in it has been appended:
+        temporary = out_dir is None
+        if temporary:
+            out_dir = tempfile.mkdtemp(prefix="district_")
+        
+        settings = {"length": self.length,
+                    "width": self.width,
+                    "floor_ceil_dist": self.floor_ceil_dist,
+                    "floors": self.floors,
+                    "structures": self.structures,
+                    "floor_thickness": self.floor_thickness,
+                    "wall_thickness": self.wall_thickness,
+                    "roof_type": self.roof_type,
+                    "roof_height": self.roof_height,
+                    "randomize_values": self.randomize_values,
+                    }
+        
+        try:
+            paths = batch.run_batch(lots, self.rseed, settings, workers=self.workers,
+                                    blender=bpy.app.binary_path, out_dir=out_dir)
+            objects = batch.merge_batch(context, paths, link=self.link)
+        except RuntimeError as err:
+            self.report({'ERROR'}, str(err))
+            return {'CANCELLED'}
+        finally:
+            if temporary:
+                shutil.rmtree(out_dir, ignore_errors=True)
+        
+        self.report({'INFO'}, "Added %d buildings" % len(objects))
         
         return {'FINISHED'}
 
 
 def menu_func(self, context):
     self.layout.operator(AddBuilding.bl_idname, icon='MOD_BUILD')
+    self.layout.operator(AddBuildingBatch.bl_idname, icon='MOD_BUILD')
 
 def register():
     bpy.utils.register_module(__name__)
+    bpy.types.INFO_MT_mesh_add.append(menu_func)
 
 def unregister():
     bpy.utils.unregister_module(__name__)
+    bpy.types.INFO_MT_mesh_add.remove(menu_func)
 
 if __name__ == "__main__":
     register()
\ No newline at end of file
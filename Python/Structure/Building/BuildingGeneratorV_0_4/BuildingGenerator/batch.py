@@ -0,0 +1,223 @@
+# License for this script is GNU GPL Version 3
+# The text for this license can be found here:
+# https://www.gnu.org/licenses/gpl-3.0.en.html
+
+#Batch mode for the building generator. The lots are
+#laid out and every building is rolled here (the main
+#values of all of them at once, by sampler.py), then the
+#buildings get split up between a pool of headless
+#Blender processes (batch_worker.py) that each save
+#their share to a .blend file. merge_batch() links or
+#appends those files back into the open scene.
+#
+#Only merge_batch() needs bpy, everything else can run
+#from a normal python shell to drive the workers.
+
+import os
+import json
+import random
+import hashlib
+import tempfile
+import subprocess
+
+from concurrent.futures import ThreadPoolExecutor
+
+from .sampler import sample_buildings
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+#The workers import this package (for mesher.py) from
+#the folder that it sits in, under its own name:
+STRUCTURE_DIR = os.path.dirname(PACKAGE_DIR)
+PACKAGE_NAME = os.path.basename(PACKAGE_DIR)
+
+WORKER = os.path.join(PACKAGE_DIR, "batch_worker.py")
+
+
+#Makes a rows x cols grid of lots, each lot_l by lot_w,
+#with streets of street_w between them. The grid is
+#centered on origin. Returns a list of lot dicts:
+def lot_grid(rows, cols, lot_l, lot_w, street_w=0.0, origin=(0.0, 0.0)):
+    lots = []
+    step_x = lot_l + street_w
+    step_y = lot_w + street_w
+    start_x = origin[0] - (((cols - 1) * step_x) / 2.0)
+    start_y = origin[1] - (((rows - 1) * step_y) / 2.0)
+    for r in range(rows):
+        for c in range(cols):
+            lots.append({"id": (r * cols) + c,
+                         "center": (start_x + (c * step_x), start_y + (r * step_y)),
+                         "length": lot_l,
+                         "width": lot_w,
+                         "rotation": 0.0,
+                         })
+    return lots
+
+
+#Turns a list of footprints into lots. A footprint is
+#(x, y, length, width) or (x, y, length, width, rotation)
+#where x and y are the center, and the lot id is its
+#position in the list:
+def lots_from_footprints(footprints):
+    lots = []
+    for i, fp in enumerate(footprints):
+        rot = fp[4] if len(fp) > 4 else 0.0
+        lots.append({"id": i,
+                     "center": (fp[0], fp[1]),
+                     "length": fp[2],
+                     "width": fp[3],
+                     "rotation": rot,
+                     })
+    return lots
+
+
+#The seed of one building only depends on the seed of
+#the district and the id of the lot it's on, so the
+#same lot always gets the same building, no matter how
+#the lots are split between the workers:
+def building_seed(rseed, lot_id):
+    key = ("%d:%d" % (rseed, lot_id)).encode("ascii")
+    return int(hashlib.sha256(key).hexdigest()[:16], 16)
+
+
+#Rolls the size, floors and structure count of every
+#lot in one go (see sampler.py). A building fills its
+#lot at most. Returns one dict of values per lot, or
+#None for each lot when nothing is randomized:
+def roll_parameters(lots, rseed, settings):
+    if not settings["randomize_values"]:
+        return [None] * len(lots)
+    values = sample_buildings([lot["id"] for lot in lots], rseed,
+                              length=(4.0, [max(4.0, lot["length"]) for lot in lots]),
+                              width=(4.0, [max(4.0, lot["width"]) for lot in lots]))
+    keys = sorted(values)
+    return [dict((k, values[k][i].item()) for k in keys) for i in range(len(lots))]
+
+
+#Rolls the structures that make up one building. Every
+#structure gets its own size and spot inside the
+#building bounds. settings holds the fixed values (see
+#AddBuildingBatch) and params the ones that were rolled
+#by roll_parameters, if any:
+def roll_building(lot, rseed, settings, params=None):
+    rng = random.Random(building_seed(rseed, lot["id"]))
+
+    length = min(settings["length"], lot["length"])
+    width = min(settings["width"], lot["width"])
+    fcd = settings["floor_ceil_dist"]
+    floors = settings["floors"]
+    count = settings["structures"]
+
+    if params is not None:
+        length = params["length"]
+        width = params["width"]
+        fcd = params["floor_ceil_dist"]
+        count = params["structures"]
+        floors = params["floors"]
+
+    structures = []
+    for i in range(count):
+        #The first structure is the main one and takes up
+        #the whole building, the rest are smaller wings:
+        if i == 0:
+            s_l, s_w, s_f = length, width, floors
+            off = (0.0, 0.0)
+        else:
+            s_l = round(max(4.0, length * rng.uniform(0.4, 1.0)), 2)
+            s_w = round(max(4.0, width * rng.uniform(0.4, 1.0)), 2)
+            s_f = rng.randint(1, floors)
+            off = (rng.uniform(-(length - s_l) / 2.0, (length - s_l) / 2.0),
+                   rng.uniform(-(width - s_w) / 2.0, (width - s_w) / 2.0))
+        structures.append({"length": s_l,
+                           "width": s_w,
+                           "floor_ceil_dist": fcd,
+                           "floors": s_f,
+                           "floor_thickness": settings["floor_thickness"],
+                           "wall_thickness": settings["wall_thickness"],
+                           "roof_height": settings["roof_height"],
+                           "roof_type": settings["roof_type"],
+                           "corners": [[0, 0.0, 'PERCENT']] * 4,
+                           "offset": off,
+                           })
+
+    return {"lot": lot["id"],
+            "name": "Building_%05d" % lot["id"],
+            "location": (lot["center"][0], lot["center"][1], 0.0),
+            "rotation": lot["rotation"],
+            "seed": building_seed(rseed, lot["id"]),
+            "structures": structures,
+            }
+
+
+#Splits the buildings into chunks, one per worker job.
+#Round robin keeps big and small lots spread out evenly:
+def split_jobs(buildings, workers):
+    workers = max(1, min(workers, len(buildings)))
+    return [buildings[i::workers] for i in range(workers)]
+
+
+def _run_worker(blender, job, out_dir, index, sys_path, timeout):
+    job_path = os.path.join(out_dir, "job_%03d.json" % index)
+    blend_path = os.path.join(out_dir, "district_%03d.blend" % index)
+    with open(job_path, "w") as f:
+        json.dump({"sys_path": sys_path, "package": PACKAGE_NAME, "buildings": job}, f)
+
+    cmd = [blender, "-b", "--factory-startup", "--python", WORKER, "--", job_path, blend_path]
+    proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, timeout=timeout)
+    if proc.returncode != 0 or not os.path.exists(blend_path):
+        log = proc.stdout.decode("utf-8", "replace")
+        raise RuntimeError("Batch worker %d failed:\n%s" % (index, log[-4000:]))
+    return blend_path
+
+
+#The workers need to find this package and the
+#generator_utils module, wherever they are installed:
+def worker_sys_path():
+    import generator_utils
+    modules_dir = os.path.dirname(os.path.dirname(os.path.abspath(generator_utils.__file__)))
+    return [STRUCTURE_DIR, modules_dir]
+
+
+#Rolls every building and builds them in a pool of
+#headless Blender processes, workers at a time.
+#Returns the list of .blend files that they saved,
+#which then go to merge_batch(). Without out_dir they
+#go to a new temp folder, which is the caller's to
+#remove after merging:
+def run_batch(lots, rseed, settings, workers=4, blender=None, out_dir=None, timeout=None):
+    if blender is None:
+        blender = os.environ.get("BLENDER", "blender")
+    if out_dir is None:
+        out_dir = tempfile.mkdtemp(prefix="district_")
+    if not os.path.isdir(out_dir):
+        os.makedirs(out_dir)
+
+    params = roll_parameters(lots, rseed, settings)
+    buildings = [roll_building(lot, rseed, settings, p) for lot, p in zip(lots, params)]
+    jobs = split_jobs(buildings, workers)
+    sys_path = worker_sys_path()
+
+    with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+        futures = [pool.submit(_run_worker, blender, job, out_dir, i, sys_path, timeout)
+                   for i, job in enumerate(jobs)]
+        return [f.result() for f in futures]
+
+
+#Brings the buildings saved by the workers into the
+#scene. link=True keeps them in their .blend files as
+#library data (which keeps the .blend for the district
+#small), otherwise they get appended. Returns the objects.
+def merge_batch(context, paths, link=False):
+    import bpy
+
+    scene = context.scene
+    objects = []
+    for path in paths:
+        with bpy.data.libraries.load(path, link=link) as (data_from, data_to):
+            data_to.objects = [name for name in data_from.objects if name.startswith("Building_")]
+        for obj in data_to.objects:
+            if obj is None:
+                continue
+            scene.objects.link(obj)
+            objects.append(obj)
+    return objects
@@ -0,0 +1,59 @@
+# License for this script is GNU GPL Version 3
+# The text for this license can be found here:
+# https://www.gnu.org/licenses/gpl-3.0.en.html
+
+#Runs inside a headless Blender, started by batch.py as:
+#blender -b --factory-startup --python batch_worker.py -- job.json out.blend
+#Builds every building in the job and writes them all
+#to out.blend, which gets linked/appended afterwards.
+#The buildings were already rolled, so this only makes
+#geometry and never touches a random number generator.
+
+import sys
+import json
+import importlib
+
+import bpy
+
+from mathutils import Euler
+
+
+#All the structures of a building come out as one mesh,
+#from the union of their footprints (see mesher.py):
+def build_building(building, mesher):
+    mesh = bpy.data.meshes.new(building["name"])
+    mesher.generate_building(building["structures"]).to_mesh(mesh)
+
+    obj = bpy.data.objects.new(building["name"], mesh)
+    obj.location = building["location"]
+    obj.rotation_euler = Euler((0.0, 0.0, building["rotation"]))
+    obj["lot"] = building["lot"]
+    obj["seed"] = str(building["seed"])
+    return obj
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:]
+    job_path, out_path = argv[0], argv[1]
+    with open(job_path) as f:
+        job = json.load(f)
+
+    for path in job["sys_path"]:
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    mesher = importlib.import_module(job["package"] + ".mesher")
+    objects = set()
+    for building in job["buildings"]:
+        objects.add(build_building(building, mesher))
+
+    #Only the buildings (and their meshes) get written:
+    bpy.data.libraries.write(out_path, objects, fake_user=True)
+
+
+try:
+    main()
+except Exception:
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
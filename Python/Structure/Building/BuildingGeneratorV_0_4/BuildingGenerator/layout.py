@@ -0,0 +1,118 @@
+# License for this script is GNU GPL Version 3
+# The text for this license can be found here:
+# https://www.gnu.org/licenses/gpl-3.0.en.html
+
+#Lays out the structures of one building on the ground.
+#Every structure is a footprint polygon (its box, with
+#the corners beveled like generate_structure bevels
+#them), and generator_utils.overlap finds which of them
+#run into each other or into objects already in the
+#scene, and where, without any booleans.
+
+import math
+
+import numpy as np
+
+from generator_utils import BoxIndex, find_overlaps, overlap_regions, object_bounds, rect_polygon
+
+#Same order as CORNERS in add_structure.py (lf, lr, rf, rr):
+CORNER_SIGNS = ((+1.0, +1.0), (+1.0, -1.0), (-1.0, +1.0), (-1.0, -1.0))
+
+#The corners going counter-clockwise from lr:
+_CCW = (1, 0, 2, 3)
+
+
+#How far a bevel cuts into the two edges of a corner,
+#for a corner of a length by width box. PERCENT is of
+#the edge, which ends at the middle of the side:
+def bevel_offsets(length, width, strength, bevel):
+    if bevel == 'PERCENT':
+        return (strength / 100.0) * (length / 2.0), (strength / 100.0) * (width / 2.0)
+    if bevel == 'WIDTH':
+        d = strength / math.sqrt(2.0)
+    elif bevel == 'DEPTH':
+        d = strength * math.sqrt(2.0)
+    else:
+        d = strength
+    return d, d
+
+
+#The footprint of a structure, counter-clockwise around
+#offset. corners is a list of (segments, strength, bevel
+#type) for the lf, lr, rf and rr corners. A beveled
+#corner becomes an arc of segments pieces, which is what
+#a profile of 0.5 makes on a square corner:
+def structure_footprint(length, width, corners=None, offset=(0.0, 0.0)):
+    a = length / 2.0
+    b = width / 2.0
+    points = []
+    for c in _CCW:
+        sx, sy = CORNER_SIGNS[c]
+        seg, strength, bevel = corners[c] if corners else (0, 0.0, 'OFFSET')
+        dx, dy = bevel_offsets(length, width, strength, bevel)
+        dx = min(dx, a)
+        dy = min(dy, b)
+        if seg <= 0 or dx <= 0.0 or dy <= 0.0:
+            points.append((sx * a, sy * b))
+            continue
+        angle = math.atan2(sy, sx)
+        phi = np.linspace(angle - (math.pi / 4.0), angle + (math.pi / 4.0), seg + 1)
+        arc = np.stack(((sx * (a - dx)) + (dx * np.cos(phi)), (sy * (b - dy)) + (dy * np.sin(phi))), axis=1)
+        points.extend(arc.tolist())
+
+    poly = np.array(points) + np.asarray(offset, np.float64)
+    #Drop repeated points, where two arcs meet:
+    keep = np.linalg.norm(poly - np.roll(poly, 1, axis=0), axis=1) > 1e-9
+    return poly[keep]
+
+
+#Turns footprints around z by angle and moves them to
+#location (x, y):
+def place_footprint(poly, location, angle):
+    c, s = math.cos(angle), math.sin(angle)
+    rot = np.array(((c, -s), (s, c)))
+    return np.asarray(poly, np.float64).dot(rot.T) + np.asarray(location[:2], np.float64)
+
+
+#The ground footprints of scene objects, as rectangles
+#from their world bounds. With z_range (bottom, top),
+#only objects that reach into that height are kept, so
+#a ground plane or terrain under the lot isn't counted:
+def object_footprints(objects, z_range=None):
+    lo, hi = object_bounds(objects)
+    if z_range is not None:
+        keep = (lo[:, 2] < z_range[1]) & (hi[:, 2] > z_range[0])
+        lo = lo[keep]
+        hi = hi[keep]
+    return [rect_polygon(l[:2], h[:2]) for l, h in zip(lo, hi)]
+
+
+#Places the structures of a building (as rolled by
+#batch.roll_building) at location, turned by angle.
+#The first structure is the main one and always stays.
+#Wings that would run into any of the obstacles (ground
+#polygons, like from object_footprints) are left out.
+#
+#Returns the structures that were kept, their world
+#footprints, and the overlaps between them as a list of
+#(i, j, region) from find_overlaps.
+def place_structures(structures, location, angle, obstacles=()):
+    footprints = [place_footprint(structure_footprint(s["length"], s["width"], s["corners"], s["offset"]), location, angle)
+                  for s in structures]
+
+    blocked = set()
+    obstacles = list(obstacles)
+    if obstacles and len(footprints) > 1:
+        o_lo = np.array([o.min(axis=0) for o in obstacles])
+        o_hi = np.array([o.max(axis=0) for o in obstacles])
+        lo = np.array([f.min(axis=0) for f in footprints[1:]])
+        hi = np.array([f.max(axis=0) for f in footprints[1:]])
+        #Only the candidates from the index get the exact test:
+        i, j = BoxIndex(o_lo, o_hi).query_many(lo, hi)
+        hits = overlap_regions(footprints[1:], obstacles, i, j)
+        blocked = set(a + 1 for a, b, region in hits)
+
+    kept = [i for i in range(len(structures)) if i not in blocked]
+    structures = [structures[i] for i in kept]
+    footprints = [footprints[i] for i in kept]
+    return structures, footprints, find_overlaps(footprints)
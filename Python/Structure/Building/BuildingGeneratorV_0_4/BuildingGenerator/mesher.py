@@ -0,0 +1,87 @@
+# License for this script is GNU GPL Version 3
+# The text for this license can be found here:
+# https://www.gnu.org/licenses/gpl-3.0.en.html
+
+#Builds one mesh for a whole building out of the union
+#of its structures' footprints, instead of building every
+#structure on its own and cutting them into each other.
+#
+#The building is split into bands, one for every floor
+#count that a structure has. Each band gets the outline
+#of the structures that reach it, extruded for its
+#floors: the exterior walls from the outer footprints,
+#the rooms from the footprints inset by the wall
+#thickness, and a roof over whatever isn't covered by
+#the band above. The structures are in the building's
+#own space here, the same as roll_building makes them.
+
+from generator_utils import MeshData, region_loops, extrude_loops, cap_loops
+
+from .layout import structure_footprint
+
+
+#The outer and inner (inset by the wall thickness)
+#footprints of a structure:
+def structure_footprints(s):
+    w = s["wall_thickness"]
+    outer = structure_footprint(s["length"], s["width"], s["corners"], s["offset"])
+    inner = structure_footprint(s["length"] - (2.0 * w), s["width"] - (2.0 * w), s["corners"], s["offset"])
+    return outer, inner
+
+
+#The roof on top of a band at height z. outer and inner
+#are the footprints of the band, above the outer ones
+#of the band over it (if any). A flat roof has a rim as
+#thick as the walls around it, 'NONE' is just a cap.
+#Returns the roof and how high it goes over z:
+def generate_roof(outer, inner, above, z, r_thick, roof):
+    if roof == 'NONE' or r_thick <= 0.0:
+        return cap_loops(region_loops(outer, above), z), 0.0
+
+    #The rim and the band above are extruded together, so
+    #where the rim runs into that band there's no wall:
+    rim = region_loops(outer, inner + above)
+    data = MeshData.join((cap_loops(region_loops(inner, above), z),
+                          extrude_loops(region_loops(outer, inner, keep=above), z, z + r_thick),
+                          cap_loops(rim, z + r_thick)))
+    return data, r_thick
+
+
+#The whole building as one MeshData. structures is the
+#list from roll_building (or place_structures), the
+#floor height, floor thickness and roof come from the
+#first one, which is the main structure:
+def generate_building(structures):
+    main = structures[0]
+    fcd = main["floor_ceil_dist"]
+    step = fcd + main["floor_thickness"]
+    r_thick = main["roof_height"]
+    footprints = [structure_footprints(s) for s in structures]
+    floors = [s["floors"] for s in structures]
+
+    parts = []
+    rise = 0.0
+    bottom = 0
+    for top in sorted(set(floors)):
+        outer = [fp[0] for fp, f in zip(footprints, floors) if f >= top]
+        inner = [fp[1] for fp, f in zip(footprints, floors) if f >= top]
+        above = [fp[0] for fp, f in zip(footprints, floors) if f > top]
+
+        #The roof of the band below already has the walls
+        #up to the top of its rim:
+        walls = region_loops(outer)
+        parts.append(extrude_loops(walls, (bottom * step) + rise, top * step))
+
+        #Every floor of the band has the same rooms, facing
+        #in, so they get made once and tiled upwards:
+        rooms = region_loops(inner)
+        room = MeshData.join((extrude_loops(rooms, 0.0, fcd).flip(),
+                              cap_loops(rooms, 0.0),
+                              cap_loops(rooms, fcd, up=False)))
+        parts.append(room.tile([(0.0, 0.0, f * step) for f in range(bottom, top)]))
+
+        roof, rise = generate_roof(outer, inner, above, top * step, r_thick, main["roof_type"])
+        parts.append(roof)
+        bottom = top
+
+    return MeshData.join(parts)
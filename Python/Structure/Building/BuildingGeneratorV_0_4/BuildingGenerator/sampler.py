@@ -0,0 +1,73 @@
+# License for this script is GNU GPL Version 3
+# The text for this license can be found here:
+# https://www.gnu.org/licenses/gpl-3.0.en.html
+
+#Rolls the random parameters of whole batches of
+#buildings at once, as numpy arrays. Every value comes
+#from a hash of the seed, the building's id and which
+#value it is, so a building always gets the same values
+#whatever else is in the batch and in whatever order
+#they are rolled. Nothing here touches the random module
+#or any other shared generator state.
+
+import numpy as np
+
+#Many buildings are only 1 floor, so a third of them
+#get 1 floor, a third 2, and the rest anything from 1
+#up to the most floors (0 here):
+FLOOR_BIAS = (1, 2, 0)
+
+#Which hash stream each value is drawn from:
+_STREAMS = {"length": 1, "width": 2, "floor_ceil_dist": 3, "structures": 4, "floor_bias": 5, "floors": 6}
+
+_MASK = (1 << 64) - 1
+
+
+#SplitMix64 over uint64 arrays (the overflow wraps):
+def _mix(x):
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+#Uniform values in [0, 1), one for every id:
+def hash_uniform(seed, ids, stream):
+    ids = np.asarray(ids, np.int64).astype(np.uint64)
+    with np.errstate(over='ignore'):
+        key = _mix(np.full(ids.shape, seed & _MASK, np.uint64))
+        key = _mix(key ^ ids)
+        key = _mix(key ^ np.uint64(stream))
+    #The top 53 bits, which is all a float64 can hold:
+    return (key >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+#Whole numbers from low to high (both included):
+def hash_randint(seed, ids, stream, low, high):
+    low = np.asarray(low, np.int64)
+    span = (np.asarray(high, np.int64) - low) + 1
+    return low + np.floor(hash_uniform(seed, ids, stream) * span).astype(np.int64)
+
+
+#Rolls the parameters of every building in ids. The
+#ranges can be single values or one per building (like
+#the size of each lot). Returns a dict of arrays with
+#the same keys as the operator properties:
+def sample_buildings(ids, seed, length=(4.0, 54.0), width=(4.0, 54.0), floor_ceil_dist=(2.5, 3.5),
+                     structures=(1, 6), max_floors=15):
+    ids = np.asarray(ids, np.int64).ravel()
+
+    def uniform(name, low_high):
+        low, high = (np.asarray(v, np.float64) for v in low_high)
+        u = hash_uniform(seed, ids, _STREAMS[name])
+        return np.round(low + ((high - low) * u), 2)
+
+    bias = np.asarray(FLOOR_BIAS, np.int64)[hash_randint(seed, ids, _STREAMS["floor_bias"], 0, len(FLOOR_BIAS) - 1)]
+    any_floors = hash_randint(seed, ids, _STREAMS["floors"], 1, max_floors)
+
+    return {"length": uniform("length", length),
+            "width": uniform("width", width),
+            "floor_ceil_dist": uniform("floor_ceil_dist", floor_ceil_dist),
+            "structures": hash_randint(seed, ids, _STREAMS["structures"], structures[0], structures[1]),
+            "floors": np.where(bias > 0, bias, any_floors),
+            }
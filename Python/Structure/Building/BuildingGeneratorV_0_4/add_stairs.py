@@ -11,9 +11,12 @@ bl_info = {
     "category": "Add Mesh"}
 
 import bpy
-import bmesh
 import math
 import mathutils
+import numpy as np
+
+from generator_utils import MeshData, add_mesh_object
+from generator_utils import COLLISION_SHAPES, ENGINES, MAX_HULL_VERTS, add_collisions
 
 from bpy.props import (
         BoolProperty,
@@ -24,12 +27,31 @@ from bpy.props import (
         EnumProperty,
         )
 
-#def add_steps(l, w, h, rot, x, y, b, steps, style, t, sn, sl, sw, o, self, context):
-    
+#Makes every step at once from the verts and faces of
+#the lowest one. Step i is that step moved back by
+#i * (l / steps) and up by i * (h / steps). If clamp_x
+#is given, verts that stick out behind it on the x-axis
+#get clamped to it, the same as the old loop did.
+#There's one step per position. The old loop duplicated
+#every face made so far on each pass, which stacked
+#about 2^(steps - 1) overlapping copies of the steps.
+def make_steps(verts, faces, l, h, steps, clamp_x=None):
+    i = np.arange(steps, dtype=np.float32)
+    offsets = np.zeros((steps, 3), np.float32)
+    offsets[:, 0] = i * (-l / steps)
+    offsets[:, 2] = i * (h / steps)
     
-            
-#def add_rotated_steps(l, w, h, rot, x, y, z, steps, style, st, sn, sl, sw, o, self, context):
-#    add_steps(l, w, h, rot, x, y, z, steps, style, st, sn, sl, sw, o, self, context)
+    stairs = MeshData.from_pydata(verts, faces).tile(offsets)
+    if clamp_x is not None:
+        np.maximum(stairs.co[:, 0], clamp_x, out=stairs.co[:, 0])
+    return stairs
+
+#Makes n copies of one beam, each one step_y further
+#along the y-axis than the one before it
+def make_beams(verts, faces, n, step_y):
+    offsets = np.zeros((n, 3), np.float32)
+    offsets[:, 1] = np.arange(n) * step_y
+    return MeshData.from_pydata(verts, faces).tile(offsets)
 
 class AddStairs(bpy.types.Operator):
     #Add stairs
@@ -129,6 +151,29 @@ class AddStairs(bpy.types.Operator):
             min=0.0,
             default=0.025,
             )
+    col_mesh = EnumProperty(
+            name="Collision Mesh",
+            description="Collision mesh to generate for the object",
+            items=COLLISION_SHAPES,
+            default='NONE',
+            )
+    col_verts = IntProperty(
+            name="Vertex Limit",
+            description="Most verts a convex hull collision mesh can have",
+            min=4,
+            default=MAX_HULL_VERTS,
+            )
+    engine_type = EnumProperty(
+            name="Game Engine",
+            description="Which engine this will be exported to (Unity if unsure)",
+            items=ENGINES,
+            default='UNITY',
+            )
+    vis = BoolProperty(
+            name="Hide Collision",
+            description="Toggles the visibility of the collision mesh",
+            default=True,
+            )
     location = FloatVectorProperty(
             name="Location",
             subtype='TRANSLATION',
@@ -176,7 +221,15 @@ class AddStairs(bpy.types.Operator):
             col.prop(self, "platforml")
             col.prop(self, "platformt")
             col.prop(self, "connector_thick")
-    
+        
+        box = layout.box()
+        col = box.column()
+        col.label(text="Collision", icon="MOD_PHYSICS")
+        col.prop(self, "col_mesh")
+        col.prop(self, "col_verts")
+        col.prop(self, "engine_type")
+        col.prop(self, "vis")
+
     def execute(self, context):
         #rename the variables to something easier:
         l = self.length
@@ -205,6 +258,8 @@ class AddStairs(bpy.types.Operator):
         if style == 'BROT' or style == 'TROT':
             h /= 2.0
         
+        rot_z = mathutils.Matrix.Rotation(math.radians(rot), 4, 'Z')
+        
         #Box stairs
         if style == 'BOX':
         
@@ -227,54 +282,16 @@ class AddStairs(bpy.types.Operator):
                      (2, 6, 5, 1),
                     ]
             
-            #Create the staircase
-            mesh_stairs = bpy.data.meshes.new("Stairs")
-            stairs_obj = bpy.data.objects.new("Stairs_Obj", mesh_stairs)
-
-            scene = bpy.context.scene
-            scene.objects.link(stairs_obj)
-
-            bm_stairs = bmesh.new()
+            #The back-most verts stick out too far,
+            #so they get clamped on the x-axis to (-l / 2.0)
+            stairs = make_steps(verts, faces, l, h, steps, clamp_x=(-l / 2.0))
             
-            for v_co in verts:
-                bm_stairs.verts.new(v_co)
-
-            bm_stairs.verts.ensure_lookup_table()
-            for f_idx in faces:
-                bm_stairs.faces.new([bm_stairs.verts[i] for i in f_idx])
-            
-            #Duplicate the first step till all steps are made
-            #Copy the lowest step and duplicate it for each step
-            bm_stairs.faces.ensure_lookup_table()
-            bm_stairs.verts.ensure_lookup_table()
-            
-            g = bm_stairs.faces
-            step_count = 1
-            while step_count < steps:
-                dupl = bmesh.ops.duplicate(bm_stairs, geom=g)
-                g_dupl = dupl["geom"]
-                new_verts = [e for e in g_dupl if isinstance(e, bmesh.types.BMVert)]
-                del g_dupl
-                bmesh.ops.translate(bm_stairs, verts=new_verts, vec=((-l / steps), 0.0, (h / steps)))
-                step_count += 1
+            #Shift along the x and y axis, then rotate
+            #by rot on the z axis around (x, y, b):
+            mat = mathutils.Matrix.Translation((x, y, b)) * rot_z * mathutils.Matrix.Translation((0.0, 0.0, -b))
+            stairs.transform(mat)
             
-            #The back-most verts stick out too far,
-            #clamp them on the x-axis to (-l / 2.0)
-            #also, shift all verts on x and y axis.
-            for v in bm_stairs.verts:
-                if v.co.x < (-l / 2.0):
-                    v.co.x = (-l / 2.0)
-                #Now shift along the x and y axis:
-                v.co.x += x
-                v.co.y += y
-            
-            #rotate the bmesh by rot on z axis:
-            bmesh.ops.rotate(bm_stairs, verts=bm_stairs.verts, cent=(x, y, b), matrix=mathutils.Matrix.Rotation(math.radians(rot), 3, 'Z'))
-            
-            #Finish up, and it's done!
-            bm_stairs.to_mesh(mesh_stairs)
-            mesh_stairs.update()
-            bm_stairs.free()
+            stairs_obj = add_mesh_object(context, stairs, "Stairs_Obj")
         
         #Thin stairs:
         elif style == 'THIN':
@@ -297,47 +314,11 @@ class AddStairs(bpy.types.Operator):
                      (7, 3, 0, 4),
                     ]
             
-            #Create the staircase
-            mesh_stairs = bpy.data.meshes.new("Stairs")
-            stairs_obj = bpy.data.objects.new("Stairs_Obj", mesh_stairs)
-
-            scene = bpy.context.scene
-            scene.objects.link(stairs_obj)
-
-            bm_stairs = bmesh.new()
-            
-            for v_co in verts:
-                bm_stairs.verts.new(v_co)
-
-            bm_stairs.verts.ensure_lookup_table()
-            for f_idx in faces:
-                bm_stairs.faces.new([bm_stairs.verts[i] for i in f_idx])
-            
-            #Duplicate the first step till all steps are made
-            #Copy the lowest step and duplicate it for each step
-            bm_stairs.faces.ensure_lookup_table()
-            bm_stairs.verts.ensure_lookup_table()
-            
-            g = bm_stairs.faces
-            step_count = 1
-            while step_count < steps:
-                dupl = bmesh.ops.duplicate(bm_stairs, geom=g)
-                g_dupl = dupl["geom"]
-                new_verts = [e for e in g_dupl if isinstance(e, bmesh.types.BMVert)]
-                del g_dupl
-                bmesh.ops.translate(bm_stairs, verts=new_verts, vec=((-l / steps), 0.0, (h / steps)))
-                step_count += 1
+            parts = [make_steps(verts, faces, l, h, steps)]
             
             #Add the support beam(s), if any
             if sn > 0:
                 
-                mesh_supports = bpy.data.meshes.new("Supports")
-                supports_obj = bpy.data.objects.new("Supports_Obj", mesh_supports)
-
-                scene = bpy.context.scene
-                scene.objects.link(supports_obj)
-                bm_supports = bmesh.new()
-                
                 verts = [(((+l / 2.0) + o), ((w / 2.0) - (w / (sn * 2.0)) - (sw / 2.0)), b),
                          (((+l / 2.0) + o), ((w / 2.0) - (w / (sn * 2.0)) + (sw / 2.0)), b),
                          (((+l / 2.0) - sl + o), ((w / 2.0) - (w / (sn * 2.0)) - (sw / 2.0)), b),
@@ -354,59 +335,17 @@ class AddStairs(bpy.types.Operator):
                          (6, 7, 3, 2),
                         ]
                 
-                for v_co in verts:
-                    bm_supports.verts.new(v_co)
-
-                bm_supports.verts.ensure_lookup_table()
-                for f_idx in faces:
-                    bm_supports.faces.new([bm_supports.verts[i] for i in f_idx])
-                    
-                #Duplicate the mesh for each support
-                beams = 1
-                g = bm_supports.faces
-                while beams < (sn):
-                    dupl = bmesh.ops.duplicate(bm_supports, geom=g)
-                    g_dupl = dupl["geom"]
-                    new_verts = [e for e in g_dupl if isinstance(e, bmesh.types.BMVert)]
-                    del g_dupl
-                    bmesh.ops.translate(bm_supports, verts=new_verts, vec=(0.0, (-w / sn), 0.0))
-                    beams += 1
-                
-                #Join bm_supports into bm_stairs
-                bm_supports.to_mesh(mesh_supports)
-                mesh_supports.update()
-                bm_stairs.to_mesh(mesh_stairs)
-                mesh_stairs.update()
-                bm_supports.free()
-                bm_stairs.free()
-                
-                bpy.ops.object.select_all(action='DESELECT')
-                supports_obj.select = True
-                stairs_obj.select = True
-                bpy.context.scene.objects.active = stairs_obj
-                bpy.ops.object.join()
-                
-                #Bring it back to edit mode to finish moving/rotation
-                bpy.ops.object.mode_set(mode='EDIT')
-                bm_stairs = bmesh.from_edit_mesh(mesh_stairs)
-                
+                #One beam for each support:
+                parts.append(make_beams(verts, faces, sn, (-w / sn)))
             
-            #Shift all verts on x and y axis.
-            for v in bm_stairs.verts:
-                v.co.x += x
-                v.co.y += y
+            stairs = MeshData.join(parts)
             
-            #rotate the bmesh by rot on z axis:
-            bmesh.ops.rotate(bm_stairs, verts=bm_stairs.verts, cent=(x, y, b), matrix=mathutils.Matrix.Rotation(math.radians(rot), 3, 'Z'))
+            #Shift along the x and y axis, then rotate
+            #by rot on the z axis around (x, y, b):
+            mat = mathutils.Matrix.Translation((x, y, b)) * rot_z * mathutils.Matrix.Translation((0.0, 0.0, -b))
+            stairs.transform(mat)
             
-            #Finish up, and it's done!
-            if sn > 0:
-                bmesh.update_edit_mesh(mesh_stairs)
-                bpy.ops.object.mode_set(mode='OBJECT')
-            else:
-                bm_stairs.to_mesh(mesh_stairs)
-                mesh_stairs.update()
-                bm_stairs.free()
+            stairs_obj = add_mesh_object(context, stairs, "Stairs_Obj")
         
         #Box-Rotated stairs:
         if style == 'BROT':
@@ -430,48 +369,9 @@ class AddStairs(bpy.types.Operator):
                      (2, 6, 5, 1),
                     ]
             
-            #Create the lower-stairs
-            mesh_stairs1 = bpy.data.meshes.new("Stairs1")
-            stairs1_obj = bpy.data.objects.new("Stairs1_Obj", mesh_stairs1)
-
-            scene = bpy.context.scene
-            scene.objects.link(stairs1_obj)
-
-            bm_stairs1 = bmesh.new()
-            
-            for v_co in verts:
-                bm_stairs1.verts.new(v_co)
-
-            bm_stairs1.verts.ensure_lookup_table()
-            for f_idx in faces:
-                bm_stairs1.faces.new([bm_stairs1.verts[i] for i in f_idx])
-            
-            #Duplicate the first step till all steps are made
-            #Copy the lowest step and duplicate it for each step
-            bm_stairs1.faces.ensure_lookup_table()
-            bm_stairs1.verts.ensure_lookup_table()
-            
-            g = bm_stairs1.faces
-            step_count = 1
-            while step_count < steps:
-                dupl = bmesh.ops.duplicate(bm_stairs1, geom=g)
-                g_dupl = dupl["geom"]
-                new_verts = [e for e in g_dupl if isinstance(e, bmesh.types.BMVert)]
-                del g_dupl
-                bmesh.ops.translate(bm_stairs1, verts=new_verts, vec=((-l / steps), 0.0, (h / steps)))
-                step_count += 1
-            
-            #The back-most verts stick out too far,
-            #clamp them on the x-axis to (-l / 2.0)
-            #also, shift all verts on x and y axis.
-            for v in bm_stairs1.verts:
-                if v.co.x < 0.0:
-                    v.co.x = 0.0
-            
-            #Finish up, and it's done!
-            bm_stairs1.to_mesh(mesh_stairs1)
-            mesh_stairs1.update()
-            bm_stairs1.free()
+            #The lower-stairs, with the back-most
+            #verts clamped on the x-axis to 0.0
+            stairs1 = make_steps(verts, faces, l, h, steps, clamp_x=0.0)
             
             #Make the upper-stairs now
             #These additional stairs need to begin
@@ -497,54 +397,13 @@ class AddStairs(bpy.types.Operator):
                      (1, 5, 6, 2),
                     ]
             
-            #Create the staircase
-            mesh_stairs2 = bpy.data.meshes.new("Stairs2")
-            stairs2_obj = bpy.data.objects.new("Stairs2_Obj", mesh_stairs2)
-
-            scene = bpy.context.scene
-            scene.objects.link(stairs2_obj)
-
-            bm_stairs2 = bmesh.new()
-            
-            for v_co in verts:
-                bm_stairs2.verts.new(v_co)
-
-            bm_stairs2.verts.ensure_lookup_table()
-            for f_idx in faces:
-                bm_stairs2.faces.new([bm_stairs2.verts[i] for i in f_idx])
-            
-            #Duplicate the first step till all steps are made
-            #Copy the lowest step and duplicate it for each step
-            bm_stairs2.faces.ensure_lookup_table()
-            bm_stairs2.verts.ensure_lookup_table()
-            
-            g = bm_stairs2.faces
-            step_count = 1
-            while step_count < steps:
-                dupl = bmesh.ops.duplicate(bm_stairs2, geom=g)
-                g_dupl = dupl["geom"]
-                new_verts = [e for e in g_dupl if isinstance(e, bmesh.types.BMVert)]
-                del g_dupl
-                bmesh.ops.translate(bm_stairs2, verts=new_verts, vec=((-l / steps), 0.0, (h / steps)))
-                step_count += 1
-            
-            #The back-most verts stick out too far,
-            #clamp them on the x-axis to (-l / 2.0)
-            #also, shift all verts on x and y axis.
-            for v in bm_stairs2.verts:
-                if v.co.x < 0.0:
-                    v.co.x = 0.0
+            stairs2 = make_steps(verts, faces, l, h, steps, clamp_x=0.0)
             
             #Center of the rotation:
-            rcent = ((l / 2.0), ((-pw / 2.0) + (w / 2.0)), b)
-            #rotate the bmesh by 180 deg. on z axis:
-            bmesh.ops.rotate(bm_stairs2, verts=bm_stairs2.verts, cent=rcent, matrix=mathutils.Matrix.Rotation(math.radians(180), 3, 'Z'))
-            
-            #Finish up, and it's done!
-            bm_stairs2.to_mesh(mesh_stairs2)
-            mesh_stairs2.update()
-            bm_stairs2.free()
-            
+            rcent = mathutils.Vector(((l / 2.0), ((-pw / 2.0) + (w / 2.0)), b))
+            #rotate the upper-stairs by 180 deg. on z axis:
+            mat = mathutils.Matrix.Translation(rcent) * mathutils.Matrix.Rotation(math.radians(180), 4, 'Z') * mathutils.Matrix.Translation(-rcent)
+            stairs2.transform(mat)
             
             #Now add the platform:
             
@@ -576,45 +435,13 @@ class AddStairs(bpy.types.Operator):
                      (7, 6, 8, 9),
                     ]
             
-            #Create the staircase
-            mesh_platform = bpy.data.meshes.new("Platform")
-            platform_obj = bpy.data.objects.new("Platform_Obj", mesh_platform)
-
-            scene = bpy.context.scene
-            scene.objects.link(platform_obj)
-
-            bm_platform = bmesh.new()
-            
-            for v_co in verts:
-                bm_platform.verts.new(v_co)
-
-            bm_platform.verts.ensure_lookup_table()
-            for f_idx in faces:
-                bm_platform.faces.new([bm_platform.verts[i] for i in f_idx])
-            
-            #Finish up, and this one is done!
-            bm_platform.to_mesh(mesh_platform)
-            mesh_platform.update()
-            bm_platform.free()
+            platform = MeshData.from_pydata(verts, faces)
             
             #Join them all, then move them and rotate them by x, y, and rot
-            bpy.ops.object.select_all(action='DESELECT')
-            platform_obj.select = True
-            stairs1_obj.select = True
-            stairs2_obj.select = True
-            bpy.context.scene.objects.active = stairs1_obj
-            bpy.ops.object.join()
-            stairs1_obj.name = "stairs"
-            
-            #Rotate, move and apply transformations:
-            stairs1_obj.rotation_euler = (0, 0, math.radians(rot))
-            stairs1_obj.location = (x, y, b)
-            bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
-            
-            
-            
-            
+            stairs = MeshData.join((stairs1, platform, stairs2))
+            stairs.transform(mathutils.Matrix.Translation((x, y, b)) * rot_z)
             
+            stairs_obj = add_mesh_object(context, stairs, "stairs")
             
         #Thin-rotated stairs:
         elif style == 'TROT':
@@ -637,47 +464,11 @@ class AddStairs(bpy.types.Operator):
                      (7, 3, 0, 4),
                     ]
             
-            #Create the staircase
-            mesh_stairs = bpy.data.meshes.new("Stairs")
-            stairs_obj = bpy.data.objects.new("Stairs_Obj", mesh_stairs)
-
-            scene = bpy.context.scene
-            scene.objects.link(stairs_obj)
-
-            bm_stairs = bmesh.new()
-            
-            for v_co in verts:
-                bm_stairs.verts.new(v_co)
-
-            bm_stairs.verts.ensure_lookup_table()
-            for f_idx in faces:
-                bm_stairs.faces.new([bm_stairs.verts[i] for i in f_idx])
-            
-            #Duplicate the first step till all steps are made
-            #Copy the lowest step and duplicate it for each step
-            bm_stairs.faces.ensure_lookup_table()
-            bm_stairs.verts.ensure_lookup_table()
-            
-            g = bm_stairs.faces
-            step_count = 1
-            while step_count < steps:
-                dupl = bmesh.ops.duplicate(bm_stairs, geom=g)
-                g_dupl = dupl["geom"]
-                new_verts = [e for e in g_dupl if isinstance(e, bmesh.types.BMVert)]
-                del g_dupl
-                bmesh.ops.translate(bm_stairs, verts=new_verts, vec=((-l / steps), 0.0, (h / steps)))
-                step_count += 1
+            parts = [make_steps(verts, faces, l, h, steps)]
             
             #Add the support beam(s), if any
             if sn > 0:
                 
-                mesh_supports = bpy.data.meshes.new("Supports")
-                supports_obj = bpy.data.objects.new("Supports_Obj", mesh_supports)
-
-                scene = bpy.context.scene
-                scene.objects.link(supports_obj)
-                bm_supports = bmesh.new()
-                
                 verts = [((l + o), ((pw / 2.0) - (w / (sn * 2.0)) - (sw / 2.0)), b),
                          ((l + o), ((pw / 2.0) - (w / (sn * 2.0)) + (sw / 2.0)), b),
                          ((l - sl + o), ((pw / 2.0) - (w / (sn * 2.0)) - (sw / 2.0)), b),
@@ -694,78 +485,15 @@ class AddStairs(bpy.types.Operator):
                          (6, 7, 3, 2),
                         ]
                 
-                for v_co in verts:
-                    bm_supports.verts.new(v_co)
-
-                bm_supports.verts.ensure_lookup_table()
-                for f_idx in faces:
-                    bm_supports.faces.new([bm_supports.verts[i] for i in f_idx])
-                    
-                #Duplicate the mesh for each support
-                beams = 1
-                g = bm_supports.faces
-                while beams < (sn):
-                    dupl = bmesh.ops.duplicate(bm_supports, geom=g)
-                    g_dupl = dupl["geom"]
-                    new_verts = [e for e in g_dupl if isinstance(e, bmesh.types.BMVert)]
-                    del g_dupl
-                    bmesh.ops.translate(bm_supports, verts=new_verts, vec=(0.0, (-w / sn), 0.0))
-                    beams += 1
-                
-                #Join bm_supports into bm_stairs
-                bm_supports.to_mesh(mesh_supports)
-                mesh_supports.update()
-                bm_stairs.to_mesh(mesh_stairs)
-                mesh_stairs.update()
-                bm_supports.free()
-                bm_stairs.free()
-                
-                bpy.ops.object.select_all(action='DESELECT')
-                supports_obj.select = True
-                stairs_obj.select = True
-                bpy.context.scene.objects.active = stairs_obj
-                bpy.ops.object.join()
-                
-                #Bring it back to edit mode to finish moving/rotation
-                bpy.ops.object.mode_set(mode='EDIT')
-                bm_stairs = bmesh.from_edit_mesh(mesh_stairs)
-                
-            
-            #rotate the bmesh by rot on z axis:
-            #bmesh.ops.rotate(bm_stairs, verts=bm_stairs.verts, cent=(x, y, b), matrix=mathutils.Matrix.Rotation(math.radians(rot), 3, 'Z'))
-            
-            #Finish up, and it's done!
-            if sn > 0:
-                bmesh.update_edit_mesh(mesh_stairs)
-                bpy.ops.object.mode_set(mode='OBJECT')
-            else:
-                bm_stairs.to_mesh(mesh_stairs)
-                mesh_stairs.update()
-                bm_stairs.free()
-            
-            #Make the upper-stairs:
-            mesh_stairs2 = mesh_stairs.copy()
-            stairs2_obj = bpy.data.objects.new("Stairs2_Obj", mesh_stairs2)
-
-            scene = bpy.context.scene
-            scene.objects.link(stairs2_obj)
-            
-            bpy.ops.object.select_all(action='DESELECT')
-            stairs2_obj.select = True
-            bpy.context.scene.objects.active = stairs2_obj
+                parts.append(make_beams(verts, faces, sn, (-w / sn)))
             
-            bpy.ops.object.mode_set(mode='EDIT')
-            bm_stairs2 = bmesh.from_edit_mesh(mesh_stairs2)
-            
-            #Rotate it 180 deg:
-            bmesh.ops.rotate(bm_stairs2, verts=bm_stairs2.verts, cent=(x, y, b), matrix=mathutils.Matrix.Rotation(math.radians(180), 3, 'Z'))
-            
-            #Move it back by (l, 0.0, h) amount:
-            bmesh.ops.translate(bm_stairs2, verts=bm_stairs2.verts, vec=(l, 0.0, h))
-            
-            bmesh.update_edit_mesh(mesh_stairs2)
-            bpy.ops.object.mode_set(mode='OBJECT')
+            stairs = MeshData.join(parts)
             
+            #Make the upper-stairs, a copy of the lower ones
+            #rotated 180 deg and moved back by (l, 0.0, h):
+            cent = mathutils.Vector((x, y, b))
+            mat = mathutils.Matrix.Translation((l, 0.0, h)) * mathutils.Matrix.Translation(cent) * mathutils.Matrix.Rotation(math.radians(180), 4, 'Z') * mathutils.Matrix.Translation(-cent)
+            stairs2 = stairs.copy().transform(mat)
             
             #Add the platform:
             verts = [(0.0, (pw / 2.0), h),
@@ -785,38 +513,13 @@ class AddStairs(bpy.types.Operator):
                      (3, 7, 6, 2),
                      (7, 3, 0, 4),
                     ]
-                    
-            #Create the staircase
-            mesh_platform = bpy.data.meshes.new("Platform")
-            platform_obj = bpy.data.objects.new("Platform_Obj", mesh_platform)
-
-            scene = bpy.context.scene
-            scene.objects.link(platform_obj)
-
-            bm_platform = bmesh.new()
-            
-            for v_co in verts:
-                bm_platform.verts.new(v_co)
-
-            bm_platform.verts.ensure_lookup_table()
-            for f_idx in faces:
-                bm_platform.faces.new([bm_platform.verts[i] for i in f_idx])
             
-            bm_platform.to_mesh(mesh_platform)
-            mesh_platform.update()
-            bm_platform.free()
+            parts = [stairs, stairs2, MeshData.from_pydata(verts, faces)]
             
             #Make the connectors that join
             #the upper stairs and platform
             if sn > 0:
                 
-                mesh_connector = bpy.data.meshes.new("Connector")
-                connector_obj = bpy.data.objects.new("Connector_Obj", mesh_connector)
-
-                scene = bpy.context.scene
-                scene.objects.link(connector_obj)
-                bm_connector = bmesh.new()
-                
                 verts = [(0.0, -((pw / 2.0) - (w / (sn * 2.0)) - (sw / 2.0)), (b + h)),
                          (0.0, -((pw / 2.0) - (w / (sn * 2.0)) + (sw / 2.0)), (b + h)),
                          (sl, -((pw / 2.0) - (w / (sn * 2.0)) - (sw / 2.0)), (b + h)),
@@ -840,45 +543,17 @@ class AddStairs(bpy.types.Operator):
                          (5, 7, 3, 1),
                         ]
                 
-                for v_co in verts:
-                    bm_connector.verts.new(v_co)
-
-                bm_connector.verts.ensure_lookup_table()
-                for f_idx in faces:
-                    bm_connector.faces.new([bm_connector.verts[i] for i in f_idx])
-                    
-                #Duplicate the mesh for each support
-                beams = 1
-                g = bm_connector.faces
-                while beams < (sn):
-                    dupl = bmesh.ops.duplicate(bm_connector, geom=g)
-                    g_dupl = dupl["geom"]
-                    new_verts = [e for e in g_dupl if isinstance(e, bmesh.types.BMVert)]
-                    del g_dupl
-                    bmesh.ops.translate(bm_connector, verts=new_verts, vec=(0.0, (w / sn), 0.0))
-                    beams += 1
-                
-                #Cleaning up and finalizing:
-                bm_connector.to_mesh(mesh_connector)
-                mesh_connector.update()
-                bm_connector.free()
-            
-            #Join them all:
-            bpy.ops.object.select_all(action='DESELECT')
-            stairs_obj.select = True
-            stairs2_obj.select = True
-            if sn > 0:
-                connector_obj.select = True
-            platform_obj.select = True
-            bpy.context.scene.objects.active = stairs_obj
-            bpy.ops.object.join()
-            stairs_obj.name = "stairs"
+                #One connector for each support:
+                parts.append(make_beams(verts, faces, sn, (w / sn)))
             
-            #Move, rotate, and apply transformations:
-            stairs_obj.rotation_euler = (0, 0, math.radians(rot))
-            stairs_obj.location = (x, y, b)
-            bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
+            #Join them all, then move and rotate them:
+            stairs = MeshData.join(parts)
+            stairs.transform(mathutils.Matrix.Translation((x, y, b)) * rot_z)
             
+            stairs_obj = add_mesh_object(context, stairs, "stairs")
+        
+        add_collisions(context, [stairs_obj], self.col_mesh, self.engine_type, self.vis, self.col_verts)
+        
         return {'FINISHED'}
 
 
@@ -11,7 +11,10 @@ bl_info = {
     "category": "Add Mesh"}
 
 import bpy
-import bmesh
+import numpy as np
+
+from mathutils import Matrix, Euler
+from generator_utils import MeshData
 
 from bpy.props import (
         BoolProperty,
@@ -22,6 +25,16 @@ from bpy.props import (
         EnumProperty,
         )
 
+#Offsets of every window in an x_count by z_count grid,
+#in the same order the two ARRAY modifiers used to make
+#them (along x first, then each row going up along z):
+def grid_offsets(x_count, z_count, x_step, z_step):
+    offsets = np.zeros((z_count, x_count, 3), np.float32)
+    offsets[:, :, 0] = np.arange(x_count) * x_step
+    offsets[:, :, 2] = (np.arange(z_count) * z_step)[:, None]
+    return offsets.reshape(-1, 3)
+
+
 class AddWindows(bpy.types.Operator):
     """Add an array of windows to a mesh"""
     bl_idname = "mesh.windows_add"
@@ -115,14 +128,13 @@ class AddWindows(bpy.types.Operator):
         loc = self.location
         rot = self.rotation
         
-        #Make the window object
-        mesh1 = bpy.data.meshes.new("windows")
-        windows_obj = bpy.data.objects.new("Windows_Obj", mesh1)
-
-        scene = bpy.context.scene
-        scene.objects.link(windows_obj)
-
-        bm1 = bmesh.new()
+        #Location and rotation get baked into the verts,
+        #so both objects end up at origin like they did
+        #after transform_apply:
+        matrix = Matrix.Translation(loc) * Euler(rot).to_matrix().to_4x4()
+        offsets = grid_offsets(x_win, y_win, x_shift + l, y_shift + h)
+        
+        #Make the window frames
         verts = [(-(l / 2.0), +(w / 2.0), +(h / 2.0)),
                  (-((l / 2.0) - t), +(w / 2.0), +((h / 2.0) - t)),
                  (+((l / 2.0) - t), +(w / 2.0), +((h / 2.0) - t)),
@@ -160,40 +172,12 @@ class AddWindows(bpy.types.Operator):
                  (5, 6, 14, 13),
                 ]
         
-        for v_co in verts:
-            bm1.verts.new(v_co)
-
-        bm1.verts.ensure_lookup_table()
-        for f_idx in faces:
-            bm1.faces.new([bm1.verts[i] for i in f_idx])
-        
-        bm1.to_mesh(mesh1)
-        mesh1.update()
-        
-        #Apply array modifier twice on the window mesh to make a grid of windows
-        x_array = bpy.data.objects[windows_obj.name].modifiers.new(name='x_window_array', type='ARRAY')
-        x_array.count = x_win
-        x_array.use_relative_offset = False
-        x_array.use_constant_offset = True
-        x_array.constant_offset_displace = (x_shift + l, 0.0, 0.0)
-        
-        y_array = bpy.data.objects[windows_obj.name].modifiers.new(name='y_window_array', type='ARRAY')
-        y_array.count = y_win
-        y_array.use_relative_offset = False
-        y_array.use_constant_offset = True
-        y_array.constant_offset_displace = (0.0, 0.0, y_shift + h)
+        #One frame for every spot in the grid, all at once:
+        windows = MeshData.from_pydata(verts, faces).tile(offsets).transform(matrix)
         
         #Now make the boolean cutout boxes
         #These boxes are used to cut holes
         #in the wall where the windows fit
-        mesh2 = bpy.data.meshes.new("window_boolean")
-        window_boolean_obj = bpy.data.objects.new("Window_Boolean_Obj", mesh2)
-
-        scene = bpy.context.scene
-        scene.objects.link(window_boolean_obj)
-
-        bm2 = bmesh.new()
-        
         verts = [(+(l / 2.0), +w / 2.0, -(h / 2.0)),
                  (+(l / 2.0), -w / 2.0, -(h / 2.0)),
                  (-(l / 2.0), -w / 2.0, -(h / 2.0)),
@@ -212,50 +196,23 @@ class AddWindows(bpy.types.Operator):
                  (4, 0, 3, 7),
                 ]
         
-        for v_co in verts:
-            bm2.verts.new(v_co)
-
-        bm2.verts.ensure_lookup_table()
-        for f_idx in faces:
-            bm2.faces.new([bm2.verts[i] for i in f_idx])
-        
-        bm2.to_mesh(mesh2)
-        mesh2.update()
+        cutouts = MeshData.from_pydata(verts, faces).tile(offsets).transform(matrix)
         
-        #Apply array modifier twice to make a grid of window cutouts
-        x_array2 = bpy.data.objects[window_boolean_obj.name].modifiers.new(name='x_window_array2', type='ARRAY')
-        x_array2.count = x_win
-        x_array2.use_relative_offset = False
-        x_array2.use_constant_offset = True
-        x_array2.constant_offset_displace = (x_shift + l, 0.0, 0.0)
+        scene = context.scene
         
-        y_array2 = bpy.data.objects[window_boolean_obj.name].modifiers.new(name='y_window_array2', type='ARRAY')
-        y_array2.count = y_win
-        y_array2.use_relative_offset = False
-        y_array2.use_constant_offset = True
-        y_array2.constant_offset_displace = (0.0, 0.0, y_shift + h)
+        mesh1 = bpy.data.meshes.new("windows")
+        windows.to_mesh(mesh1)
+        windows_obj = bpy.data.objects.new("Windows_Obj", mesh1)
+        scene.objects.link(windows_obj)
         
-        #Transform both objects (translate, rotate)
-        windows_obj.location = loc
-        windows_obj.rotation_euler = rot
-        window_boolean_obj.location = loc
-        window_boolean_obj.rotation_euler = rot
+        mesh2 = bpy.data.meshes.new("window_boolean")
+        cutouts.to_mesh(mesh2)
+        window_boolean_obj = bpy.data.objects.new("Window_Boolean_Obj", mesh2)
+        scene.objects.link(window_boolean_obj)
         
         #Hide the cutout objects to only see the windows
         window_boolean_obj.hide = True
         
-        #Apply all array modifiers on both objects
-        #Also apply location, rotation, and scale.
-        bpy.context.scene.objects.active = windows_obj
-        bpy.ops.object.modifier_apply(apply_as='DATA', modifier='x_window_array')
-        bpy.ops.object.modifier_apply(apply_as='DATA', modifier='y_window_array')
-        bpy.ops.object.transform_apply(location = True, scale = True, rotation = True)
-        
-        bpy.context.scene.objects.active = window_boolean_obj
-        bpy.ops.object.modifier_apply(apply_as='DATA', modifier='x_window_array2')
-        bpy.ops.object.modifier_apply(apply_as='DATA', modifier='y_window_array2')
-        bpy.ops.object.transform_apply(location = True, scale = True, rotation = True)
-
         return {'FINISHED'}
 
 
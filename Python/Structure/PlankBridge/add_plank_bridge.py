@@ -17,7 +17,12 @@ bl_info = {
 import bpy
 import bmesh
 import mathutils
-import math
+import numpy as np
+
+from mathutils import Matrix, Euler
+
+from generator_utils import COLLISION_SHAPES, ENGINES, MAX_HULL_VERTS, add_collisions, build_lods, lod_segments
+from generator_utils import MeshData, BezierCurve
 
 from bpy.props import (
         BoolProperty,
@@ -25,9 +30,85 @@ from bpy.props import (
         FloatProperty,
         FloatVectorProperty,
         IntProperty,
+        EnumProperty,
         )
 
 
+#Makes one plank, beveled if str and seg allow it:
+def make_plank(pl, pw, ph, str, seg):
+    bm = bmesh.new()
+    
+    #Create the plank as a cube
+    bmesh.ops.create_cube(bm, size=0.5,)
+    
+    #Resize the plank:
+    loc = mathutils.Matrix.Translation((0.0, 0.0, 0.0))
+    bmesh.ops.scale(bm, 
+                    vec=(pl, pw, ph), 
+                    space=loc, 
+                    verts=bm.verts)
+    
+    #Bevel it:
+    if str > 0.0 and seg > 0:
+        new_geom = bmesh.ops.bevel(bm, 
+                                   geom=bm.verts[:] + bm.edges[:], 
+                                   offset=str, 
+                                   offset_type=0, 
+                                   segments=seg, 
+                                   profile=0.5, 
+                                   clamp_overlap=True)
+        
+        #Get the new, beveled faces:
+        face_geom = new_geom["faces"]
+        
+        #And then smooth them:
+        for f in face_geom:
+            f.smooth = True
+    
+    data = MeshData.from_bmesh(bm)
+    bm.free()
+    return data
+
+
+#4x4 matrices from curve frames, with x along the curve,
+#z along its normal and y to the side, the same way the
+#CURVE modifier used to bend the x axis onto the curve.
+#The binormal is tan x nor, so y is the other way:
+def frame_matrices(pos, tan, nor, binor):
+    matrices = np.zeros((len(pos), 4, 4))
+    matrices[:, :3, 0] = tan
+    matrices[:, :3, 1] = -binor
+    matrices[:, :3, 2] = nor
+    matrices[:, :3, 3] = pos
+    matrices[:, 3, 3] = 1.0
+    return matrices
+
+
+#Sweeps rn ropes along the curve in one go. Each rope is
+#a tube of ring verts around, with rs segments along its
+#length, offset to the side (spread across rw) and up by
+#rz. The tubes are open at the ends:
+def sweep_ropes(curve, rn, rs, ring, rt, rw, rz):
+    pos, tan, nor, binor = curve.frames(rs + 1)
+    side = -binor
+    
+    offsets = np.zeros(rn)
+    if rn > 1:
+        offsets = np.linspace(-rw / 2.0, rw / 2.0, rn)
+    angle = np.arange(ring) * (2.0 * np.pi / ring)
+    
+    #(rope, station, ring) grid of verts:
+    center = pos[None, :, :] + (offsets[:, None, None] * side[None, :, :]) + (rz * nor[None, :, :])
+    around = (np.cos(angle)[:, None, None] * side[None, :, :]) + (np.sin(angle)[:, None, None] * nor[None, :, :])
+    co = center[:, :, None, :] + (rt * around.transpose(1, 0, 2)[None, :, :, :])
+    
+    #A quad between every two stations and ring verts:
+    grid = np.arange(rn * (rs + 1) * ring).reshape(rn, rs + 1, ring)
+    nxt = np.roll(grid, -1, axis=2)
+    quads = np.stack((grid[:, :-1], nxt[:, :-1], nxt[:, 1:], grid[:, 1:]), axis=-1)
+    return MeshData(co.reshape(-1, 3), quads.ravel(), np.full(rn * rs * ring, 4, np.int32), smooth=True)
+
+
 class AddPlankBridge(bpy.types.Operator):
     """Add a simple bridge mesh"""
     bl_idname = "mesh.plank_bridge_add"
@@ -122,6 +203,54 @@ class AddPlankBridge(bpy.types.Operator):
             min=0.0,
             default=0.005,
             )
+    col_mesh = EnumProperty(
+            name="Collision Mesh",
+            description="Collision mesh to generate for the object",
+            items=COLLISION_SHAPES,
+            default='NONE',
+            )
+    col_verts = IntProperty(
+            name="Vertex Limit",
+            description="Most verts a convex hull collision mesh can have",
+            min=4,
+            default=MAX_HULL_VERTS,
+            )
+    engine_type = EnumProperty(
+            name="Game Engine",
+            description="Which engine this will be exported to (Unity if unsure)",
+            items=ENGINES,
+            default='UNITY',
+            )
+    vis = BoolProperty(
+            name="Hide Collision",
+            description="Toggles the visibility of the collision mesh",
+            default=True,
+            )
+    lod_count = IntProperty(
+            name="LOD Levels",
+            description="How many levels of detail to make (1 makes just the mesh)",
+            min=1,
+            max=8,
+            default=1,
+            )
+    lod_ratio = FloatProperty(
+            name="LOD Ratio",
+            description="How much of the detail each level keeps from the one before",
+            min=0.05,
+            max=1.0,
+            default=0.5,
+            )
+    lod_budget = IntProperty(
+            name="Triangle Budget",
+            description="Most triangles LOD0 can have, the next levels get the ratio of the one before (0 for no limit)",
+            min=0,
+            default=0,
+            )
+    plank_instances = BoolProperty(
+            name="Linked Planks",
+            description="Make every plank its own object sharing one mesh, instead of merging them into the bridge",
+            default=False,
+            )
     location = FloatVectorProperty(
             name="Location",
             subtype='TRANSLATION',
@@ -151,6 +280,7 @@ class AddPlankBridge(bpy.types.Operator):
         col.prop(self, "plank_height")
         col.prop(self, "bev_seg")
         col.prop(self, "bev_str")
+        col.prop(self, "plank_instances")
         
         box = layout.box()
         col = box.column()
@@ -162,8 +292,34 @@ class AddPlankBridge(bpy.types.Operator):
         col.prop(self, "rope_thick")
         col.prop(self, "rope_drop")
         col.prop(self, "rope_z_offset")
+        
+        box = layout.box()
+        col = box.column()
+        col.label(text="Collision", icon="MOD_PHYSICS")
+        col.prop(self, "col_mesh")
+        col.prop(self, "col_verts")
+        col.prop(self, "engine_type")
+        col.prop(self, "vis")
+        
+        box = layout.box()
+        col = box.column()
+        col.label(text="Levels of Detail", icon="MOD_DECIM")
+        col.prop(self, "lod_count")
+        col.prop(self, "lod_ratio")
+        col.prop(self, "lod_budget")
 
     def execute(self, context):
+        build = lambda detail, level: self.build(context, detail)
+        levels = build_lods(build, self.lod_count, self.lod_ratio, self.lod_budget, "Plank_Bridge")
+        
+        #Only the most detailed level gets collision:
+        add_collisions(context, levels[0][0], self.col_mesh, self.engine_type, self.vis, self.col_verts)
+        
+        return {'FINISHED'}
+    
+    #Makes the bridge with its segments scaled by detail,
+    #and returns its objects:
+    def build(self, context, detail=1.0):
         #Rename the variables
         #to something simpler:
         pn = self.plank_num
@@ -176,242 +332,65 @@ class AddPlankBridge(bpy.types.Operator):
         rd = self.rope_drop
         rz = self.rope_z_offset
         rt = self.rope_thick
-        rs = self.rope_seg
+        rs = lod_segments(self.rope_seg, detail, 2)
         str = self.bev_str
-        seg = self.bev_seg
-        ring = self.ring_seg
+        seg = lod_segments(self.bev_seg, detail, 0)
+        ring = lod_segments(self.ring_seg, detail, 3)
         bc = self.bridge_curve
         pos = self.location
         rotate = self.rotation
         
-        #Make the curve object:
-        
-        #Make the bezier curve:
-        bpy.ops.curve.primitive_bezier_curve_add(enter_editmode=True)
-        curve_obj = bpy.context.active_object
-        
-        #It needs to have 3 total points
-        bpy.ops.curve.subdivide(number_cuts=1)
-
-        #Get the list of points:
+        #The bridge follows a bezier curve with 3 knots,
+        #the middle one dropped down by rope_drop:
         center_x = bl / 2.0
         handle_x = (bl / 4.0) * bc
-        curve_points = curve_obj.data.splines[0].bezier_points
-        curve_points[0].co.x = -bl / 2.0
-        curve_points[0].co.y = 0.0
-        curve_points[0].co.z = 0.0
-        curve_points[0].handle_left = (-center_x - handle_x, 0.0, 0.0)
-        curve_points[0].handle_right = (-center_x + handle_x, 0.0, 0.0)
-        
-        curve_points[1].co.x = 0.0
-        curve_points[1].co.y = 0.0
-        curve_points[1].co.z = rd
-        curve_points[1].handle_left = (-bl / 4.0, 0.0, rd)
-        curve_points[1].handle_right = (bl / 4.0, 0.0, rd)
-        
-        curve_points[2].co.x = bl / 2.0
-        curve_points[2].co.y = 0.0
-        curve_points[2].co.z = 0.0
-        curve_points[2].handle_left = (center_x - handle_x, 0.0, 0.0)
-        curve_points[2].handle_right = (center_x + handle_x, 0.0, 0.0)
-        
-        #Finalize changes:
-        bpy.ops.object.mode_set(mode='OBJECT')
+        co = [(-bl / 2.0, 0.0, 0.0), (0.0, 0.0, rd), (bl / 2.0, 0.0, 0.0)]
+        handle_left = [(-center_x - handle_x, 0.0, 0.0), (-bl / 4.0, 0.0, rd), (center_x - handle_x, 0.0, 0.0)]
+        handle_right = [(-center_x + handle_x, 0.0, 0.0), (bl / 4.0, 0.0, rd), (center_x + handle_x, 0.0, 0.0)]
+        curve = BezierCurve.from_knots(co, handle_left, handle_right)
         
-        #Make the first plank:
-        p_mesh = bpy.data.meshes.new("plank")
-        plank_obj = bpy.data.objects.new("Plank_Obj", p_mesh)
-
-        scene = bpy.context.scene
-        scene.objects.link(plank_obj)
-        bm = bmesh.new()
-        
-        #Create the plank as a cube
-        bmesh.ops.create_cube(bm, size=0.5,)
-        
-        #Resize the plank:
-        loc = mathutils.Matrix.Translation((0.0, 0.0, 0.0))
-        bmesh.ops.scale(bm, 
-                        vec=(pl, pw, ph), 
-                        space=loc, 
-                        verts=bm.verts)
-        
-        #Bevel it:
-        if str > 0.0 and seg > 0:
-            new_geom = bmesh.ops.bevel(bm, 
-                                       geom=bm.verts[:] + bm.edges[:], 
-                                       offset=str, 
-                                       offset_type=0, 
-                                       segments=seg, 
-                                       profile=0.5, 
-                                       clamp_overlap=True)
-            
-            #Get the new, beveled faces:
-            face_geom = new_geom["faces"]
-            
-            #And then smooth them:
-            for f in face_geom:
-                f.smooth = True
-        
-        #Finalize changes:
-        bm.to_mesh(p_mesh)
-        bm.free()
-        p_mesh.update()
-        
-        #To copy the curve in arc_length(),
-        #the curve object has to be active:
-        bpy.ops.object.select_all(action='DESELECT')
-        curve_obj.select = True
-        bpy.context.scene.objects.active = curve_obj
-        bpy.ops.object.convert(target='MESH')
-        bpy.ops.object.mode_set(mode='EDIT')
-        
-        bm = bmesh.new()
-        bm = bmesh.from_edit_mesh(curve_obj.data)
+        #Location and rotation get baked into the verts:
+        matrix = Matrix.Translation(pos) * Euler(rotate).to_matrix().to_4x4()
         
-        #Sum of the edges
-        sum = 0.0
+        #One plank every so often along the curve, each
+        #turned to follow it:
+        plank = make_plank(pl, pw, ph, str, seg)
+        planks = frame_matrices(*curve.frames(pn))
         
-        for e in bm.edges:
-            #Trying to make my code more 
-            #PEP-8 friendly or something
-            v0 = e.verts[0].co
-            v1 = e.verts[1].co
-            x = (v1.x - v0.x)**2
-            y = (v1.y - v0.y)**2
-            z = (v1.z - v0.z)**2
-            #All confusing simplifications aside,
-            #it is still the 3D distance formula:
-            sum += math.sqrt(x + y + z)
-        
-        bm.free()
-        bpy.ops.object.mode_set(mode='OBJECT')
-        bpy.ops.object.convert(target='CURVE')
-        
-        #With the length of the 
-        #curve, make the ropes:
+        parts = []
         if rn > 0:
-            r_mesh = bpy.data.meshes.new("rope")
-            rope_obj = bpy.data.objects.new("Rope_Obj", r_mesh)
-            
-            scene = bpy.context.scene
-            scene.objects.link(rope_obj)
-            bm = bmesh.new()
-            
-            #Make the first segment:
-            bmesh.ops.create_cone(bm, 
-                                  cap_ends=False,
-                                  segments=ring, 
-                                  diameter1=rt, 
-                                  diameter2=rt, 
-                                  depth=sum / rs,)
-            
-            #Smooth it:
-            for f in bm.faces:
-                f.smooth = True
-            
-            #Rotate the segments of rope:
-            rot = mathutils.Matrix.Rotation(math.radians(90), 3, 'Y')
-            bmesh.ops.rotate(bm,
-                             verts=bm.verts,
-                             cent=(0.0, 0.0, 0.0),
-                             matrix=rot)
-            
-            if rn > 1:
-                #Move the segment horizontally and vertically:
-                bmesh.ops.translate(bm,
-                                    verts=bm.verts,
-                                    vec=((sum / (2.0 * rs)), -rw / 2.0, 0.0))
-                
-                curr_geom = bm.verts[:] + bm.edges[:] + bm.faces[:]
-                
-                for i in range(1, rn):
-                    dupl_geom = bmesh.ops.duplicate(bm,
-                                                    geom=curr_geom)
-                    
-                    new_verts = [v for v in dupl_geom["geom"]
-                                 if isinstance(v, bmesh.types.BMVert)]
-                    new_edges = [e for e in dupl_geom["geom"]
-                                 if isinstance(e, bmesh.types.BMEdge)]
-                    new_faces = [f for f in dupl_geom["geom"]
-                                 if isinstance(f, bmesh.types.BMFace)]
-                    
-                    curr_geom = new_verts[:] + new_edges[:] + new_faces[:]
-                    del dupl_geom
-
-                    #Move it to the next position:
-                    bmesh.ops.translate(bm,
-                                        verts=new_verts[:],
-                                        vec=(0.0, rw / (rn - 1), 0.0))
-            
-            #Make sure it's in the right place vertically:
-            bmesh.ops.translate(bm,
-                                verts=bm.verts,
-                                vec=(0.0, 0.0, rz))
-            
-            #Finalize changes:
-            bm.to_mesh(r_mesh)
-            bm.free()
-            r_mesh.update()
-            
-            #Apply the curve and array 
-            #modifiers to the rope_obj
-            bpy.ops.object.select_all(action='DESELECT')
-            rope_obj.select = True
-            bpy.context.scene.objects.active = rope_obj
-            array_mod = rope_obj.modifiers.new(name='rope_array', type='ARRAY')
-            array_mod.use_constant_offset = False
-            array_mod.use_relative_offset = True
-            array_mod.count = rs
-            array_mod.relative_offset_displace = [1.0, 0.0, 0.0]
-            
-            #Apply curve modifier to the planks:
-            curve_mod = rope_obj.modifiers.new(name='c_mod', type='CURVE')
-            curve_mod.object = curve_obj
-            bpy.ops.object.modifier_apply(modifier=array_mod.name)
-            bpy.ops.object.modifier_apply(modifier=curve_mod.name)
-            
+            parts.append(sweep_ropes(curve, rn, rs, ring, rt, rw, rz))
+        if not self.plank_instances:
+            parts.append(plank.instance(planks))
         
-        #Apply array modifier to the 
-        #planks using the arc length
-        bpy.ops.object.select_all(action='DESELECT')
-        plank_obj.select = True
-        bpy.context.scene.objects.active = plank_obj
-        array_mod = plank_obj.modifiers.new(name='plank_array', type='ARRAY')
-        array_mod.use_constant_offset = True
-        array_mod.use_relative_offset = False
-        array_mod.count = pn
-        array_mod.constant_offset_displace = [(sum / (pn - 1)), 0.0, 0.0]
+        bridge = MeshData.join(parts)
+        bridge.transform(matrix)
         
-        #Apply curve modifier to the planks:
-        curve_mod = plank_obj.modifiers.new(name='c_mod', type='CURVE')
-        curve_mod.object = curve_obj
-        bpy.ops.object.modifier_apply(modifier=array_mod.name)
-        bpy.ops.object.modifier_apply(modifier=curve_mod.name)
+        scene = context.scene
+        mesh = bpy.data.meshes.new("Plank_Bridge")
+        bridge.to_mesh(mesh)
+        bridge_obj = bpy.data.objects.new("Plank_Bridge", mesh)
+        scene.objects.link(bridge_obj)
+        objects = [bridge_obj]
         
-        #Delete the curve:
-        bpy.ops.object.select_all(action='DESELECT')
-        curve_obj.select = True
-        bpy.ops.object.delete()
+        #Linked planks all share one mesh, and get parented
+        #to the bridge (which sits at the origin):
+        if self.plank_instances:
+            p_mesh = bpy.data.meshes.new("Plank")
+            plank.to_mesh(p_mesh)
+            for m in planks:
+                plank_obj = bpy.data.objects.new("Plank", p_mesh)
+                plank_obj.parent = bridge_obj
+                plank_obj.matrix_world = matrix * Matrix(m.tolist())
+                scene.objects.link(plank_obj)
+                objects.append(plank_obj)
         
-        bpy.ops.object.select_all(action='DESELECT')
-        plank_obj.select = True
-        bpy.context.scene.objects.active = plank_obj
-        #Join the meshes:
-        if rn > 0:
-            rope_obj.select = True
-            bpy.ops.object.join()
-        context.active_object.name = 'Plank_Bridge'
+        for o in scene.objects:
+            o.select = False
+        bridge_obj.select = True
+        scene.objects.active = bridge_obj
         
-        #Move and rotate it:
-        plank_obj.rotation_euler = rotate
-        plank_obj.location = pos
-        
-        bpy.ops.object.transform_apply(location=True, 
-                                       rotation=True, 
-                                       scale=True)
-
-        return {'FINISHED'}
+        return objects
 
 
 def menu_func(self, context):
@@ -18,7 +18,9 @@ import bpy
 import bmesh
 import mathutils
 import math
+import numpy as np
 
+from generator_utils import MeshData, solidify
 
 from bpy.props import (
         BoolProperty,
@@ -221,41 +223,14 @@ class AddPlaygroundStructure(bpy.types.Operator):
 
         scene = bpy.context.scene
         scene.objects.link(roof_obj)
-        bm = bmesh.new()
-        
-        #Add verts, then faces:
-        for v_co in verts:
-            bm.verts.new(v_co)
-
-        bm.verts.ensure_lookup_table()
-        for f_idx in faces:
-            bm.faces.new([bm.verts[i] for i in f_idx])
-        
-        #Smooth it:
-        for f in bm.faces:
-            f.smooth = True
-        
         
-        
-        #Finalize changes:
-        bm.to_mesh(r_mesh)
-        bm.free()
-        r_mesh.update()
-        
-        #Apply solidify modifier:
-        bpy.context.scene.objects.active = roof_obj
-        thick_mod = roof_obj.modifiers.new("thick_mod", type='SOLIDIFY')
-        thick_mod.thickness = rt
-        bpy.ops.object.modifier_apply(apply_as='DATA', modifier=thick_mod.name)
-        
-        
-        bm = bmesh.new()
-        bm.from_mesh(r_mesh)
+        #Smooth it, and give it its thickness:
+        roof = solidify(MeshData.from_pydata(verts, faces, smooth=True), rt)[0]
         
         #Now fix the bottom verts:
-        for v in bm.verts:
-            if v.co.z < sh:
-                v.co.z = sh
+        roof.co[:, 2] = np.maximum(roof.co[:, 2], sh)
+        
+        bm = roof.to_bmesh()
         
         if rseg > 0 and rstr > 0.0:
             #Now bevel it:
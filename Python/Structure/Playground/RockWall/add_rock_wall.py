@@ -34,7 +34,13 @@ bl_info = {
 
 import bpy
 import bmesh
-import random
+import numpy as np
+
+from mathutils import Matrix, Euler
+
+from generator_utils import MeshData, cylinder_cutter, cut_bmesh, cut_object
+from generator_utils import poisson_disk, density_from_array, image_density, plane_transforms
+from generator_utils import geometry_cache, rock_variants, ROCK_VERSION
 
 from bpy.props import (
         BoolProperty,
@@ -42,9 +48,47 @@ from bpy.props import (
         FloatProperty,
         FloatVectorProperty,
         IntProperty,
+        StringProperty,
         )
 
 
+#The rock variants with their bolt holes, which go
+#through the middle of each rock along z. Cut ones are
+#cached too, so a redo doesn't cut them again:
+def rock_variants_cut(count, seed, sub, size_min, size_max, bolt, bolt_seg):
+    variants = rock_variants(count, seed, sub, size_min, size_max)
+    if bolt <= 0.0:
+        return variants
+    key = ("rock_variants_cut", ROCK_VERSION, count, seed, sub, size_min, size_max, bolt, bolt_seg)
+    cut = geometry_cache.get(key)
+    if cut is None:
+        cutter = cylinder_cutter('Z', -2.0 * size_max, 2.0 * size_max, (0.0, 0.0), bolt, bolt_seg)
+        cut = []
+        for rock in variants:
+            bm = rock.to_bmesh()
+            cut_bmesh(bm, [cutter])
+            cut.append(MeshData.from_bmesh(bm))
+            bm.free()
+        geometry_cache.put(key, cut)
+    return cut
+
+
+#The density of holds over the wall face, or None when
+#it's the same everywhere. It comes from the brightness
+#of an image (if one is named) and fades from 1 at the
+#bottom of the wall to top at the top:
+def hold_density(size, image_name, top):
+    image = bpy.data.images.get(image_name) if image_name else None
+    if image is None and top >= 1.0:
+        return None
+    if image is not None:
+        values = image_density(image)
+    else:
+        values = np.ones((2, 2))
+    values = values * np.linspace(1.0, top, len(values))[:, None]
+    return density_from_array(values, size)
+
+
 class AddRockWall(bpy.types.Operator):
     """Add a rock wall mesh"""
     bl_idname = "mesh.rock_wall_add"
@@ -71,10 +115,45 @@ class AddRockWall(bpy.types.Operator):
             )
     rock_num = IntProperty(
             name="Number of Rocks",
-            description="Number of rocks on the wall",
+            description="Most rocks to put on the wall (it stops early when the wall is full)",
             min=1,
             default=16,
             )
+    spacing = FloatProperty(
+            name="Rock Spacing",
+            description="Smallest distance between the centers of two rocks",
+            min=0.001,
+            default=0.5,
+            )
+    margin = FloatProperty(
+            name="Edge Margin",
+            description="How far the rocks stay from the edges of the wall",
+            min=0.0,
+            default=0.05,
+            )
+    density_top = FloatProperty(
+            name="Top Density",
+            description="How dense the rocks are at the top of the wall, compared to the bottom",
+            min=0.0, max=1.0,
+            default=1.0,
+            )
+    density_map = StringProperty(
+            name="Density Map",
+            description="Image whose brightness sets how dense the rocks are (empty for none)",
+            default="",
+            )
+    bolt_rad = FloatProperty(
+            name="Bolt Radius",
+            description="Radius of the bolt hole through each rock and the wall (0 for none)",
+            min=0.0,
+            default=0.005,
+            )
+    bolt_seg = IntProperty(
+            name="Bolt Segments",
+            description="Number of segments around a bolt hole",
+            min=3,
+            default=8,
+            )
     size_min = FloatProperty(
             name="Min Rock Size",
             description="Minimum size a rock can be",
@@ -93,6 +172,17 @@ class AddRockWall(bpy.types.Operator):
             min=1,
             default=3,
             )
+    variants = IntProperty(
+            name="Rock Variants",
+            description="Number of different rock shapes the rocks are picked from",
+            min=1, max=64,
+            default=6,
+            )
+    linked_rocks = BoolProperty(
+            name="Linked Rocks",
+            description="Make every rock its own object sharing its variant's mesh, instead of merging them into one",
+            default=False,
+            )
     seed = IntProperty(
             name="Random Seed",
             description="Influences the randomly generated values",
@@ -117,12 +207,17 @@ class AddRockWall(bpy.types.Operator):
         min = self.size_min
         max = self.size_max
         sub = self.subdivs
-        seed = self.seed
+        seed = self.seed % (2 ** 32)
+        margin = self.margin
+        bolt = self.bolt_rad
+        bolt_seg = self.bolt_seg
         pos = self.location
         rotate = self.rotation
         
+        #Location and rotation get baked into the verts:
+        matrix = Matrix.Translation(pos) * Euler(rotate).to_matrix().to_4x4()
         
-       #Make the wall object:
+        #Make the wall object:
         w_mesh = bpy.data.meshes.new("wall")
         wall_obj = bpy.data.objects.new("Wall_Obj", w_mesh)
 
@@ -143,62 +238,57 @@ class AddRockWall(bpy.types.Operator):
         bm.free()
         w_mesh.update()
         
-        #Make each rock:
-        rocks = []
-        r_mesh = bpy.data.meshes.new("rocks")
-        rocks_obj = bpy.data.objects.new("Rocks_Obj", r_mesh)
-        
-        scene = bpy.context.scene
-        scene.objects.link(rocks_obj)
-        bm = bmesh.new()
-        
-        #Create the rock as an ico sphere
-        bmesh.ops.create_icosphere(bm, 
-                                   subdivisions=sub, 
-                                   diameter=max,)
-        
-        bm.verts.ensure_lookup_table()
-        bm.faces.ensure_lookup_table()
+        #Where the rocks go on the +x face of the wall,
+        #with margin left around the edges:
+        origin = (l / 4.0, (-w / 4.0) + margin, (-h / 4.0) + margin)
+        size = ((w / 2.0) - (2.0 * margin), (h / 2.0) - (2.0 * margin))
         
-        for f in bm.faces:
-            f.smooth = True
+        rng = np.random.RandomState(seed)
+        density = hold_density(size, self.density_map, self.density_top)
+        points = poisson_disk(size, self.spacing, n, density, seed)
         
-        #Grab random verts:
-        vert_list = []
-        i = random.randint(5, 11 * sub)
-        while i >= 0:
-            v = bm.verts[random.randint(0, len(bm.verts)-1)]
-            #Check for duplicates:
-            duplicate = False
-            for vl in vert_list:
-                if v == vl:
-                    duplicate = True
-            if not duplicate:
-                vert_list += [v]
-                i -= 1
+        #Every rock gets its own spin (the variants
+        #already go from the min to the max size):
+        count = len(points)
+        spins = rng.uniform(0.0, 2.0 * np.pi, count)
+        holds = plane_transforms(points, origin, (0.0, 1.0, 0.0), (0.0, 0.0, 1.0), 1.0, spins)
         
-        #Resize the rock:
-        scl = (min / max, min / max, min / max)
+        #Every rock is one of a few shared variants:
+        variants = rock_variants_cut(self.variants, seed, sub, min, max, bolt, bolt_seg)
+        picks = rng.randint(len(variants), size=count)
         
-        bmesh.ops.scale(bm, 
-                        vec=scl, 
-                        verts=vert_list)
-        
-        #Finalize changes:
-        bm.to_mesh(r_mesh)
-        bm.free()
-        r_mesh.update()
-        
-        #Make the screw cutout for each rock:
+        if self.linked_rocks:
+            #Each rock is its own object, sharing
+            #its variant's mesh with the others:
+            meshes = []
+            for i, rock in enumerate(variants):
+                mesh = bpy.data.meshes.new("Rock_%02d" % i)
+                rock.to_mesh(mesh)
+                meshes.append(mesh)
+            for hold, pick in zip(holds, picks):
+                rock_obj = bpy.data.objects.new("Rock", meshes[pick])
+                rock_obj.parent = wall_obj
+                rock_obj.matrix_world = matrix * Matrix(hold.tolist())
+                scene.objects.link(rock_obj)
+        else:
+            #Or all of them copied into one mesh:
+            rocks = MeshData.join([rock.instance(holds[picks == i]) for i, rock in enumerate(variants)])
+            rocks.transform(matrix)
+            
+            r_mesh = bpy.data.meshes.new("rocks")
+            rocks.to_mesh(r_mesh)
+            rocks_obj = bpy.data.objects.new("Rocks_Obj", r_mesh)
+            scene.objects.link(rocks_obj)
         
+        #Make the screw cutout for each rock. The
+        #holes all get cut in the same pass:
+        if bolt > 0.0 and count:
+            cutters = [cylinder_cutter('X', -l, l, (y, z), bolt, bolt_seg) for y, z in holds[:, 1:3, 3]]
+            cut_object(wall_obj, cutters, scene)
         
         #Move and rotate it:
-        wall_obj.rotation_euler = rotate
-        wall_obj.location = pos
-        
-        bpy.ops.object.transform_apply(location=True, 
-                                       rotation=True, 
-                                       scale=True)
+        w_mesh.transform(matrix)
+        w_mesh.update()
 
         return {'FINISHED'}
 
@@ -18,6 +18,10 @@ import bpy
 import bmesh
 import mathutils
 import math
+import numpy as np
+
+from generator_utils import MeshData, solidify_object
+from generator_utils import COLLISION_SHAPES, ENGINES, MAX_HULL_VERTS, add_collisions, build_lods, lod_segments
 
 #Return the coordinates of the
 #vert with the furthest y-val.
@@ -61,6 +65,15 @@ def all_beneath_center(geom):
 
 #Generate a slide in the
 #shape of a coiled tube.
+#
+#Every ring of the tube is worked out straight from the
+#helix, instead of extruding and moving one at a time.
+#The helix turns around (0, -ent, 0) going clockwise and
+#down, starting out along -y, and each ring sits in the
+#plane of its Frenet normal and binormal. The rings are,
+#in order: the start of the entrance, the whole helix,
+#then the ending moved forward by half, with its bottom
+#half moved forward again for the curved opening.
 def make_tube_helix(maj_rad, min_rad, rad_seg, loop_h, loop_seg, loops, thick, ent, ending):
     
     #Make the object:
@@ -70,113 +83,54 @@ def make_tube_helix(maj_rad, min_rad, rad_seg, loop_h, loop_seg, loops, thick, e
     scene = bpy.context.scene
     scene.objects.link(slide_obj)
     
-    bm = bmesh.new()
-    #How much to rotate each new circle:
-    rot = -360.0 / loop_seg
-    #How much to move each new cirlce:
-    mov = -loop_h / loop_seg
-    
-    #Make the first piece of the loop:
-    bmesh.ops.create_circle(
-        bm,
-        cap_ends=False,
-        diameter=min_rad,
-        segments=rad_seg)
-    
-    #Properly orient the circle:
-    bmesh.ops.rotate(bm, 
-            verts=bm.verts,
-            cent=(0.0, 0.0, 0.0),
-            matrix=mathutils.Matrix.Rotation(math.radians(90.0), 3, 'X'))
-    
-    #Extrude the entrance:
-    new_mesh = bmesh.ops.extrude_edge_only(bm, edges=bm.edges)
-    extr_geom = new_mesh["geom"]
-    del new_mesh
-    
-    #Holds data on the edges to extrude:
-    extr_verts = [v for v in extr_geom if isinstance(v, bmesh.types.BMVert)]
-    extr_edges = [e for e in extr_geom if isinstance(e, bmesh.types.BMEdge)]
-    
-    #Move the entrance forward:
-    bmesh.ops.translate(
-            bm,
-            verts=extr_verts,
-            vec=(0.0, -ent, 0.0))
-    
-    #Move it by maj_rad amount:
-    bmesh.ops.translate(
-        bm,
-        verts=bm.verts,
-        vec=(maj_rad, 0.0, 0.0))
-    
-    #Make a loop that extrudes,
-    #rotates the extruded mesh,
-    #and raises the new circle:
+    #How much to rotate and move down
+    #each ring of the helix:
     iterations = loop_seg * loops
-    
-    for i in range(0, iterations):
-        #Extrude the circle and
-        #store that new data so
-        #it can be transformed:
-        new_mesh = bmesh.ops.extrude_edge_only(bm, edges=extr_edges)
-        extr_geom = new_mesh["geom"]
-        del new_mesh
-        
-        extr_verts = [v for v in extr_geom if isinstance(v, bmesh.types.BMVert)]
-        extr_edges = [e for e in extr_geom if isinstance(e, bmesh.types.BMEdge)]
-        
-        #Rotate that new data around
-        #the center and move it down
-        bmesh.ops.rotate(bm, 
-            verts=extr_verts,
-            cent=(0.0, -ent, 0.0),
-            matrix=mathutils.Matrix.Rotation(math.radians(rot), 3, 'Z'))
-        
-        bmesh.ops.translate(
-            bm,
-            verts=extr_verts,
-            vec=(0.0, 0.0, mov))
-    
-    #Now extrude the ending:
-    new_mesh = bmesh.ops.extrude_edge_only(bm, edges=extr_edges)
-    extr_geom = new_mesh["geom"]
-    del new_mesh
-    
-    extr_verts = [v for v in extr_geom if isinstance(v, bmesh.types.BMVert)]
-    extr_edges = [e for e in extr_geom if isinstance(e, bmesh.types.BMEdge)]
-    
-    #The amount to move the
-    #2 halves of the ending
-    seg_mov = -ending / 2.0
-    
-    #Since slides typically have
-    #a curved opening, only move
-    #forward by 1/2, and extrude
-    bmesh.ops.translate(
-            bm,
-            verts=extr_verts,
-            vec=(0.0, seg_mov, 0.0))
-    
-    #Now make the curved sides:
-    
-    #For the slope, only the bottom half
-    #of the vertices have to be selected
-    extr_verts = all_beneath_center(extr_geom)
-    
-    #Now move the segment:
-    bmesh.ops.translate(
-            bm,
-            verts=extr_verts,
-            vec=(0.0, seg_mov, 0.0))
-    
-    #Smooth the geometry:
-    for f in bm.faces:
-        f.smooth = True
-    
-    #Now update the mesh object:
-    bm.to_mesh(mesh1)
-    mesh1.update()
+    theta = np.arange(iterations + 1) * (2.0 * np.pi / loop_seg)
+    drop = loop_h / (2.0 * np.pi)
+    
+    #The helix and its Frenet frame. The
+    #normal always points at the axis:
+    outward = np.stack((np.cos(theta), -np.sin(theta), np.zeros_like(theta)), axis=1)
+    forward = np.stack((-np.sin(theta), -np.cos(theta), np.zeros_like(theta)), axis=1)
+    center = (maj_rad * outward) + np.array((0.0, -ent, 0.0))
+    center[:, 2] = -theta * drop
+    tangent = (maj_rad * forward) - np.array((0.0, 0.0, drop))
+    tangent /= np.linalg.norm(tangent, axis=1)[:, None]
+    normal = -outward
+    up = np.cross(normal, tangent)
+    
+    #The entrance starts ent behind the first ring, and
+    #the ending goes on ahead of the last one:
+    half = ending / 2.0
+    center = np.concatenate((center[:1] - (ent * forward[:1]),
+                             center,
+                             center[-1:] + (half * forward[-1:])))
+    normal = np.concatenate((normal[:1], normal, normal[-1:]))
+    up = np.concatenate((up[:1], up, up[-1:]))
+    
+    #(ring, vert) grid, in the same order create_circle
+    #puts the verts of the circle in:
+    phi = np.arange(rad_seg) * (2.0 * np.pi / rad_seg)
+    sin = min_rad * np.sin(phi)[None, :, None]
+    cos = min_rad * np.cos(phi)[None, :, None]
+    co = center[:, None, :] + (sin * normal[:, None, :]) + (cos * up[:, None, :])
+    
+    #Since slides typically have a curved
+    #opening, only the bottom half of the
+    #last ring goes all the way forward:
+    beneath = np.cos(phi) <= 1e-9
+    co[-1, beneath] += half * forward[-1]
+    
+    #A quad between every two rings:
+    grid = np.arange(len(co) * rad_seg).reshape(len(co), rad_seg)
+    nxt = np.roll(grid, -1, axis=1)
+    quads = np.stack((grid[:-1], nxt[:-1], nxt[1:], grid[1:]), axis=-1)
+    
+    #Now update the mesh object,
+    #with all the faces smoothed:
+    data = MeshData(co.reshape(-1, 3), quads.ravel(), np.full(quads.size // 4, 4, np.int32), smooth=True)
+    data.to_mesh(mesh1)
     
     #Return slide_obj so it can have 
     #modifiers applied in execute():
@@ -703,6 +657,49 @@ class AddSlide(bpy.types.Operator):
             )
     
     #Other stuff:
+    col_mesh = EnumProperty(
+            name="Collision Mesh",
+            description="Collision mesh to generate for the object",
+            items=COLLISION_SHAPES,
+            default='NONE',
+            )
+    col_verts = IntProperty(
+            name="Vertex Limit",
+            description="Most verts a convex hull collision mesh can have",
+            min=4,
+            default=MAX_HULL_VERTS,
+            )
+    engine_type = EnumProperty(
+            name="Game Engine",
+            description="Which engine this will be exported to (Unity if unsure)",
+            items=ENGINES,
+            default='UNITY',
+            )
+    vis = BoolProperty(
+            name="Hide Collision",
+            description="Toggles the visibility of the collision mesh",
+            default=True,
+            )
+    lod_count = IntProperty(
+            name="LOD Levels",
+            description="How many levels of detail to make (1 makes just the mesh)",
+            min=1,
+            max=8,
+            default=1,
+            )
+    lod_ratio = FloatProperty(
+            name="LOD Ratio",
+            description="How much of the detail each level keeps from the one before",
+            min=0.05,
+            max=1.0,
+            default=0.5,
+            )
+    lod_budget = IntProperty(
+            name="Triangle Budget",
+            description="Most triangles LOD0 can have, the next levels get the ratio of the one before (0 for no limit)",
+            min=0,
+            default=0,
+            )
     layers = BoolVectorProperty(
             name="Layers",
             description="Object Layers",
@@ -797,22 +794,48 @@ class AddSlide(bpy.types.Operator):
             col.prop(self, "entrance")
             col.prop(self, "ending")
         
+        box = layout.box()
+        col = box.column()
+        col.label(text="Collision", icon="MOD_PHYSICS")
+        col.prop(self, "col_mesh")
+        col.prop(self, "col_verts")
+        col.prop(self, "engine_type")
+        col.prop(self, "vis")
+        
+        box = layout.box()
+        col = box.column()
+        col.label(text="Levels of Detail", icon="MOD_DECIM")
+        col.prop(self, "lod_count")
+        col.prop(self, "lod_ratio")
+        col.prop(self, "lod_budget")
+
     def execute(self, context):
+        build = lambda detail, level: [self.build(context, detail)]
+        levels = build_lods(build, self.lod_count, self.lod_ratio, self.lod_budget, "Slide")
+        
+        #Only the most detailed level gets collision:
+        add_collisions(context, levels[0][0], self.col_mesh, self.engine_type, self.vis, self.col_verts)
+        
+        return {'FINISHED'}
+    
+    #Makes the slide with its segments scaled by detail,
+    #and returns the object:
+    def build(self, context, detail=1.0):
         
         #Renaming the variables
         #to be a little simpler
         type = self.type
         maj_rad = self.maj_rad
         min_rad = self.min_rad
-        rad_seg = self.rad_seg
+        rad_seg = lod_segments(self.rad_seg, detail, 4)
         loop_h = self.loop_h
-        loop_seg = self.loop_seg
+        loop_seg = lod_segments(self.loop_seg, detail, 4)
         loops = self.loops
         g_height = self.guard_height
         width = self.width
         height = self.height
         length = self.length
-        t_seg = self.tran_seg
+        t_seg = lod_segments(self.tran_seg, detail, 1)
         thick = self.thick
         ent = self.entrance
         ending = self.ending
@@ -863,15 +886,10 @@ class AddSlide(bpy.types.Operator):
                                            ent,
                                            ending)
         
-        #Apply the thickness modifier:
-        bpy.context.scene.objects.active = slide_obj
-        sol_mod = slide_obj.modifiers.new("Solidify", 'SOLIDIFY')
-        sol_mod.thickness = thick
-        
-        bpy.ops.object.modifier_apply(modifier=sol_mod.name)
+        #Give it its thickness:
+        solidify_object(slide_obj, thick)
         
-
-        return {'FINISHED'}
+        return slide_obj
 
 
 def menu_func(self, context):
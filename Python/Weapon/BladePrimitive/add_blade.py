@@ -17,6 +17,8 @@ bl_info = {
 import bpy
 import bmesh
 
+from generator_utils import MeshData, SpatialIndex, bm_edges
+
 from bpy.props import (
         BoolProperty,
         BoolVectorProperty,
@@ -26,38 +28,6 @@ from bpy.props import (
         EnumProperty,
         )
 
-#bm is the bmesh; x, y, and z
-#are the center of the bounds
-#while l, w, h are the length
-#height, width of the bounds,
-#respectively. This finds all
-#edges in bounds, and returns
-#them to execute() in a list.
-def get_e_in_bounds(edges, x, y, z, l, w, h):
-    #Holds all edges within bounds:
-    within_bounds = []
-    
-    x0 = x + (l / 2.0)
-    x1 = x + (-l / 2.0)
-    y0 = y + (w / 2.0)
-    y1 = y + (-w / 2.0)
-    z0 = z + (h / 2.0)
-    z1 = z + (-h / 2.0)
-    
-    #If both verts of an edge are inside
-    #bounds on the x, y, and z axis, add
-    #that edge to the list of edges, and
-    #finally, return the completed list:
-    for e in edges:
-        if e.verts[0].co.x <= x0 and e.verts[0].co.x >= x1:
-            if e.verts[1].co.x <= x0 and e.verts[1].co.x >= x1:
-                if e.verts[0].co.y <= y0 and e.verts[0].co.y >= y1:
-                    if e.verts[1].co.y <= y0 and e.verts[1].co.y >= y1:
-                        if e.verts[0].co.z <= z0 and e.verts[0].co.z >= z1:
-                            if e.verts[1].co.z <= z0 and e.verts[1].co.z >= z1:
-                                within_bounds += [e]
-    return within_bounds
-
 #Make the grip or the hilt or whatever:
 def beveled_box(bm, l, w, h, mov, seg, str, p, is_g):
     #is_g is "is_grip?" If is_g is true,
@@ -375,21 +345,17 @@ class AddBlade(bpy.types.Operator):
 
         scene = bpy.context.scene
         scene.objects.link(blade_obj)
-        bm = bmesh.new()
         
         #Add verts, then faces:
-        for v_co in verts:
-            bm.verts.new(v_co)
-
-        bm.verts.ensure_lookup_table()
-        for f_idx in faces:
-            bm.faces.new([bm.verts[i] for i in f_idx])
+        blade_data = MeshData.from_pydata(verts, faces)
+        bm = blade_data.to_bmesh()
+        index = SpatialIndex.from_mesh_data(blade_data)
             
         #Extrude each additional 
         #seg and make the point:
         if segments > 1:
             s = segments
-            e_geom = get_e_in_bounds(bm.edges, l, 0.0, 0.0, 0.0001, (w + shift_l + shift_r), height)
+            e_geom = bm_edges(bm, index.edges_in_box(l, 0.0, 0.0, 0.0001, (w + shift_l + shift_r), height))
             
             for i in range(0, segments):
                 ret_geom = bmesh.ops.extrude_edge_only(bm, edges=e_geom)
@@ -409,7 +375,7 @@ class AddBlade(bpy.types.Operator):
             #Otherwise make the point:
             
             #Extrude and merge verts into center:
-            e_geom = get_e_in_bounds(bm.edges, (l * segments), 0.0, 0.0, 0.0001, (w + shift_l + shift_r), height)
+            e_geom = bm_edges(bm, index.edges_in_box((l * segments), 0.0, 0.0, 0.0001, (w + shift_l + shift_r), height))
             ret_geom = bmesh.ops.extrude_edge_only(bm, edges=e_geom)
             v_geom = [v for v in ret_geom["geom"] 
                               if isinstance(v, bmesh.types.BMVert)]
@@ -19,6 +19,8 @@ import bmesh
 import math
 import mathutils
 
+from generator_utils import solidify_object
+
 from bpy.props import (
         BoolProperty,
         BoolVectorProperty,
@@ -238,11 +240,8 @@ class AddShuriken(bpy.types.Operator):
         cutouts_obj.select = True
         bpy.ops.object.delete()
         
-        #Apply solidify modifier:
-        bpy.context.scene.objects.active = shuriken_obj
-        thick_mod = shuriken_obj.modifiers.new("thick_mod", type='SOLIDIFY')
-        thick_mod.thickness = t
-        bpy.ops.object.modifier_apply(apply_as='DATA', modifier=thick_mod.name)
+        #Give it its thickness:
+        solidify_object(shuriken_obj, t)
         
         #Move and rotate it:
         shuriken_obj.rotation_euler = rotate